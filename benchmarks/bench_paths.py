@@ -0,0 +1,259 @@
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+from datetime import date
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'utils'))
+
+from kiwoom import Kiwoom
+from metrics import LatencyHistogram
+from simulator import SimulatedTransport, SimSignal, generate_daily_bars, generate_ticks
+from trade_journal import query, FILL
+from tr_records import MULTI_RECORDS
+from pnl import replay_fills
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline_paths.json')
+
+# 벤치마크용 설정 (TR 조회 제한 없음, 캐시 / 스냅샷 / 알림 끔, 로그·저널은 임시 폴더)
+CONFIG = """
+[USER]
+account_pw = 0000
+
+[TRADING]
+max_profit_rate = 2.0
+max_loss_rate = -2.0
+max_stock_ratio = 0.1
+max_holding_count = 0
+buy_split_count = 2
+restart_after_close = False
+target_list = {targets!r}
+
+[TR]
+per_second = 1000000
+per_hour = 100000000
+
+[REALTIME]
+decision_interval_ms = {decision_ms}
+
+[STRATEGY]
+strategy = {strategy}
+
+[CACHE]
+enabled = False
+
+[SNAPSHOT]
+enabled = False
+
+[NOTIFY]
+sinks = null
+
+[LOG]
+log_dir = {tmp}
+console_level = ERROR
+
+[JOURNAL]
+path = {tmp}/trade_journal.db
+
+[REPORT]
+on_shutdown = False
+"""
+
+
+# -----------------------------------
+# 🔵 1. 픽스처 전송 계층 (시뮬레이터 + 경로별 지연 시간 기록)
+# -----------------------------------
+class TimedSignal(SimSignal):
+    """연결된 슬롯 실행 시간을 히스토그램에 기록하는 시그널 (OnReceiveRealData → 틱 1건 처리 전체)"""
+
+    def __init__(self, histogram):
+        super().__init__()
+        self.histogram = histogram
+
+    def emit(self, *args):
+        start = time.perf_counter_ns()
+        super().emit(*args)
+        self.histogram.record(time.perf_counter_ns() - start)
+
+
+class FixtureTransport(SimulatedTransport):
+    """
+    시드 고정 합성 일봉 / 틱 픽스처로 dynamicCall 에 응답하는 가짜 OCX
+    - 일봉: 종목코드 시드 랜덤 워크 (generate_daily_bars), 틱: seed 고정 (generate_ticks, 전 종목 기준가 = 마지막 종가)
+    - opt10081 GetCommDataEx 응답은 미리 문자열 표로 만들어 두고 잘라서 돌려줌 (측정 구간에 응답 생성 비용 제외)
+    """
+
+    def __init__(self, codes, ticks, seed, session_date, cash, tick_histogram):
+        super().__init__(cash=cash, session_date=session_date)
+        self.OnReceiveRealData = TimedSignal(tick_histogram)
+        self.daily_bars = {code: generate_daily_bars(code, end_date=session_date) for code in codes}
+        base_prices = {code: bars[-1][4] for code, bars in self.daily_bars.items()}
+        self.ticks = generate_ticks(codes, ticks, base_prices=base_prices, seed=seed)
+        self.clock = self.ticks[0][0]
+
+        # 봉 튜플 (일자, 시가, 고가, 저가, 종가, 거래량) → opt10081 필드 순서, 나머지 필드는 빈 칸
+        record, fields = MULTI_RECORDS["opt10081"]
+        bar_fields = {"일자": 0, "시가": 1, "고가": 2, "저가": 3, "현재가": 4, "거래량": 5}
+        columns = [bar_fields.get(field) for field in fields]
+        blank = f"{'':>15}"
+        self.daily_chart_record = record
+        self.daily_chart_pages = {
+            code: [[blank if i is None else f"{bar[i]:>15}" for i in columns] for bar in reversed(bars)]
+            for code, bars in self.daily_bars.items()
+        }
+        self.daily_chart_index = {code: {bar[0]: i for i, bar in enumerate(reversed(bars))}
+                                  for code, bars in self.daily_bars.items()}
+
+    def _get_comm_data_ex(self, trcode, record_name):
+        key = self._tr_last.get(trcode)
+        rows = self._tr_rows.get(key)
+        if trcode != "opt10081" or not rows or record_name != self.daily_chart_record:
+            return super()._get_comm_data_ex(trcode, record_name)
+        # 시뮬레이터가 고른 페이지(기준일자 / 연속 조회 반영)의 첫 봉 위치부터 잘라서 응답
+        code = self._tr_single[key]["종목코드"]
+        start = self.daily_chart_index[code][rows[0]["일자"]]
+        return self.daily_chart_pages[code][start:start + len(rows)]
+
+
+def timed(fn, histogram):
+    """함수 호출 시간을 히스토그램에 기록하는 래퍼"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            histogram.record(time.perf_counter_ns() - start)
+    return wrapper
+
+
+def timed_once(fn, *args):
+    """1회 실행 → 히스토그램 (시작 / 종료 경로)"""
+    histogram = LatencyHistogram()
+    timed(fn, histogram)(*args)
+    return histogram
+
+
+# -----------------------------------
+# 🔵 2. 경로별 측정
+# -----------------------------------
+def run(args):
+    """
+    일봉 수신 → 지표 계산 → 틱 리플레이(매수 / 매도 판단) → 종료 처리 → {경로: LatencyHistogram}, 리플레이 통계
+    - daily_chart: opt10081 페이지 1개 변환 (handle_daily_chart), daily_chart_done: 확정 봉 저장
+    - indicators: 전 종목 지표 일괄 계산 (recompute_indicators, 시작 1회 + 리플레이 후 재계산 repeat - 1회)
+    - tick: OnReceiveRealData 1건 처리 전체, evaluate: 평가 묶음 1개 (지표 + 전략 + 주문)
+    - try_buy / try_sell: 분할 매수 수량 계산·주문 / 매도 판단·주문
+    - save_trade_log / report / shutdown: 저널 커밋, 체결 FIFO 재생(리포트, repeat 회), 종료 처리 전체
+    """
+    paths = {name: LatencyHistogram() for name in (
+        "daily_chart", "daily_chart_done", "indicators", "tick", "evaluate", "try_buy", "try_sell")}
+    codes = [f"{100000 + i:06d}" for i in range(args.symbols)]
+    session_date = date.fromisoformat(args.date)
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as devnull:
+        config = os.path.join(tmp, "config.ini")
+        with open(config, 'w', encoding='utf-8') as f:
+            f.write(CONFIG.format(targets={code: code for code in codes}, decision_ms=args.decision_ms,
+                                  strategy=args.strategy, tmp=tmp.replace('\\', '/')))
+
+        with contextlib.redirect_stdout(devnull):
+            ocx = FixtureTransport(codes, args.ticks, args.seed, session_date, args.cash, paths["tick"])
+            k = Kiwoom(transport=ocx, config_path=config)
+            for method, path in (("handle_daily_chart", "daily_chart"), ("_on_daily_chart_done", "daily_chart_done"),
+                                 ("recompute_indicators", "indicators"), ("_evaluate_batch", "evaluate"),
+                                 ("try_buy", "try_buy"), ("try_sell", "try_sell")):
+                setattr(k, method, timed(getattr(k, method), paths[path]))
+
+            k.run()
+            for _ in range(args.repeat - 1):
+                k.recompute_indicators()
+            paths["save_trade_log"] = timed_once(k.save_trade_log)
+            paths["report"] = LatencyHistogram()
+            report = timed(lambda: replay_fills(query(k.journal.path, kinds=(FILL,))), paths["report"])
+            for _ in range(args.repeat):
+                report()
+            paths["shutdown"] = timed_once(k.shutdown)
+        stats = dict(ocx.stats, fills=k.pnl.fills, journal=k.journal.written)
+    return paths, stats
+
+
+def summarize(histogram):
+    """히스토그램 → {count, per_sec(경로 안에서 보낸 시간 기준), p50_us, p99_us}"""
+    return {
+        "count": histogram.count,
+        "per_sec": histogram.count / (histogram.total / 1e9) if histogram.total else 0.0,
+        "p50_us": histogram.quantile(0.5) / 1000,
+        "p99_us": histogram.quantile(0.99) / 1000,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="실시간 경로 벤치마크 (가짜 OCX + 합성 일봉 / 틱, 기준값 대비 회귀 검사)")
+    parser.add_argument("--symbols", type=int, default=2000, help="관심 종목 수 (종목당 일봉 600봉)")
+    parser.add_argument("--ticks", type=int, default=500_000, help="리플레이 틱 수")
+    parser.add_argument("--seed", type=int, default=0, help="틱 생성 시드")
+    parser.add_argument("--date", default="2026-10-16", help="시뮬레이터 거래일 (YYYY-MM-DD)")
+    parser.add_argument("--cash", type=int, default=10_000_000_000, help="시뮬레이터 초기 예수금")
+    parser.add_argument("--strategy", default="ema5", help="매수 / 매도 전략 ([STRATEGY] strategy)")
+    parser.add_argument("--decision-ms", type=int, default=50, help="결정 루프 주기 (0: 틱마다 즉시 평가)")
+    parser.add_argument("--repeat", type=int, default=5, help="지표 재계산 / 리포트 반복 횟수")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="기준값 대비 허용 악화율 (0.5 = 50%%)")
+    parser.add_argument("--min-samples", type=int, default=20,
+                        help="표본이 이보다 적은 경로는 p50 만 --single-tolerance 로 검사 (1회성 경로 측정 편차)")
+    parser.add_argument("--single-tolerance", type=float, default=1.0, help="표본이 적은 경로의 허용 악화율")
+    parser.add_argument("--slack-us", type=float, default=50.0, help="p99 허용 절대 증가량 (µs)")
+    parser.add_argument("--update-baseline", action="store_true", help="현재 측정값을 기준값으로 저장")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    paths, stats = run(args)
+    elapsed = time.perf_counter() - start
+    results = {name: summarize(histogram) for name, histogram in paths.items()}
+
+    # 기준값은 규모(종목 수 × 틱 수 × 결정 루프 주기 × 전략)별로 따로 보관
+    scenario = f"{args.symbols}x{args.ticks}/{args.decision_ms}ms/{args.strategy}"
+    baselines = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding='utf-8') as f:
+            baselines = json.load(f)
+    baseline = baselines.get(scenario, {})
+
+    print(f"[📊 시나리오] {scenario} / 리플레이 {stats['ticks']:,}틱 {stats['ticks_per_sec']:,.0f} ticks/s / "
+          f"체결 {stats['fills']:,}건 / 전체 {elapsed:.1f}초")
+    print(f"{'경로':<18}{'건수':>10}{'처리량(/s)':>14}{'p50(µs)':>12}{'p99(µs)':>12}{'기준 p50':>12}{'기준 p99':>12}  결과")
+    failed = False
+    for name, result in results.items():
+        base = baseline.get(name)
+        base_p50 = f"{base['p50_us']:,.1f}" if base else "-"
+        base_p99 = f"{base['p99_us']:,.1f}" if base else "-"
+        status = "✅"
+        if result["count"] == 0:
+            status = "- (호출 없음)"
+        elif base is not None and result["count"] < args.min_samples:
+            if result["p50_us"] > base["p50_us"] * (1 + args.single_tolerance) + args.slack_us:
+                status = "❌ 느려짐 (p50)"
+                failed = True
+        elif base is not None:
+            slow = result["p99_us"] > base["p99_us"] * (1 + args.tolerance) + args.slack_us
+            slow_rate = result["per_sec"] < base["per_sec"] / (1 + args.tolerance)
+            if slow or slow_rate:
+                status = "❌ 느려짐 (" + ", ".join(k for k, bad in (("p99", slow), ("처리량", slow_rate)) if bad) + ")"
+                failed = True
+        print(f"{name:<18}{result['count']:>10,}{result['per_sec']:>14,.0f}{result['p50_us']:>12,.1f}"
+              f"{result['p99_us']:>12,.1f}{base_p50:>12}{base_p99:>12}  {status}")
+
+    if args.update_baseline:
+        baselines[scenario] = {name: {key: round(value, 1) for key, value in result.items()}
+                               for name, result in results.items()}
+        with open(BASELINE, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, ensure_ascii=False)
+        print(f"[✅ 기준값 저장 완료]: {BASELINE} ({scenario})")
+    elif failed:
+        sys.exit(1)
@@ -0,0 +1,106 @@
+import sys
+import os
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+UTILS = os.path.join(ROOT, 'utils')
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline_startup.json')
+
+# 모듈별로 임포트 시점에 로드되면 안 되는 무거운 의존성
+HEAVY = ("PyQt5", "matplotlib", "pandas", "openpyxl")
+FORBIDDEN = {
+    "strategy": HEAVY + ("numpy",),
+    "indicators": HEAVY + ("numpy",),
+    "pnl": HEAVY + ("numpy",),
+    "order_manager": HEAVY + ("numpy",),
+    "trade_journal": HEAVY + ("numpy",),
+    "kiwoom": HEAVY + ("numpy",),
+    "backtester": ("PyQt5", "matplotlib", "pandas", "openpyxl"),
+}
+
+IMPORT_SCRIPT = """
+import sys, time, json
+sys.path.insert(0, {utils!r})
+t = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - t) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# 시뮬레이터 전송 계층으로 Kiwoom 생성 + 로그인까지 (실제 main.py 의 로그인 전 구간)
+STARTUP_SCRIPT = """
+import sys, os, time, json, tempfile, contextlib
+t = time.perf_counter()
+sys.path.insert(0, {utils!r})
+from kiwoom import Kiwoom
+from simulator import SimulatedTransport
+tmp = tempfile.mkdtemp()
+config = os.path.join(tmp, "config.ini")
+with open(config, "w", encoding="utf-8") as f:
+    f.write("[USER]\\naccount_pw = 0000\\n[TRADING]\\nmax_profit_rate = 5\\nmax_loss_rate = -3\\n"
+            "max_holding_count = 5\\nmax_stock_ratio = 10\\nbuy_split_count = 2\\nrestart_after_close = False\\n"
+            "target_list = {{'005930': '삼성전자'}}\\n[LOG]\\nlog_dir = " + tmp + "\\n[JOURNAL]\\npath = "
+            + os.path.join(tmp, "journal.db") + "\\n[CACHE]\\nenabled = False\\n[NOTIFY]\\nsinks = null\\n")
+with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+    k = Kiwoom(transport=SimulatedTransport(), config_path=config)
+    k.login()
+elapsed = (time.perf_counter() - t) * 1000
+k.log.close(); k.journal.close(); k.notifier.close()
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(script, repeat):
+    """새 인터프리터에서 repeat 회 실행 → (중앙값 ms, 로드된 무거운 모듈)"""
+    times, loaded = [], set()
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result["ms"])
+        loaded.update(result["loaded"])
+    return statistics.median(times), sorted(loaded)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="모듈 임포트 / 프로그램 시작 시간 벤치마크 (기준값 대비 회귀 검사)")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="기준값 대비 허용 증가율 (0.5 = 50%%)")
+    parser.add_argument("--slack-ms", type=float, default=20.0, help="허용 절대 증가량 (ms)")
+    parser.add_argument("--update-baseline", action="store_true", help="현재 측정값을 기준값으로 저장")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    heavy = tuple(sorted({m for mods in FORBIDDEN.values() for m in mods}))
+
+    results = {}
+    for module in FORBIDDEN:
+        results[f"import:{module}"] = measure(IMPORT_SCRIPT.format(utils=UTILS, module=module, heavy=heavy), args.repeat)
+    results["startup:login"] = measure(STARTUP_SCRIPT.format(utils=UTILS, heavy=heavy), args.repeat)
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    failed = False
+    print(f"{'항목':<24}{'중앙값(ms)':>12}{'기준값(ms)':>12}  결과")
+    for name, (ms, loaded) in results.items():
+        module = name.split(":", 1)[1]
+        forbidden = [m for m in loaded if m in FORBIDDEN.get(module, HEAVY)]
+        base = baseline.get(name)
+        slow = base is not None and ms > base * (1 + args.tolerance) + args.slack_ms
+        status = "❌ 무거운 모듈 로드: " + ", ".join(forbidden) if forbidden else ("❌ 느려짐" if slow else "✅")
+        failed |= bool(forbidden) or slow
+        print(f"{name:<24}{ms:>12.1f}{(f'{base:.1f}' if base is not None else '-'):>12}  {status}")
+
+    if args.update_baseline:
+        with open(BASELINE, 'w', encoding='utf-8') as f:
+            json.dump({name: round(ms, 1) for name, (ms, _) in results.items()}, f, indent=2)
+        print(f"[✅ 기준값 저장 완료]: {BASELINE}")
+    elif failed:
+        sys.exit(1)
@@ -0,0 +1,138 @@
+import sys
+import os
+import time
+import argparse
+import statistics
+import contextlib
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'utils'))
+
+import numpy as np
+from candle_cache import CANDLE_DTYPE
+from simulator import SimulatedTransport, generate_daily_bars
+from tr_records import DAILY_CHART_RECORD, BALANCE_RECORD, parse_daily_chart, parse_balance
+
+
+# -----------------------------------
+# 🔵 1. 기존 방식 (행 × 필드마다 GetCommData 호출)
+# -----------------------------------
+def per_row_daily_chart(ocx, trcode, rqname):
+    def get(i, field):
+        value = ocx.dynamicCall("GetCommData(QString, QString, int, QString)", trcode, rqname, i, field).strip()
+        return abs(int(value)) if value and value.lstrip('-+').isdigit() else None
+
+    rows = []
+    for i in range(ocx.dynamicCall("GetRepeatCnt(QString, QString)", trcode, rqname)):
+        close = get(i, "현재가")
+        if close is None:
+            continue
+        date = ocx.dynamicCall("GetCommData(QString, QString, int, QString)", trcode, rqname, i, "일자").strip()
+        rows.append((int(date), get(i, "시가") or close, get(i, "고가") or close,
+                     get(i, "저가") or close, close, get(i, "거래량") or 0))
+    return np.array(rows, dtype=CANDLE_DTYPE)
+
+
+def per_row_balance(ocx, trcode, rqname):
+    def get(i, field):
+        return ocx.dynamicCall("GetCommData(QString, QString, int, QString)", trcode, rqname, i, field).strip()
+
+    rows = []
+    for i in range(ocx.dynamicCall("GetRepeatCnt(QString, QString)", trcode, rqname)):
+        code = get(i, "종목번호").lstrip('A')
+        quantity, buy_price = get(i, "보유수량"), get(i, "매입가")
+        if code and quantity.lstrip('-').isdigit() and int(quantity) > 0:
+            rows.append((code, int(quantity), abs(int(buy_price or 0))))
+    return rows
+
+
+# -----------------------------------
+# 🔵 2. TR 픽스처 (시뮬레이터가 만든 응답을 그대로 읽음)
+# -----------------------------------
+class CountingTransport:
+    """dynamicCall 호출 수를 세는 전송 계층 래퍼 (실제 OCX 는 호출마다 COM 왕복 비용)"""
+
+    def __init__(self, ocx):
+        self.ocx = ocx
+        self.calls = 0
+
+    def dynamicCall(self, signature, *args):
+        self.calls += 1
+        return self.ocx.dynamicCall(signature, *args)
+
+
+def request(ocx, trcode, rqname, inputs):
+    """TR 1건 요청 후 수신 이벤트까지 전달 (GetCommData / GetCommDataEx 가 이 응답을 읽음)"""
+    for key, value in inputs.items():
+        ocx.dynamicCall("SetInputValue(QString, QString)", key, value)
+    ocx.dynamicCall("CommRqData(QString, QString, int, QString)", rqname, trcode, 0, "2000")
+    ocx.process_events()
+
+
+def measure(ocx, trcode, rqname, record_name, legacy_fn, parse_fn, repeat):
+    """
+    같은 응답을 두 방식으로 처리 → (기존 호출 수, 기존 ms, 일괄 호출 수, 변환 ms)
+    - 기존: 행 × 필드 GetCommData (시뮬레이터 호출 비용 포함)
+    - 일괄: GetCommDataEx 1회로 받은 픽스처를 NumPy 로 변환하는 시간만 측정
+    """
+    counting = CountingTransport(ocx)
+    legacy = legacy_fn(counting, trcode, rqname)
+    legacy_calls = counting.calls
+    data = ocx.dynamicCall("GetCommDataEx(QString, QString)", trcode, record_name)
+    bulk = parse_fn(data)
+    same = np.array_equal(legacy, bulk) if isinstance(bulk, np.ndarray) else legacy == bulk
+    if not same:
+        sys.exit(f"[❌ 결과 불일치] {trcode} / {rqname}")
+    legacy_ms = timed(lambda: legacy_fn(ocx, trcode, rqname), repeat)
+    parse_ms = timed(lambda: parse_fn(data), repeat)
+    return legacy_calls, legacy_ms, 1, parse_ms, len(bulk)
+
+
+def timed(fn, repeat):
+    """repeat 회 실행 → 중앙값 ms"""
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000)
+    return statistics.median(times)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="TR 수신 처리 벤치마크 (GetCommData 행 단위 vs GetCommDataEx 일괄 변환)")
+    parser.add_argument("--symbols", type=int, default=20, help="일봉 조회 종목 수 (종목당 600봉 1페이지)")
+    parser.add_argument("--positions", type=int, default=200, help="잔고 조회 보유 종목 수")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--call-us", type=float, default=0.0,
+                        help="OCX 호출 1회 비용 가정 (µs, 실제 COM 왕복 비용을 예상치에 더함)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        ocx = SimulatedTransport()
+    ocx.OnReceiveTrData.connect(lambda *a: None)
+    codes = [f"{100000 + i:06d}" for i in range(args.symbols)]
+    ocx.daily_bars = {code: generate_daily_bars(code, end_date=ocx.session_date) for code in codes}
+
+    totals = [0, 0.0, 0, 0.0, 0]
+    for code in codes:
+        request(ocx, "opt10081", "일봉데이터", {"종목코드": code, "수정주가구분": "1"})
+        result = measure(ocx, "opt10081", "일봉데이터", DAILY_CHART_RECORD,
+                         per_row_daily_chart, parse_daily_chart, args.repeat)
+        totals = [a + b for a, b in zip(totals, result)]
+    results = [(f"opt10081 x{args.symbols} ({totals[4]:,}봉)", *totals[:4])]
+
+    ocx.positions = {f"{200000 + i:06d}": (10 + i, 1000 + i) for i in range(args.positions)}
+    request(ocx, "opw00018", "계좌평가잔고내역요청", {"계좌번호": ocx.account_number})
+    result = measure(ocx, "opw00018", "계좌평가잔고내역요청", BALANCE_RECORD,
+                     per_row_balance, parse_balance, args.repeat)
+    results.append((f"opw00018 ({result[4]:,}종목)", *result[:4]))
+
+    print(f"{'TR':<26}{'기존 호출':>10}{'기존(ms)':>10}{'Ex 호출':>9}{'변환(ms)':>10}{'예상 배율':>10}")
+    for name, legacy_calls, legacy_ms, bulk_calls, parse_ms in results:
+        legacy_est = legacy_ms + legacy_calls * args.call_us / 1000
+        bulk_est = parse_ms + bulk_calls * args.call_us / 1000
+        print(f"{name:<26}{legacy_calls:>10,}{legacy_ms:>10.2f}{bulk_calls:>9,}{parse_ms:>10.2f}"
+              f"{legacy_est / bulk_est:>9.1f}x")
@@ -0,0 +1,65 @@
+import sys
+import os
+import argparse
+import configparser
+
+# 'utils' 폴더 경로를 sys.path에 추가 (프로세스 풀 자식 프로세스도 이 경로로 모듈을 찾음)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from backtester import params_from_config, load_panel, run_backtest, print_report
+from candle_cache import CandleCache
+from simulator import generate_daily_panel
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="매매 규칙 백테스트 (일봉, 다종목 벡터 연산)")
+    parser.add_argument("--config", default="config.ini", help="설정 파일 경로 ([TRADING] 매매 규칙)")
+    parser.add_argument("--candle-dir", help="일봉 캐시 폴더 (기본값: config [CACHE] candle_dir)")
+    parser.add_argument("--codes", help="종목코드 목록 (쉼표 구분, all: 캐시 폴더 전체, 기본값: target_list)")
+    parser.add_argument("--generate", type=int, default=0, help="합성 일봉으로 테스트할 종목 수")
+    parser.add_argument("--bars", type=int, default=2500, help="합성 일봉 개수 (2500 ≈ 10년)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 시드")
+    parser.add_argument("--strategy", choices=("macd", "ema5"), help="매수 전략 (기본값: config [BACKTEST] strategy)")
+    parser.add_argument("--workers", type=int, default=0, help="프로세스 수 (0: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="프로세스 작업 1개당 종목 수")
+    parser.add_argument("--out", help="종목별 결과 CSV 저장 경로 (거래 내역은 *_trades.csv)")
+    return parser.parse_args()
+
+
+def load_codes(args, config, cache):
+    if args.codes == "all":
+        return sorted(name[:-4] for name in os.listdir(cache.root) if name.endswith(".bin"))
+    if args.codes:
+        return [code.strip() for code in args.codes.split(",") if code.strip()]
+    return list(eval(config['TRADING']['target_list']).keys())
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = configparser.ConfigParser()
+    config.read(args.config, encoding='utf-8')
+
+    params = params_from_config(config)
+    if args.strategy:
+        params["strategy"] = args.strategy
+
+    if args.generate:
+        panel = generate_daily_panel(args.generate, count=args.bars, seed=args.seed)
+    else:
+        default_dir = os.path.join(os.path.dirname(__file__), '..', 'cache', 'candles')
+        cache = CandleCache(args.candle_dir or config.get('CACHE', 'candle_dir', fallback=default_dir))
+        panel = load_panel(cache, load_codes(args, config, cache))
+        if not panel["codes"]:
+            print("[⚠️ 일봉 캐시 없음] 먼저 프로그램을 실행해 일봉을 받거나 --generate 로 합성 데이터 사용")
+            sys.exit(1)
+
+    print(f"[🧪 백테스트 시작] {len(panel['codes']):,}종목 / 전략: {params['strategy']} / "
+          f"익절 {params['max_profit_rate']}% / 손절 {params['max_loss_rate']}% / 분할 {params['buy_split_count']}회")
+    report = run_backtest(panel, params, workers=args.workers or None, chunk_size=args.chunk_size)
+    print_report(report)
+
+    if args.out:
+        report["symbols"].to_csv(args.out, index=False, encoding='utf-8-sig')
+        trades_path = os.path.splitext(args.out)[0] + "_trades.csv"
+        report["trades"].to_csv(trades_path, index=False, encoding='utf-8-sig')
+        print(f"[✅ 백테스트 결과 저장 완료]: {args.out}, {trades_path}")
@@ -0,0 +1,33 @@
+import sys
+import os
+import argparse
+
+# 'utils' 폴더 경로를 sys.path에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from trade_journal import query, export_csv, export_xlsx, KIND_NAMES
+
+
+def parse_args():
+    default_db = os.path.join(os.path.dirname(__file__), '..', 'logs', 'trade_journal.db')
+    parser = argparse.ArgumentParser(description="매매 저널 → 엑셀/CSV 내보내기 (오프라인)")
+    parser.add_argument("--db", default=default_db, help="매매 저널 파일 (기본값: logs/trade_journal.db)")
+    parser.add_argument("--date", help="조회 일자 YYYY-MM-DD")
+    parser.add_argument("--since", help="조회 시작 일자 YYYY-MM-DD")
+    parser.add_argument("--until", help="조회 종료 일자 YYYY-MM-DD")
+    parser.add_argument("--code", help="종목코드")
+    parser.add_argument("--kinds", help=f"기록 종류 (쉼표 구분: {', '.join(KIND_NAMES)})")
+    parser.add_argument("--out", required=True, help="저장 경로 (.xlsx 또는 .csv)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not os.path.exists(args.db):
+        sys.exit(f"[❌ 매매 저널 없음]: {args.db}")
+
+    kinds = [k.strip() for k in args.kinds.split(",")] if args.kinds else None
+    rows = query(args.db, date=args.date, code=args.code, kinds=kinds, since=args.since, until=args.until)
+    export = export_xlsx if args.out.lower().endswith(".xlsx") else export_csv
+    count = export(rows, args.out)
+    print(f"[✅ 매매 기록 내보내기 완료]: {args.out} ({count:,}건)")
@@ -1,19 +1,107 @@
 import sys
 import os
-from datetime import datetime
+import time
+import argparse
+import configparser
+from datetime import datetime, timedelta
 
 # 'utils' 폴더 경로를 sys.path에 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
 
-# 'kiwoom' 모듈 임포트
+# 'kiwoom' 모듈 임포트 (PyQt5 / NumPy 등은 실제로 쓰는 시점에 로드)
 from kiwoom import Kiwoom
+from transport import OcxTransport
+from coordinator import RiskCoordinator, RUNNING, DONE
+
+# 자동 재시작 (연속 재시작 횟수는 다시 실행한 프로세스에 환경 변수로 넘김)
+RESTART_ENV = "KIWOOM_RESTART_COUNT"
+MAX_RESTART_DELAY_SEC = 1800        # 백오프 최대 대기 시간
+RESTART_RESET_SEC = 3600            # 이만큼 정상 실행한 뒤의 에러는 새 장애로 보고 재시작 횟수를 0 부터 다시 셈
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Kiwoom 자동매매 실행")
+    parser.add_argument("--config", default="config.ini", help="설정 파일 경로")
+    parser.add_argument("--headless", action="store_true",
+                        help="Qt 위젯 없이 실행 (QCoreApplication + QAxObject, 알림은 로그/웹훅만)")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="관심 종목을 나눠 맡을 워커 프로세스 수 (2 이상이면 샤드 모드, 워커는 헤드리스)")
+    parser.add_argument("--status-interval", type=float, default=60.0, help="샤드 모드 코디네이터 상태 출력 주기 (초)")
+    return parser.parse_args()
+
+
+def next_restart(kiwoom_instance, uptime_sec):
+    """
+    비정상 종료 후 자동 재시작 여부 → (대기 초, 재시작 횟수), 재시작하지 않으면 None
+    - restart_after_close 이고 장 운영 스케줄까지 시작한 뒤의 에러만 재시작 (설정 / 로그인 / OCX 오류는 다시 실행해도 반복됨)
+    - 연속 max_restarts 회까지, 대기 시간은 restart_delay_sec × 2^횟수 (최대 MAX_RESTART_DELAY_SEC)
+    """
+    if not (kiwoom_instance.restart_after_close and kiwoom_instance.session_started):
+        return None
+    count = 0 if uptime_sec >= RESTART_RESET_SEC else int(os.environ.get(RESTART_ENV) or 0)
+    if count >= kiwoom_instance.max_restarts:
+        print(f"[🛑 자동 재시작 중단] 연속 {count}회 재시작 후에도 에러 발생")
+        return None
+    return min(kiwoom_instance.restart_delay_sec * 2 ** count, MAX_RESTART_DELAY_SEC), count + 1
+
+
+def restart_process(delay_sec, count):
+    """delay_sec 후 같은 인자로 프로세스를 다시 실행 (새 OCX / Qt 앱, 매매 상태는 스냅샷에서 복원)"""
+    print(f"[🔁 재시작 예약 ({count}회째)] {datetime.now() + timedelta(seconds=delay_sec):%Y-%m-%d %H:%M:%S}")
+    time.sleep(max(delay_sec, 0))
+    os.environ[RESTART_ENV] = str(count)
+    os.execv(sys.executable, [sys.executable] + sys.argv)
+
+
+def run_shard(shard, shards, risk, config_path):
+    """샤드 워커 프로세스: 자기 몫 종목만 감시, 현금 / 보유 종목 수는 코디네이터와 공유"""
+    kiwoom_instance = Kiwoom(transport=OcxTransport(headless=True), config_path=config_path,
+                             shard=(shard, shards), risk=risk)
+    risk.set_state(RUNNING)
+    try:
+        kiwoom_instance.run()
+    except KeyboardInterrupt:
+        kiwoom_instance.shutdown()
+    finally:
+        risk.set_state(DONE)
+
 
 if __name__ == "__main__":
-    kiwoom_instance = Kiwoom()
+    args = parse_args()
+    print(f"[🕒 프로그램 실행 시작] {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+
+    if args.shards > 1:
+        config = configparser.ConfigParser()
+        config.read(args.config, encoding='utf-8')
+        coordinator = RiskCoordinator(args.shards, max_holding_count=config.getint('TRADING', 'max_holding_count'))
+        exit_codes = coordinator.run(run_shard, (args.config,), status_interval=args.status_interval)
+        sys.exit(max(abs(code or 0) for code in exit_codes))
+
+    kiwoom_instance = Kiwoom(transport=OcxTransport(headless=args.headless), config_path=args.config)
+
+    # Qt 슬롯(이벤트 핸들러)에서 처리되지 않은 예외 → 이벤트 루프를 끝내고 아래 except 로 넘김
+    slot_errors = []
+
+    def on_slot_error(exc_type, exc, tb):
+        sys.__excepthook__(exc_type, exc, tb)
+        slot_errors.append(exc)
+        kiwoom_instance.app.quit()
+
+    sys.excepthook = on_slot_error
+    started = time.monotonic()
     try:
-        print(f"[🕒 프로그램 실행 시작] {datetime.now().strftime('%Y-%m-%d %H:%M')}")
         kiwoom_instance.run()
+        if slot_errors:
+            raise slot_errors[0]
     except KeyboardInterrupt:
         print("\n[🔴 강제 종료 요청]")
         kiwoom_instance.shutdown()
         sys.exit()
+    except Exception as e:
+        # 비정상 종료: 마지막 상태 스냅샷을 남기고, 자동 재시작이면 백오프 후 다시 실행해 스냅샷에서 이어감
+        print(f"[❌ 실행 중 에러 발생]: {e}")
+        kiwoom_instance.shutdown()
+        restart = next_restart(kiwoom_instance, time.monotonic() - started)
+        if restart is None:
+            raise
+        restart_process(*restart)
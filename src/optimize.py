@@ -0,0 +1,74 @@
+import sys
+import os
+import argparse
+import configparser
+
+# 'utils' 폴더 경로를 sys.path에 추가 (프로세스 풀 자식 프로세스도 이 경로로 모듈을 찾음)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from backtester import params_from_config, load_panel
+from candle_cache import CandleCache
+from optimizer import METRICS, SWEEP_KEYS, parse_values, space_from_config, grid, random_samples, run_sweep, \
+    write_best_configs
+from simulator import generate_daily_panel
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="[TRADING] 매매 파라미터 탐색 (격자 / 랜덤, 전 코어 병렬)")
+    parser.add_argument("--config", default="config.ini", help="기준 설정 파일 ([SWEEP] 섹션에 탐색 공간)")
+    parser.add_argument("--candle-dir", help="일봉 캐시 폴더 (기본값: config [CACHE] candle_dir)")
+    parser.add_argument("--codes", default="all", help="종목코드 목록 (쉼표 구분, all: 캐시 폴더 전체)")
+    parser.add_argument("--generate", type=int, default=0, help="합성 일봉으로 탐색할 종목 수")
+    parser.add_argument("--bars", type=int, default=2500, help="합성 일봉 개수")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 / 랜덤 탐색 시드")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUES",
+                        help="탐색 공간 지정 (예: max_profit_rate=3:9:1, buy_split_count=1,2,3)")
+    parser.add_argument("--random", type=int, default=0, help="랜덤 탐색 횟수 (0: 격자 탐색)")
+    parser.add_argument("--metric", choices=METRICS, default="return_pct", help="순위 기준 지표")
+    parser.add_argument("--workers", type=int, default=0, help="프로세스 수 (0: CPU 수)")
+    parser.add_argument("--cache-dir", help="결과 캐시 폴더 (기본값: 프로젝트 cache/sweeps)")
+    parser.add_argument("--top", type=int, default=3, help="저장할 상위 설정 수")
+    parser.add_argument("--out-dir", default="sweep_results", help="상위 config.ini 저장 폴더")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = configparser.ConfigParser()
+    config.read(args.config, encoding='utf-8')
+
+    space = space_from_config(config)
+    for item in args.set:
+        key, _, spec = item.partition("=")
+        key = next((k for k, v in SWEEP_KEYS.items() if key.strip() in (k, v)), None)
+        if key is None:
+            sys.exit(f"[❌ 탐색 불가 파라미터] {item} (가능: {', '.join(SWEEP_KEYS.values())})")
+        space[key] = parse_values(key, spec)
+    if not space:
+        sys.exit("[❌ 탐색 공간 없음] config [SWEEP] 섹션 또는 --set 으로 지정")
+
+    if args.generate:
+        panel = generate_daily_panel(args.generate, count=args.bars, seed=args.seed)
+    else:
+        default_dir = os.path.join(os.path.dirname(__file__), '..', 'cache', 'candles')
+        cache = CandleCache(args.candle_dir or config.get('CACHE', 'candle_dir', fallback=default_dir))
+        codes = sorted(n[:-4] for n in os.listdir(cache.root) if n.endswith(".bin")) if args.codes == "all" \
+            else [c.strip() for c in args.codes.split(",") if c.strip()]
+        panel = load_panel(cache, codes)
+        if not panel["codes"]:
+            sys.exit("[⚠️ 일봉 캐시 없음] 먼저 프로그램을 실행해 일봉을 받거나 --generate 로 합성 데이터 사용")
+
+    candidates = random_samples(space, args.random, args.seed) if args.random else grid(space)
+    cache_dir = args.cache_dir or os.path.join(os.path.dirname(__file__), '..', 'cache', 'sweeps')
+    results = run_sweep(panel, params_from_config(config), candidates, workers=args.workers or None,
+                        cache_dir=cache_dir, metric=args.metric)
+
+    print(f"[🏆 상위 {min(args.top, len(results))}개 파라미터] 기준: {args.metric}")
+    for rank, result in enumerate(results[:args.top], 1):
+        params = ", ".join(f"{SWEEP_KEYS[k]}={result['params'][k]}" for k in SWEEP_KEYS)
+        s = result["summary"]
+        print(f"  {rank}. {params} → 수익률 {s['return_pct']:.2f}% / 최대 낙폭 {s['max_drawdown_pct']:.2f}% / "
+              f"샤프 {s['sharpe']:.2f}")
+
+    for path in write_best_configs(results, args.config, args.out_dir, args.top, args.metric):
+        print(f"[✅ 설정 파일 저장 완료]: {path}")
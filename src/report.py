@@ -0,0 +1,89 @@
+import sys
+import os
+import argparse
+
+# 'utils' 폴더 경로를 sys.path에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from trade_journal import query, FILL
+from pnl import replay_fills
+
+
+def parse_args():
+    default_db = os.path.join(os.path.dirname(__file__), '..', 'logs', 'trade_journal.db')
+    parser = argparse.ArgumentParser(description="매매 저널 체결 기록 → 실현손익 리포트 / 그래프")
+    parser.add_argument("--db", default=default_db, help="매매 저널 파일 (기본값: logs/trade_journal.db)")
+    parser.add_argument("--date", help="리포트 기준 일자 YYYY-MM-DD (기본값: 마지막 체결일)")
+    parser.add_argument("--since", help="그래프 시작 일자 YYYY-MM-DD (기본값: 전체)")
+    parser.add_argument("--fee-rate", type=float, default=0.0, help="매수/매도 수수료율")
+    parser.add_argument("--tax-rate", type=float, default=0.0, help="매도 세율")
+    parser.add_argument("--out-dir", help="저장 폴더 (기본값: 저널 파일 폴더)")
+    parser.add_argument("--no-chart", action="store_true", help="그래프 생략")
+    return parser.parse_args()
+
+
+def draw_chart(days, file_path):
+    """일별 실현손익 막대 + 누적 실현손익 선 그래프 저장"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    dates = [d for d, _ in days]
+    realized = [v["realized"] for _, v in days]
+    cumulative = []
+    total = 0.0
+    for value in realized:
+        total += value
+        cumulative.append(total)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(dates, realized, color=["tab:red" if v >= 0 else "tab:blue" for v in realized], label='일별 실현손익')
+    ax.plot(dates, cumulative, color='black', marker='o', label='누적 실현손익')
+    ax.axhline(y=0, color='gray', linewidth=0.8)
+    ax.set_title('📈 일별 실현손익')
+    ax.set_xlabel('날짜')
+    ax.set_ylabel('손익(원)')
+    ax.legend()
+    ax.grid(True)
+    fig.autofmt_xdate(rotation=45)
+    fig.tight_layout()
+    fig.savefig(file_path)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not os.path.exists(args.db):
+        sys.exit(f"[❌ 매매 저널 없음]: {args.db}")
+
+    # FIFO 매칭은 이전 날짜에 산 로트도 필요하므로 기준일까지 전체 체결을 재생
+    tracker, daily = replay_fills(query(args.db, kinds=(FILL,), until=args.date), args.fee_rate, args.tax_rate)
+    if not daily:
+        sys.exit("[⚠️ 체결 기록 없음] 리포트 생략")
+
+    report_date = args.date or max(daily)
+    days = sorted((d, v) for d, v in daily.items() if (not args.since or d >= args.since) and d <= report_date)
+    today = daily.get(report_date, {"realized": 0.0, "fills": 0, "bought": 0.0, "sold": 0.0})
+    stats = tracker.stats()
+
+    print(f"[📊 손익 리포트] {report_date}")
+    print(f"  당일 실현손익 {today['realized']:,.0f}원 / 체결 {today['fills']}건 / "
+          f"매수 {today['bought']:,.0f}원 / 매도 {today['sold']:,.0f}원")
+    print(f"  누적 실현손익 {stats['realized']:,.0f}원 / 승률 {stats['win_rate_pct']:.1f}% ({stats['round_trips']}회) / "
+          f"미청산 {stats['open_positions']}종목 (원가 {stats['cost_basis']:,.0f}원)")
+
+    out_dir = args.out_dir or os.path.dirname(os.path.abspath(args.db))
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = report_date.replace("-", "")
+
+    csv_path = os.path.join(out_dir, f"pnl_report_{stamp}.csv")
+    with open(csv_path, 'w', encoding='utf-8-sig') as f:
+        f.write("날짜,실현손익,체결수,매수금액,매도금액\n")
+        for d, v in days:
+            f.write(f"{d},{v['realized']:.0f},{v['fills']},{v['bought']:.0f},{v['sold']:.0f}\n")
+    print(f"[✅ 손익 리포트 저장 완료]: {csv_path}")
+
+    if not args.no_chart:
+        graph_path = os.path.join(out_dir, f"profit_graph_{stamp}.png")
+        draw_chart(days, graph_path)
+        print(f"[✅ 수익률 그래프 저장 완료]: {graph_path}")
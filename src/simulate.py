@@ -0,0 +1,93 @@
+import sys
+import os
+import time
+import argparse
+import contextlib
+import configparser
+from datetime import datetime
+
+# 'utils' 폴더 경로를 sys.path에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from kiwoom import Kiwoom
+from simulator import SimulatedTransport, load_ticks, save_ticks, generate_ticks, generate_daily_bars
+from coordinator import RiskCoordinator, RUNNING, DONE
+from market_calendar import KrxCalendar
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="키움 시뮬레이터 틱 리플레이 (헤드리스 벤치마크)")
+    parser.add_argument("--config", default="config.ini", help="설정 파일 경로")
+    parser.add_argument("--ticks", help="틱 CSV 파일 (time,code,price,volume)")
+    parser.add_argument("--generate", type=int, default=100_000, help="틱 파일이 없을 때 생성할 합성 틱 수")
+    parser.add_argument("--save-ticks", help="생성한 합성 틱을 저장할 CSV 경로")
+    parser.add_argument("--speed", type=float, default=0, help="재생 배속 (0: 최대 속도)")
+    parser.add_argument("--cash", type=int, default=10_000_000, help="시뮬레이터 초기 예수금")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 시드")
+    parser.add_argument("--shards", type=int, default=1, help="워커 프로세스 수 (2 이상이면 종목을 나눠 병렬 재생)")
+    parser.add_argument("--quiet", action="store_true", help="리플레이 중 콘솔 출력 숨김")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="상태 스냅샷 저장 / 복원 사용 (기본: 끔 – 실거래 스냅샷을 덮어쓰지 않도록)")
+    return parser.parse_args()
+
+
+def replay(args, session_date, shard=None, risk=None):
+    """시뮬레이터 1개 구성 후 재생 → 재생 통계 (샤드면 전체 틱 중 자기 몫 종목만 재생)"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        output = devnull if args.quiet else sys.stdout
+        with contextlib.redirect_stdout(output):
+            sim = SimulatedTransport(speed=args.speed, cash=args.cash, session_date=session_date)
+            kiwoom_instance = Kiwoom(transport=sim, config_path=args.config, shard=shard, risk=risk)
+            if not args.snapshot:
+                kiwoom_instance.snapshot_path = None
+
+            # 합성 데이터는 전체 종목 기준으로 만들어 샤드 수와 관계없이 같은 시장을 재생
+            config = configparser.ConfigParser()
+            config.read(args.config, encoding='utf-8')
+            all_codes = list(eval(config['TRADING']['target_list']).keys())
+            codes = set(kiwoom_instance.target_stocks)
+            if args.ticks:
+                ticks = load_ticks(args.ticks)
+            else:
+                daily_bars = {code: generate_daily_bars(code, end_date=session_date) for code in all_codes}
+                base_prices = {code: bars[-1][4] for code, bars in daily_bars.items()}
+                ticks = generate_ticks(all_codes, args.generate, base_prices=base_prices, seed=args.seed)
+                if args.save_ticks and not (shard and shard[0]):
+                    save_ticks(args.save_ticks, ticks)
+                sim.daily_bars = {code: bars for code, bars in daily_bars.items() if code in codes}
+            sim.ticks = [tick for tick in ticks if tick[1] in codes] if shard else ticks
+            if sim.ticks:
+                sim.clock = sim.ticks[0][0]
+
+            if risk is not None:
+                risk.set_state(RUNNING)
+            kiwoom_instance.run()
+            kiwoom_instance.shutdown()
+            if risk is not None:
+                risk.set_state(DONE)
+    return sim.stats
+
+
+def replay_shard(shard, shards, risk, args, session_date):
+    """샤드 워커 프로세스"""
+    stats = replay(args, session_date, shard=(shard, shards), risk=risk)
+    print(f"[📊 샤드 #{shard} 리플레이 결과] 틱 {stats.get('ticks', 0):,}건 / {stats.get('elapsed', 0):.3f}초 / "
+          f"{stats.get('ticks_per_sec', 0):,.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    session_date = KrxCalendar().last_trading_day(datetime.now().date())   # 휴장일이면 직전 거래일을 재생
+
+    if args.shards > 1:
+        config = configparser.ConfigParser()
+        config.read(args.config, encoding='utf-8')
+        coordinator = RiskCoordinator(args.shards, max_holding_count=config.getint('TRADING', 'max_holding_count'))
+        start = time.perf_counter()
+        coordinator.run(replay_shard, (args, session_date))
+        print(f"[📊 전체 리플레이 시간] {time.perf_counter() - start:.3f}초 (프로세스 시작 / 일봉 수신 포함)")
+        sys.exit()
+
+    stats = replay(args, session_date)
+    print(f"[📊 리플레이 결과] 틱 {stats.get('ticks', 0):,}건 / {stats.get('elapsed', 0):.3f}초 / "
+          f"{stats.get('ticks_per_sec', 0):,.0f} ticks/s")
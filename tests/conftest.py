@@ -0,0 +1,5 @@
+import os
+import sys
+
+# utils 모듈은 프로젝트에서처럼 최상위 모듈로 임포트 (src/main.py, benchmarks 와 같은 방식)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
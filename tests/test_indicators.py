@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import IndicatorEngine, SymbolIndicators, closes_to_matrix, compute_macd_matrix, ema_matrix
+
+
+def random_walk(n, seed):
+    rng = np.random.default_rng(seed)
+    return 10_000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+def pandas_macd(closes):
+    """기준값: pandas ewm(span, adjust=False)"""
+    s = pd.Series(closes)
+    ema5, ema12, ema26 = (s.ewm(span=span, adjust=False).mean() for span in (5, 12, 26))
+    macd = ema12 - ema26
+    return {"ema5": ema5, "ema12": ema12, "ema26": ema26, "macd": macd,
+            "signal": macd.ewm(span=9, adjust=False).mean()}
+
+
+def test_ema_matrix_matches_pandas_with_left_padding():
+    close_lists = [random_walk(n, seed) for seed, n in enumerate((120, 80, 1))]
+    matrix = closes_to_matrix(close_lists)
+    for span in (5, 12, 26):
+        result = ema_matrix(matrix, span)
+        for row, closes in enumerate(close_lists):
+            expected = pd.Series(closes).ewm(span=span, adjust=False).mean().to_numpy()
+            pad = matrix.shape[1] - len(closes)
+            assert np.isnan(result[row, :pad]).all()
+            np.testing.assert_allclose(result[row, pad:], expected, rtol=1e-12)
+
+
+def test_compute_macd_matrix_matches_pandas():
+    close_lists = [random_walk(n, seed) for seed, n in enumerate((200, 150, 60))]
+    result = compute_macd_matrix(closes_to_matrix(close_lists))
+    for row, closes in enumerate(close_lists):
+        expected = pandas_macd(closes)
+        for name, series in expected.items():
+            np.testing.assert_allclose(result[name][row, -len(closes):], series.to_numpy(), rtol=1e-9, atol=1e-9)
+
+        macd, signal = expected["macd"], expected["signal"]
+        golden = macd.iloc[-2] < signal.iloc[-2] and macd.iloc[-1] > signal.iloc[-1]
+        assert bool(result["golden_cross"][row]) == golden
+
+
+def test_incremental_update_and_commit_match_pandas():
+    closes = random_walk(300, seed=7)
+    expected = pandas_macd(closes)
+
+    engine = IndicatorEngine(capacity=1)
+    engine.seed_from_closes("005930", closes[:-1])
+    engine.update("005930", closes[-1])       # 오늘 봉 잠정값 = pandas 마지막 값
+
+    state = engine.get("005930")
+    close, ema5, macd, signal = state.current()
+    assert close == closes[-1]
+    assert ema5 == pytest.approx(expected["ema5"].iloc[-1], rel=1e-12)
+    assert macd == pytest.approx(expected["macd"].iloc[-1], rel=1e-9, abs=1e-9)
+    assert signal == pytest.approx(expected["signal"].iloc[-1], rel=1e-9, abs=1e-9)
+    assert state.previous() == pytest.approx((expected["macd"].iloc[-2], expected["signal"].iloc[-2]))
+
+    assert engine.commit_all() == ["005930"]
+    committed = engine.get("005930")
+    assert not committed.has_provisional
+    assert committed.current() == pytest.approx((close, ema5, macd, signal))
+    assert committed.previous() == pytest.approx((expected["macd"].iloc[-2], expected["signal"].iloc[-2]))
+
+
+def test_batch_matches_symbol_update():
+    engine = IndicatorEngine(capacity=2)   # 종목이 늘면 배열 확장
+    codes = ["000001", "000002", "000003"]
+    for seed, code in enumerate(codes):
+        engine.seed_from_closes(code, random_walk(100, seed))
+    prices = [11_000.0, 9_500.0, 10_250.0]
+
+    values = engine.batch(codes + ["999999"], prices + [1.0])   # 상태가 없는 종목은 제외
+    assert values["codes"] == codes
+    for i, (code, price) in enumerate(zip(codes, prices)):
+        state = engine.get(code)
+        expected = SymbolIndicators(state.close, state.ema5, state.ema12, state.ema26, state.signal,
+                                    state.prev_macd, state.prev_signal)
+        expected.update(price)
+        assert values["ema5"][i] == pytest.approx(expected.p_ema5)
+        assert values["macd"][i] == pytest.approx(expected.p_macd)
+        assert values["signal"][i] == pytest.approx(expected.p_signal)
+        assert values["prev_macd"][i] == pytest.approx(expected.macd)
+
+
+def test_update_unknown_code_is_ignored():
+    engine = IndicatorEngine()
+    assert engine.update("005930", 70_000) is False
+    assert engine.get("005930") is None
+    assert engine.commit_all() == []
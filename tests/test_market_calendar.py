@@ -0,0 +1,103 @@
+import configparser
+from datetime import date, datetime, time as dtime
+
+import pytest
+
+from market_calendar import (KrxCalendar, SessionScheduler, load_calendar_file, CLOSED, PRE_OPEN, OPEN_AUCTION,
+                             CONTINUOUS, CLOSING_AUCTION, AFTER_HOURS)
+from simulator import SimulatedTransport
+
+
+@pytest.fixture
+def calendar():
+    return KrxCalendar()
+
+
+@pytest.mark.parametrize("day, trading", [
+    (date(2026, 10, 16), True),     # 금요일
+    (date(2026, 10, 17), False),    # 토요일
+    (date(2026, 10, 18), False),    # 일요일
+    (date(2026, 10, 5), False),     # 추석 대체공휴일
+    (date(2026, 10, 9), False),     # 한글날
+    (date(2026, 12, 31), False),    # 연말 휴장일
+    (date(2026, 11, 19), True),     # 수능일 (시간만 변경)
+])
+def test_trading_days(calendar, day, trading):
+    assert calendar.is_trading_day(day) is trading
+    assert (calendar.transitions(day) != []) is trading
+
+
+def test_next_and_last_trading_day_skip_holidays(calendar):
+    assert calendar.next_trading_day(date(2026, 9, 23)) == date(2026, 9, 28)    # 추석 연휴 + 주말
+    assert calendar.last_trading_day(date(2026, 10, 5)) == date(2026, 10, 2)
+    assert calendar.last_trading_day(date(2026, 10, 16)) == date(2026, 10, 16)
+    assert calendar.next_trading_day(date(2026, 12, 30)) == date(2027, 1, 1)    # 내장 목록 밖 연도는 주말만 제외
+
+
+def test_regular_day_transitions(calendar):
+    day = date(2026, 10, 16)
+    assert calendar.transitions(day) == [
+        (datetime(2026, 10, 16, 8, 0), PRE_OPEN),
+        (datetime(2026, 10, 16, 8, 30), OPEN_AUCTION),
+        (datetime(2026, 10, 16, 9, 0), CONTINUOUS),
+        (datetime(2026, 10, 16, 15, 20), CLOSING_AUCTION),
+        (datetime(2026, 10, 16, 15, 30), AFTER_HOURS),
+        (datetime(2026, 10, 16, 18, 0), CLOSED),
+    ]
+
+
+@pytest.mark.parametrize("day, open_at, closing_auction_at", [
+    (date(2026, 1, 2), dtime(10, 0), dtime(15, 20)),     # 연초 첫 거래일: 개장 1시간 지연
+    (date(2026, 11, 19), dtime(10, 0), dtime(16, 20)),   # 수능일: 개장 / 마감 1시간 지연
+])
+def test_special_days_shift_open_and_close(calendar, day, open_at, closing_auction_at):
+    times = {phase: at.time() for at, phase in calendar.transitions(day)}
+    assert times[PRE_OPEN] == dtime(9, 0)
+    assert times[CONTINUOUS] == open_at
+    assert times[CLOSING_AUCTION] == closing_auction_at
+
+
+@pytest.mark.parametrize("now, phase, next_at", [
+    (datetime(2026, 10, 16, 7, 59), CLOSED, datetime(2026, 10, 16, 8, 0)),
+    (datetime(2026, 10, 16, 8, 45), OPEN_AUCTION, datetime(2026, 10, 16, 9, 0)),
+    (datetime(2026, 10, 16, 9, 0), CONTINUOUS, datetime(2026, 10, 16, 15, 20)),
+    (datetime(2026, 10, 16, 15, 25), CLOSING_AUCTION, datetime(2026, 10, 16, 15, 30)),
+    (datetime(2026, 10, 16, 17, 0), AFTER_HOURS, datetime(2026, 10, 16, 18, 0)),
+    (datetime(2026, 10, 16, 18, 0), CLOSED, datetime(2026, 10, 19, 8, 0)),     # 주말 건너뜀
+    (datetime(2026, 10, 2, 20, 0), CLOSED, datetime(2026, 10, 6, 8, 0)),       # 주말 + 대체공휴일
+    (datetime(2026, 11, 19, 16, 0), CONTINUOUS, datetime(2026, 11, 19, 16, 20)),
+])
+def test_phase_at(calendar, now, phase, next_at):
+    assert calendar.phase_at(now) == (phase, next_at)
+
+
+def test_calendar_file_and_config(tmp_path):
+    path = tmp_path / "krx_calendar.txt"
+    path.write_text("# 임시 휴장일 / 시간 변경일\n2026-10-16\n2026-10-19 30   # 개장 30분 지연\n\n2027-11-18 60 60\n",
+                    encoding="utf-8")
+    holidays, special_days = load_calendar_file(str(path))
+    assert holidays == {date(2026, 10, 16)}
+    assert special_days == {date(2026, 10, 19): (30, 0), date(2027, 11, 18): (60, 60)}
+
+    config = configparser.ConfigParser()
+    config.read_dict({"SESSION": {"warmup_time": "07:30", "calendar_file": str(path)}})
+    calendar = KrxCalendar.from_config(config)
+    assert not calendar.is_trading_day(date(2026, 10, 16))
+    assert not calendar.is_trading_day(date(2026, 10, 5))          # 내장 휴장일 유지
+    assert calendar.transitions(date(2026, 10, 19))[0][0] == datetime(2026, 10, 19, 8, 0)   # 07:30 + 30분
+    assert calendar.transitions(date(2026, 10, 20))[0][0] == datetime(2026, 10, 20, 7, 30)
+
+
+def test_scheduler_wakes_only_at_transitions():
+    sim = SimulatedTransport(session_date=date(2026, 10, 16))
+    sim.clock = 7 * 3600.0
+    changes = []
+    scheduler = SessionScheduler(sim, KrxCalendar(), lambda phase, previous: changes.append((phase, previous)))
+
+    assert scheduler.start() == CLOSED
+    sim.advance_clock(18.5 * 3600)
+    assert changes == [(CLOSED, None), (PRE_OPEN, CLOSED), (OPEN_AUCTION, PRE_OPEN), (CONTINUOUS, OPEN_AUCTION),
+                       (CLOSING_AUCTION, CONTINUOUS), (AFTER_HOURS, CLOSING_AUCTION), (CLOSED, AFTER_HOURS)]
+    # 구간 전환 6회 + 긴 구간은 max_wait_sec(1시간)마다 다시 확인 (정규장 6회, 장 마감 후 2회)
+    assert scheduler.wakeups == 6 + 6 + 2
+    assert scheduler.next_change == datetime(2026, 10, 19, 8, 0)
@@ -0,0 +1,205 @@
+from datetime import datetime, timedelta
+
+from order_manager import (OrderManager, BUY, SELL, SUBMITTED, ACCEPTED, PARTIAL, FILLED, REJECTED, CANCELLED)
+
+
+def chejan(order_no, code, status, side, quantity, cum_filled="", price="", unit_price="", unit_qty="",
+           original_no="0000000", kind=""):
+    """주문체결(gubun 0) FID 묶음 (키움 문자열 형식 그대로)"""
+    return {9203: order_no, 904: original_no, 9001: f"A{code}", 913: status, 905: kind,
+            907: "1" if side == SELL else "2", 900: str(quantity), 911: cum_filled, 910: price, 914: unit_price,
+            915: unit_qty}
+
+
+class Clock:
+    """OrderManager 에 넘기는 수동 시계"""
+
+    def __init__(self):
+        self.now = datetime(2026, 10, 16, 9, 0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+def test_buy_accept_partial_fill_then_filled():
+    manager = OrderManager(cash=1_000_000)
+    fills = []
+    manager.on_fill = lambda order, qty, price: fills.append((order.order_no, qty, price))
+
+    order = manager.submit("005930", BUY, 10, 50_000)
+    assert order.state == SUBMITTED
+    assert manager.reserved_cash == 500_000
+    assert manager.available_cash == 500_000
+    assert manager.has_open_order("005930", BUY)
+    assert manager.holding_codes() == {"005930"}
+
+    assert manager.on_chejan(chejan("0000001", "005930", "접수", BUY, 10)) is order
+    assert order.order_no == "0000001" and order.state == ACCEPTED
+
+    manager.on_chejan(chejan("0000001", "005930", "체결", BUY, 10, "4", "+49,900", "+49900", "4"))
+    assert order.state == PARTIAL
+    assert manager.cash == 1_000_000 - 4 * 49_900
+    assert order.reserved == 6 * 50_000
+    assert manager.positions["005930"] == {"buy_price": 49_900, "quantity": 4, "highest_price": 49_900}
+
+    # 단위체결량이 비어 있으면 누적체결량 차이로 계산
+    manager.on_chejan(chejan("0000001", "005930", "체결", BUY, 10, "10", "+50100", "", ""))
+    assert order.state == FILLED
+    assert order.reserved == 0
+    assert not manager.has_open_order("005930")
+    assert manager.positions["005930"]["quantity"] == 10
+    assert manager.positions["005930"]["buy_price"] == (4 * 49_900 + 6 * 50_100) / 10
+    assert order.avg_fill_price == manager.positions["005930"]["buy_price"]
+    assert fills == [("0000001", 4, 49_900), ("0000001", 6, 50_100)]
+
+
+def test_sell_fill_closes_position_and_returns_cash():
+    manager = OrderManager(cash=0)
+    manager.reconcile(0, {"000660": (5, 100_000)})
+
+    order = manager.submit("000660", SELL, 5, 110_000)
+    assert order.reserved == 0
+    manager.on_chejan(chejan("0000002", "000660", "체결", SELL, 5, "5", "-110000", "-110000", "5"))
+    assert order.state == FILLED
+    assert manager.cash == 550_000
+    assert "000660" not in manager.positions
+
+
+def test_reject_and_cancel_release_reserved_cash():
+    manager = OrderManager(cash=1_000_000)
+    rejected = manager.submit("005930", BUY, 2, 100_000)
+    cancelled = manager.submit("000660", BUY, 3, 100_000)
+    assert manager.open_order_count == 2
+
+    manager.on_chejan(chejan("0000003", "005930", "거부", BUY, 2))
+    manager.on_chejan(chejan("0000004", "000660", "접수", BUY, 3))
+    manager.on_chejan(chejan("0000004", "000660", "취소", BUY, 3))
+
+    assert (rejected.state, cancelled.state) == (REJECTED, CANCELLED)
+    assert manager.reserved_cash == 0
+    assert manager.available_cash == manager.cash == 1_000_000
+    assert manager.open_order_count == 0
+
+
+def test_order_numbers_assigned_in_submit_order_per_code_and_side():
+    manager = OrderManager(cash=10_000_000)
+    first = manager.submit("005930", BUY, 1, 70_000)
+    other = manager.submit("000660", BUY, 1, 100_000)
+    second = manager.submit("005930", BUY, 1, 70_000)
+
+    manager.on_chejan(chejan("0000010", "005930", "접수", BUY, 1))
+    manager.on_chejan(chejan("0000011", "005930", "접수", BUY, 1))
+    assert (first.order_no, second.order_no, other.order_no) == ("0000010", "0000011", None)
+
+    # 다른 방향 / 모르는 주문번호는 연결되지 않음
+    assert manager.on_chejan(chejan("0000012", "000660", "접수", SELL, 1)) is None
+
+
+def test_reconcile_deferred_while_orders_open():
+    manager = OrderManager(cash=1_000_000)
+    manager.submit("005930", BUY, 1, 70_000)
+    assert manager.reconcile(2_000_000, {"000660": (1, 100_000)}) is False
+    assert manager.cash == 1_000_000
+
+    manager.on_chejan(chejan("0000020", "005930", "체결", BUY, 1, "1", "70000", "70000", "1"))
+    assert manager.reconcile(2_000_000, {"000660": (1, 100_000)}) is True
+    assert manager.cash == 2_000_000
+    assert list(manager.positions) == ["000660"]
+
+
+def test_cancel_confirm_matches_original_order_number():
+    manager = OrderManager(cash=10_000_000)
+    live = manager.submit("005930", BUY, 3, 70_000)
+    manager.on_chejan(chejan("0000050", "005930", "접수", BUY, 3))
+    waiting = manager.submit("005930", BUY, 1, 70_000)                 # 아직 접수 전
+
+    # 취소 주문은 새 주문번호(0000051)로 접수 / 확인되고 904 가 원주문을 가리킴
+    assert manager.on_chejan(chejan("0000051", "005930", "접수", BUY, 3, original_no="0000050",
+                                    kind="매수취소")) is None
+    assert manager.on_chejan(chejan("0000051", "005930", "확인", BUY, 3, original_no="0000050",
+                                    kind="매수취소")) is live
+    assert (live.state, waiting.state, waiting.order_no) == (CANCELLED, SUBMITTED, None)
+
+    # 모르는 주문의 확인 / 취소는 미배정 주문과 연결하지 않음
+    assert manager.on_chejan(chejan("0000052", "005930", "확인", BUY, 1, original_no="0000099")) is None
+    assert manager.on_chejan(chejan("0000053", "005930", "취소", BUY, 1)) is None
+    assert waiting.state == SUBMITTED and manager.open_order_count == 1
+    assert manager.on_chejan(chejan("0000054", "005930", "접수", BUY, 1)) is waiting
+
+
+def test_modify_confirm_moves_order_to_new_number():
+    manager = OrderManager(cash=10_000_000)
+    order = manager.submit("000660", BUY, 2, 100_000)
+    manager.on_chejan(chejan("0000060", "000660", "접수", BUY, 2))
+    assert manager.on_chejan(chejan("0000061", "000660", "확인", BUY, 2, original_no="0000060",
+                                    kind="+매수정정")) is order
+    assert order.state == ACCEPTED and order.order_no == "0000061"
+
+    manager.on_chejan(chejan("0000061", "000660", "체결", BUY, 2, "2", "99000", "99000", "2",
+                             original_no="0000060", kind="+매수정정"))
+    assert order.state == FILLED and manager.positions["000660"]["quantity"] == 2
+
+
+def test_msg_rejection_without_chejan():
+    manager = OrderManager(cash=1_000_000)
+    accepted = manager.submit("005930", BUY, 1, 70_000, "5000", "주문")
+    rejected = manager.submit("005930", BUY, 2, 70_000, "5000", "주문")
+
+    assert manager.on_msg("2000", "opw00018_req#1.1", "[100000] 조회가 완료되었습니다") is None  # TR 메시지
+    assert manager.on_msg("5000", "주문", "[00Z112] 모의투자 정상처리 되었습니다") is None
+    assert manager.on_msg("5000", "주문", "[00Z924] 모의투자 증거금부족") is rejected   # 메시지 순서 = 주문 순서
+    assert (accepted.state, rejected.state) == (SUBMITTED, REJECTED)
+    assert rejected.message == "[00Z924] 모의투자 증거금부족"
+    assert manager.reserved_cash == 70_000 and manager.open_order_count == 1
+
+    # 거부된 주문은 주문번호 배정 대상에서 빠짐
+    assert manager.on_chejan(chejan("0000030", "005930", "접수", BUY, 1)) is accepted
+
+
+def test_msg_after_accept_does_not_reject():
+    manager = OrderManager(cash=1_000_000)
+    order = manager.submit("005930", BUY, 1, 70_000, "5000", "주문")
+    manager.on_chejan(chejan("0000031", "005930", "접수", BUY, 1))   # 체결 이벤트가 메시지보다 먼저 도착
+    assert manager.on_msg("5000", "주문", "[571489] 주문가격이 상한가를 초과합니다") is None
+    assert order.state == ACCEPTED
+
+
+def test_stale_open_orders_expire():
+    clock = Clock()
+    manager = OrderManager(cash=1_000_000, clock=clock)
+    expired = []
+    manager.on_expire = expired.append
+    silent = manager.submit("005930", BUY, 2, 100_000)                 # 접수 / 메시지 모두 없음
+    partial = manager.submit("000660", BUY, 4, 100_000)
+    manager.on_chejan(chejan("0000040", "000660", "체결", BUY, 4, "1", "100000", "100000", "1"))
+    clock.advance(30)
+    fresh = manager.submit("035720", BUY, 1, 50_000)
+
+    assert manager.expire(60) == []
+    clock.advance(31)
+    assert manager.expire(60) == expired == [silent, partial]
+    assert (silent.state, partial.state, fresh.state) == (CANCELLED, CANCELLED, SUBMITTED)
+    assert not manager.has_open_order("005930") and not manager.has_open_order("000660")
+    assert manager.reserved_cash == 50_000 and manager.open_order_count == 1
+
+    # 정리 후 도착한 체결도 원장에는 반영 (미체결로 되돌리지 않음)
+    manager.on_chejan(chejan("0000040", "000660", "체결", BUY, 4, "2", "100000", "100000", "1"))
+    assert manager.positions["000660"]["quantity"] == 2
+    assert partial.state == CANCELLED and partial.reserved == 0
+    assert manager.open_order_count == 1 and manager.expire(60) == []
+
+
+def test_reconcile_overrides_stale_orders():
+    clock = Clock()
+    manager = OrderManager(cash=1_000_000, clock=clock)
+    manager.submit("005930", BUY, 1, 70_000)
+    clock.advance(10)
+    assert manager.reconcile(930_000, {"005930": (1, 70_000)}, stale_after=60) is False   # 아직 기다리는 중
+
+    clock.advance(60)
+    assert manager.reconcile(930_000, {"005930": (1, 70_000)}, stale_after=60) is True
+    assert manager.open_order_count == 0
+    assert manager.cash == 930_000 and manager.positions["005930"]["quantity"] == 1
@@ -0,0 +1,62 @@
+import pytest
+
+from pnl import PnLTracker, replay_fills
+
+
+def fill(date, code, side, quantity, price):
+    """trade_journal.query(kinds=('fill',)) 행 형식"""
+    return {"date": date, "code": code, "side": side, "quantity": quantity, "price": price}
+
+
+def test_replay_fills_matches_lots_fifo_with_fees():
+    rows = [
+        fill("2026-10-15", "005930", "매수", 10, 100),
+        fill("2026-10-15", "005930", "매수", 10, 110),
+        fill("2026-10-16", "005930", "매도", 15, 120),   # 10@100 + 5@110 상환
+    ]
+    tracker, daily = replay_fills(rows, fee_rate=0.001, tax_rate=0.002)
+
+    buy_fees = 1_000 * 0.001 + 1_100 * 0.001
+    sell_fee = 1_800 * (0.001 + 0.002)
+    assert daily["2026-10-15"] == pytest.approx({"realized": -buy_fees, "fills": 2, "bought": 2_100, "sold": 0})
+    assert daily["2026-10-16"] == pytest.approx(
+        {"realized": 1_800 - (1_000 + 550) - sell_fee, "fills": 1, "bought": 0, "sold": 1_800})
+
+    stats = tracker.stats()
+    assert stats["realized"] == pytest.approx(250 - buy_fees - sell_fee)
+    assert stats["fees"] == pytest.approx(buy_fees + sell_fee)
+    assert stats["cost_basis"] == pytest.approx(550)        # 남은 로트 5@110
+    assert stats["unrealized"] == pytest.approx(5 * (120 - 110))
+    assert stats["open_positions"] == 1
+    assert stats["round_trips"] == 0
+    assert [list(lot) for lot in tracker.positions["005930"].lots] == [[5, 110]]
+
+
+def test_round_trip_win_rate_and_oversell():
+    tracker = PnLTracker()
+    tracker.on_fill("000660", 1, 3, 1_000)
+    assert tracker.on_fill("000660", 2, 1, 900) == -100
+    assert tracker.on_fill("000660", 2, 2, 1_200) == 400     # 라운드 트립 누적 +300 → 승
+    tracker.on_fill("035720", "매수", 2, 500)
+    assert tracker.on_fill("035720", "매도", 5, 400) == -200  # 보유분(2주)까지만 상환
+
+    stats = tracker.stats()
+    assert (tracker.wins, tracker.losses) == (1, 1)
+    assert stats["win_rate_pct"] == 50.0
+    assert stats["realized"] == 100
+    assert stats["exposure"] == stats["cost_basis"] == 0
+    assert stats["turnover"] == 3_000 + 900 + 2_400 + 1_000 + 2_000
+
+
+def test_mark_and_state_restore():
+    tracker = PnLTracker(fee_rate=0.00015)
+    tracker.on_fill("005930", "매수", 10, 70_000)
+    tracker.on_fill("005930", "매수", 5, 72_000)
+    tracker.on_fill("005930", "매도", 12, 73_000)
+    tracker.mark("005930", 75_000)
+    tracker.mark("000660", 1)          # 보유하지 않은 종목은 무시
+
+    restored = PnLTracker(fee_rate=0.00015)
+    restored.restore(tracker.state())
+    assert restored.stats() == pytest.approx(tracker.stats())
+    assert restored.on_fill("005930", "매도", 3, 74_000) == pytest.approx(tracker.on_fill("005930", "매도", 3, 74_000))
@@ -0,0 +1,72 @@
+import struct
+
+import numpy as np
+import pytest
+
+from state_snapshot import (HEADER, SNAPSHOT_VERSION, SnapshotError, SnapshotWriter, decode, encode, read_snapshot,
+                            write_snapshot)
+
+STATE = {"day": "2026-10-16", "cash": 8_943_904, "positions": {"000660": [6, 149_794.0, 151_000]}}
+
+
+def arrays():
+    return {
+        "closes": np.arange(12, dtype=np.float64).reshape(3, 4),
+        "codes": np.array([5930, 660, 35720], dtype=np.int32),
+        "empty": np.zeros((0, 3)),
+    }
+
+
+def test_round_trip_preserves_state_and_arrays():
+    state, restored = decode(encode(STATE, arrays()))
+    assert state == STATE
+    for name, array in arrays().items():
+        assert restored[name].dtype == array.dtype
+        np.testing.assert_array_equal(restored[name], array)
+    assert restored["closes"].flags.writeable
+
+
+def test_round_trip_without_arrays():
+    assert decode(encode(STATE)) == (STATE, {})
+
+
+@pytest.mark.parametrize("corrupt, message", [
+    (lambda data: data[:HEADER.size - 1], "헤더"),
+    (lambda data: b"XXXXXX" + data[6:], "스냅샷 파일이 아닙니다"),
+    (lambda data: data[:-5], "CRC"),
+    (lambda data: data[:-1] + bytes([data[-1] ^ 0xFF]), "CRC"),
+    (lambda data: data[:6] + struct.pack("<H", SNAPSHOT_VERSION + 1) + data[8:], "버전"),
+])
+def test_corrupt_data_rejected(corrupt, message):
+    with pytest.raises(SnapshotError, match=message):
+        decode(corrupt(encode(STATE, arrays())))
+
+
+def test_file_write_replaces_atomically(tmp_path):
+    path = str(tmp_path / "state" / "snapshot.bin")
+    assert read_snapshot(path) is None
+
+    write_snapshot(path, encode({"n": 1}))
+    write_snapshot(path, encode({"n": 2}))
+    assert read_snapshot(path)[0] == {"n": 2}
+    assert sorted(p.name for p in (tmp_path / "state").iterdir()) == ["snapshot.bin"]   # 임시 파일 남지 않음
+
+    with open(path, "r+b") as f:
+        f.seek(HEADER.size + 3)
+        f.write(b"\x00\x00")
+    with pytest.raises(SnapshotError):
+        read_snapshot(path)
+
+
+def test_writer_flushes_latest_state_on_close(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    writer = SnapshotWriter(path)
+    for n in range(5):
+        writer.submit({"n": n}, {"values": np.full(3, n)})
+    writer.close()
+
+    state, restored = read_snapshot(path)
+    assert state == {"n": 4}
+    np.testing.assert_array_equal(restored["values"], [4, 4, 4])
+    stats = writer.stats()
+    assert stats["failed"] == 0 and stats["written"] + stats["superseded"] == 5
@@ -0,0 +1,78 @@
+import configparser
+import sys
+
+import numpy as np
+import pytest
+
+from strategy_plugins import STRATEGIES, StrategyBook, StrategyView
+
+PLUGIN_SOURCE = '''
+from strategy_plugins import Strategy, register_strategy
+
+
+class WindowBreakout(Strategy):
+    def buy(self, view):
+        return view.close > self.params.get("window", 0)
+
+
+@register_strategy
+class GapUp(Strategy):
+    name = "gap_up"
+
+    def buy(self, view):
+        return view.close > view.ema5 * (1 + self.params.get("gap", 0.01))
+'''
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    (tmp_path / "sample_strategies.py").write_text(PLUGIN_SOURCE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "sample_strategies"
+    sys.modules.pop("sample_strategies", None)
+    STRATEGIES.pop("gap_up", None)
+
+
+def book(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return StrategyBook.from_config(config)
+
+
+def view(close, ema5, held=(False, False)):
+    arrays = {"codes": ["005930", "000660"], "close": np.array(close, dtype=float), "ema5": np.array(ema5, dtype=float),
+              "held": np.array(held)}
+    return StrategyView(arrays)
+
+
+def test_module_class_spec_reads_params_by_class_name(plugin_module):
+    strategies = book(f"""
+[STRATEGY]
+strategy = {plugin_module}:WindowBreakout
+windowbreakout.window = 5
+fallback = ema5
+""")
+    strategy = strategies.default.strategies[0]
+    assert type(strategy).__name__ == "WindowBreakout"
+    assert strategy.params == {"window": 5}
+    assert strategies.evaluate(view([4, 6], [0, 0]))[0] == {"000660": "WindowBreakout"}
+
+
+def test_registered_plugin_params_and_group_override(plugin_module):
+    strategies = book(f"""
+[STRATEGY]
+plugins = {plugin_module}
+strategy = gap_up
+gap_up.gap = 0.02
+macd.unused = 'x'
+
+[STRATEGY:대형주]
+codes = 005930
+gap_up.gap = 0.1
+""")
+    assert strategies.default.strategies[0].params == {"gap": 0.02}
+    assert strategies.groups["대형주"][1].strategies[0].params == {"gap": 0.1}   # 그룹 섹션 값 우선
+    assert isinstance(strategies.fallback.strategies[0], STRATEGIES["ema5"])
+
+    buys, _ = strategies.evaluate(view([105, 105], [100, 100]))
+    assert buys == {"000660": "gap_up"}                      # 005930 은 그룹 gap 10% 미달
@@ -0,0 +1,150 @@
+from datetime import date
+
+import pytest
+
+from simulator import SimulatedTransport, generate_daily_bars
+from tr_scheduler import TrScheduler
+
+CODE = "005930"
+INPUTS = [("종목코드", CODE), ("수정주가구분", "1")]
+
+
+class HeldReplySim(SimulatedTransport):
+    """지정한 순번의 TR 응답을 보류했다가 release 때 전달 (응답 지연 / 유실 재현)"""
+
+    def __init__(self, hold=(), **kwargs):
+        super().__init__(**kwargs)
+        self.hold = set(hold)
+        self.held = []
+        self.replies = 0
+
+    def _post(self, callback, *args):
+        if callback == self._emit_tr_data:
+            self.replies += 1
+            if self.replies in self.hold:
+                self.held.append((callback, args))
+                return
+        super()._post(callback, *args)
+
+    def release(self):
+        for callback, args in self.held:
+            callback(*args)
+        self.held = []
+
+
+@pytest.fixture
+def make():
+    def build(hold=(), bars=1_500, **options):
+        sim = HeldReplySim(hold=hold, session_date=date(2026, 10, 16))
+        sim.daily_bars[CODE] = generate_daily_bars(CODE, count=bars, end_date=sim.session_date)
+        options = {"per_second": 100, "per_hour": 10_000, "timeout_ms": 1_000, "max_retries": 2, **options}
+        scheduler = TrScheduler(sim, **options)
+        sim.OnReceiveTrData.connect(scheduler.handle)
+        return sim, scheduler
+    return build
+
+
+def submit(sim, scheduler, max_pages):
+    """일봉 요청 → (받은 페이지 [(rqname, 첫 일자, 마지막 일자)], 완료 / 실패 기록)"""
+    pages, result = [], {}
+
+    def on_page(request, trcode, rqname, prev_next):
+        rows = sim._tr_rows[sim._tr_last[trcode]]
+        request.rows.append((rows[0]["일자"], rows[-1]["일자"]))
+        pages.append((rqname, rows[0]["일자"], rows[-1]["일자"]))
+
+    scheduler.submit("opt10081", INPUTS, "2000", on_page, max_pages=max_pages,
+                     on_done=lambda request: result.setdefault("done", list(request.rows)),
+                     on_error=lambda request, reason: result.setdefault("error", reason))
+    return pages, result
+
+
+def run(sim, seconds, step=0.25):
+    end = sim.clock + seconds
+    while sim.clock < end:
+        sim.process_events()
+        sim.advance_clock(sim.clock + step)
+    sim.process_events()
+
+
+def contiguous(page_ranges, bars):
+    """페이지가 최신 → 과거로 빈틈 / 겹침 없이 이어지는지"""
+    dates = [bar[0] for bar in reversed(bars)]
+    position = 0
+    for first, last in page_ranges:
+        if dates[position] != first:
+            return False
+        position = dates.index(last) + 1
+    return True
+
+
+def test_paging_follows_prev_next_up_to_max_pages(make):
+    sim, scheduler = make()
+    pages, result = submit(sim, scheduler, max_pages=2)
+    run(sim, 1)
+    assert len(pages) == 2 and len(result["done"]) == 2
+    assert contiguous(result["done"], sim.daily_bars[CODE])
+    assert len({rqname for rqname, _, _ in pages}) == 2     # 전송마다 다른 rqname
+
+    sim, scheduler = make()
+    pages, result = submit(sim, scheduler, max_pages=10)
+    run(sim, 1)
+    assert len(result["done"]) == 3                          # 1,500봉 = 600 + 600 + 300 (prev_next 0 에서 종료)
+    assert scheduler.pending == 0 and scheduler.sent_count == 3
+
+
+def test_rate_limit_delays_requests(make):
+    sim, scheduler = make(per_second=1)
+    for _ in range(3):
+        submit(sim, scheduler, max_pages=1)
+    sim.process_events()
+    assert scheduler.sent_count == 1
+    run(sim, 2.1)
+    assert scheduler.sent_count == 3 and scheduler.pending == 0
+
+
+def test_late_reply_after_timeout_is_ignored(make):
+    sim, scheduler = make(hold={1})
+    pages, result = submit(sim, scheduler, max_pages=1)
+    run(sim, 1.5)                                            # 1회차 시간 초과 → 재시도 응답 수신
+    assert scheduler.timeout_count == 1
+    assert [rqname for rqname, _, _ in pages] == ["opt10081_req#1.2"]
+
+    sim.release()                                            # 1회차 응답이 뒤늦게 도착
+    run(sim, 0.5)
+    assert scheduler.late_count == 1
+    assert len(pages) == 1 and len(result["done"]) == 1
+
+
+def test_continuation_timeout_restarts_from_first_page(make):
+    sim, scheduler = make(hold={2})                          # 2페이지 응답 지연
+    pages, result = submit(sim, scheduler, max_pages=3)
+    run(sim, 1.5)
+    sim.release()
+    run(sim, 1)
+
+    assert scheduler.timeout_count == 1 and scheduler.late_count == 1
+    assert len(result["done"]) == 3
+    assert contiguous(result["done"], sim.daily_bars[CODE])  # 다른 시도의 페이지가 섞이지 않음
+
+
+def test_retries_exhausted_reports_error(make):
+    sim, scheduler = make(hold={1, 2, 3})
+    pages, result = submit(sim, scheduler, max_pages=1)
+    run(sim, 5)
+    assert pages == []
+    assert result == {"error": "timeout"}
+    assert scheduler.timeout_count == 3 and scheduler.failed_count == 1 and scheduler.pending == 0
+
+
+def test_callback_exception_does_not_stall_queue(make):
+    sim, scheduler = make()
+
+    def broken_done(request):
+        raise RuntimeError("on_done 오류")
+
+    scheduler.submit("opt10081", INPUTS, "2000", lambda *args: None, on_done=broken_done)
+    pages, result = submit(sim, scheduler, max_pages=1)
+    run(sim, 1)
+    assert len(result["done"]) == 1                          # 앞 요청 콜백 예외와 무관하게 다음 요청 진행
+    assert scheduler.sent_count == 2 and scheduler.pending == 0
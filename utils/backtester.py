@@ -0,0 +1,340 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from indicators import A5, A12, A26, A9, compute_macd_matrix
+from strategy import (MIN_HISTORY_BARS, TRAILING_STOP_RATIO, EXIT_NONE, EXIT_NAMES, golden_cross, ema5_breakout,
+                      exit_reasons, split_buy_total)
+
+# 거래 1건 (보유 중 종료된 포지션은 reason = EXIT_NONE, 마지막 봉 종가로 평가)
+TRADE_DTYPE = np.dtype([
+    ("symbol", "<i4"),
+    ("entry_bar", "<i4"),
+    ("exit_bar", "<i4"),
+    ("quantity", "<f8"),
+    ("entry_price", "<f8"),
+    ("exit_price", "<f8"),
+    ("pnl", "<f8"),
+    ("reason", "<i1"),
+])
+
+DEFAULT_PARAMS = {
+    "strategy": "macd",         # macd: MACD 골든크로스 / ema5: 5일선 돌파
+    "max_profit_rate": 5.0,
+    "max_loss_rate": -3.0,
+    "max_stock_ratio": 10.0,
+    "buy_split_count": 3,
+    "trailing_ratio": TRAILING_STOP_RATIO,
+    "cash": 10_000_000,         # 종목당 초기 자금
+    "fee_rate": 0.0,            # 매수/매도 수수료율
+    "tax_rate": 0.0,            # 매도 세율
+}
+
+
+def params_from_config(config):
+    """config.ini 의 [TRADING] 매매 규칙 + (선택) [BACKTEST] 설정 → 백테스트 파라미터 dict"""
+    params = dict(DEFAULT_PARAMS)
+    params.update(
+        max_profit_rate=config.getfloat('TRADING', 'max_profit_rate', fallback=params["max_profit_rate"]),
+        max_loss_rate=config.getfloat('TRADING', 'max_loss_rate', fallback=params["max_loss_rate"]),
+        max_stock_ratio=config.getfloat('TRADING', 'max_stock_ratio', fallback=params["max_stock_ratio"]),
+        buy_split_count=config.getint('TRADING', 'buy_split_count', fallback=params["buy_split_count"]),
+        trailing_ratio=config.getfloat('TRADING', 'trailing_stop_ratio', fallback=params["trailing_ratio"]),
+        strategy=config.get('BACKTEST', 'strategy', fallback=params["strategy"]),
+        cash=config.getint('BACKTEST', 'cash', fallback=params["cash"]),
+        fee_rate=config.getfloat('BACKTEST', 'fee_rate', fallback=params["fee_rate"]),
+        tax_rate=config.getfloat('BACKTEST', 'tax_rate', fallback=params["tax_rate"]),
+    )
+    return params
+
+
+# -----------------------------------
+# 🔵 2. 종목 × 봉 패널 준비
+# -----------------------------------
+def forward_fill(values):
+    """(종목 × 봉) 행렬의 중간 NaN(거래정지 등)을 직전 값으로 채움 (앞쪽 NaN 은 유지)"""
+    index = np.where(np.isnan(values), 0, np.arange(values.shape[1]))
+    np.maximum.accumulate(index, axis=1, out=index)
+    return values[np.arange(values.shape[0])[:, None], index]
+
+
+def load_panel(cache, codes):
+    """
+    일봉 캐시(CandleCache)에서 여러 종목을 날짜 기준으로 정렬한 패널 생성
+    → dict(codes, dates, open/high/low/close/volume: (종목 × 봉) 배열, 없는 날은 NaN → 직전 값)
+    """
+    bars = {code: cache.load(code) for code in codes}
+    codes = [code for code in codes if len(bars[code])]
+    dates = np.unique(np.concatenate([bars[code]["date"] for code in codes])) if codes else np.empty(0, np.int64)
+
+    panel = {"codes": codes, "dates": dates.astype(np.int64)}
+    for field in ("open", "high", "low", "close", "volume"):
+        matrix = np.full((len(codes), len(dates)), np.nan)
+        for row, code in enumerate(codes):
+            matrix[row, np.searchsorted(dates, bars[code]["date"])] = bars[code][field]
+        panel[field] = forward_fill(matrix)
+    return panel
+
+
+# -----------------------------------
+# 🔵 3. 매수 신호 (실시간과 같은 잠정 봉 규칙)
+# -----------------------------------
+def _previous_day(matrix, prev_day):
+    """(종목 × 일) 행렬에서 봉마다 전일 값을 뽑은 (종목 × 봉) 행렬 (첫날은 NaN)"""
+    out = np.full((matrix.shape[0], len(prev_day)), np.nan)
+    has_prev = prev_day >= 0
+    out[:, has_prev] = matrix[:, prev_day[has_prev]]
+    return out
+
+
+def buy_signal_matrix(close, strategy="macd", day_ids=None):
+    """
+    봉별 매수 신호 (종목 × 봉 bool)
+    - 일봉 지표는 각 날의 마지막 봉 종가로 확정, 장중 봉은 전일 확정 지표 + 현재가로 만든 잠정 지표로 판단
+      (실시간 IndicatorEngine.update 와 같은 계산, day_ids 가 없으면 봉 1개 = 하루)
+    - 전일까지 확정 일봉이 MIN_HISTORY_BARS 미만이면 신호 없음 (실시간 종목 제외 규칙)
+    """
+    n_bars = close.shape[1]
+    if day_ids is None:
+        day_ids = np.arange(n_bars)
+    new_day = np.r_[True, np.diff(day_ids) != 0]
+    bar_day = np.cumsum(new_day) - 1
+    day_last = np.r_[np.flatnonzero(new_day)[1:] - 1, n_bars - 1]
+    prev_day = bar_day - 1
+
+    daily = close[:, day_last]
+    committed = compute_macd_matrix(daily)
+    prev = {name: _previous_day(committed[name], prev_day) for name in ("ema5", "ema12", "ema26", "macd", "signal")}
+
+    with np.errstate(invalid="ignore"):
+        if strategy == "ema5":
+            ema5 = A5 * close + (1 - A5) * prev["ema5"]
+            signal = ema5_breakout(close, ema5)
+        else:
+            macd = (A12 * close + (1 - A12) * prev["ema12"]) - (A26 * close + (1 - A26) * prev["ema26"])
+            signal = golden_cross(prev["macd"], prev["signal"], macd, A9 * macd + (1 - A9) * prev["signal"])
+
+        history = _previous_day(np.cumsum(~np.isnan(daily), axis=1, dtype=np.float64), prev_day)
+        signal &= history >= MIN_HISTORY_BARS
+    return signal
+
+
+# -----------------------------------
+# 🔵 4. 포지션 시뮬레이션 (봉 방향 순회, 종목 방향 벡터)
+# -----------------------------------
+def simulate(close, high, buy, params):
+    """
+    종목별 독립 자금(params['cash'])으로 매수/매도 규칙 적용
+    - 봉마다 보유 종목은 매도 판단(고가로 최고가 갱신 후 종가 기준), 미보유 종목은 매수 판단 (실시간 _evaluate_tick 과 같은 분기)
+    - 체결은 해당 봉 종가 (시장가 주문)
+    → dict(final_equity, max_drawdown, traded, equity, trades)
+    """
+    n_symbols, n_bars = close.shape
+    fee, tax = params["fee_rate"], params["tax_rate"]
+
+    cash = np.full(n_symbols, float(params["cash"]))
+    quantity = np.zeros(n_symbols)
+    buy_price = np.zeros(n_symbols)
+    highest = np.zeros(n_symbols)
+    entry_bar = np.full(n_symbols, -1, dtype=np.int32)
+
+    peak = cash.copy()
+    max_drawdown = np.zeros(n_symbols)
+    traded = np.zeros(n_symbols)
+    equity = np.empty(n_bars)
+    value = cash.copy()
+    trades = []
+
+    for t in range(n_bars):
+        price = close[:, t]
+        held = quantity > 0
+
+        # 1) 보유 종목 매도 판단
+        if held.any():
+            idx = np.flatnonzero(held)
+            p = price[idx]
+            highest[idx] = np.fmax(highest[idx], np.fmax(high[idx, t], p))
+            reason = exit_reasons(buy_price[idx], p, highest[idx], params["max_profit_rate"],
+                                  params["max_loss_rate"], params["trailing_ratio"])
+            sell = reason != EXIT_NONE
+            if sell.any():
+                idx, p, reason = idx[sell], p[sell], reason[sell]
+                trades.append(_trade_records(idx, entry_bar[idx], t, quantity[idx], buy_price[idx], p, reason, fee, tax))
+                proceeds = quantity[idx] * p
+                cash[idx] += proceeds * (1 - fee - tax)
+                traded[idx] += proceeds
+                quantity[idx] = 0
+
+        # 2) 미보유 종목 매수 판단 (분할 매수 수량 합계를 한 번에 체결)
+        entry = buy[:, t] & ~held
+        if entry.any():
+            idx = np.flatnonzero(entry)
+            q = split_buy_total(cash[idx], price[idx], params["max_stock_ratio"], params["buy_split_count"])
+            filled = q > 0
+            idx, q = idx[filled], q[filled]
+            cost = q * price[idx]
+            cash[idx] -= cost * (1 + fee)
+            traded[idx] += cost
+            quantity[idx] = q
+            buy_price[idx] = highest[idx] = price[idx]
+            entry_bar[idx] = t
+
+        # 3) 평가금액 / 낙폭
+        np.add(cash, np.where(quantity > 0, quantity * price, 0.0), out=value)
+        np.fmax(peak, value, out=peak)
+        np.fmax(max_drawdown, 1 - value / peak, out=max_drawdown)
+        equity[t] = value.sum()
+
+    # 마지막까지 보유 중인 포지션은 마지막 봉 종가로 평가
+    idx = np.flatnonzero(quantity > 0)
+    if len(idx):
+        trades.append(_trade_records(idx, entry_bar[idx], n_bars - 1, quantity[idx], buy_price[idx],
+                                     close[idx, -1], np.full(len(idx), EXIT_NONE), fee, tax))
+
+    return {
+        "final_equity": value.copy(),
+        "max_drawdown": max_drawdown,
+        "traded": traded,
+        "equity": equity,
+        "trades": np.concatenate(trades) if trades else np.empty(0, dtype=TRADE_DTYPE),
+    }
+
+
+def _trade_records(idx, entry_bar, exit_bar, quantity, entry_price, exit_price, reason, fee, tax):
+    records = np.empty(len(idx), dtype=TRADE_DTYPE)
+    records["symbol"] = idx
+    records["entry_bar"] = entry_bar
+    records["exit_bar"] = exit_bar
+    records["quantity"] = quantity
+    records["entry_price"] = entry_price
+    records["exit_price"] = exit_price
+    records["pnl"] = quantity * (exit_price * (1 - fee - tax) - entry_price * (1 + fee))
+    records["reason"] = reason
+    return records
+
+
+def _run_chunk(task):
+    """프로세스 풀 작업 단위: 종목 묶음 1개의 신호 계산 + 시뮬레이션"""
+    offset, close, high, day_ids, params = task
+    buy = buy_signal_matrix(close, params["strategy"], day_ids)
+    result = simulate(close, high, buy, params)
+    result["trades"]["symbol"] += offset
+    return offset, result
+
+
+# -----------------------------------
+# 🔵 5. 백테스트 실행 / 결과 집계
+# -----------------------------------
+def run_backtest(panel, params=None, workers=None, chunk_size=256, day_ids=None):
+    """
+    패널(load_panel / generate_daily_panel 형식) 전체 종목 백테스트
+    - 종목을 chunk_size 개씩 나눠 프로세스 풀(workers, 1 이면 현재 프로세스)에서 실행
+    - day_ids: 장중 봉을 넣을 때 봉별 거래일 식별자 (같은 날은 같은 값)
+    → dict(symbols: 종목별 DataFrame, equity: 포트폴리오 평가금액 Series, trades: 거래 DataFrame, summary: dict)
+    """
+    params = dict(DEFAULT_PARAMS, **(params or {}))
+    workers = workers or os.cpu_count() or 1
+    close = np.asarray(panel["close"], dtype=np.float64)
+    high = np.asarray(panel.get("high", close), dtype=np.float64)
+    codes = list(panel["codes"])
+
+    started = time.perf_counter()
+    tasks = [
+        (start, close[start:start + chunk_size], high[start:start + chunk_size], day_ids, params)
+        for start in range(0, len(codes), chunk_size)
+    ]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_run_chunk, tasks))
+    else:
+        results = [_run_chunk(task) for task in tasks]
+
+    results.sort(key=lambda item: item[0])
+    chunks = [result for _, result in results]
+    report = summarize(codes, panel.get("dates"), chunks, params)
+    report["summary"]["elapsed"] = time.perf_counter() - started
+    return report
+
+
+def summarize(codes, dates, chunks, params):
+    """청크 결과 → 종목별 / 포트폴리오 성과"""
+    import pandas as pd
+
+    cash = float(params["cash"])
+    final_equity = np.concatenate([c["final_equity"] for c in chunks]) if chunks else np.empty(0)
+    equity = np.sum([c["equity"] for c in chunks], axis=0) if chunks else np.empty(0)
+    trades = np.concatenate([c["trades"] for c in chunks]) if chunks else np.empty(0, dtype=TRADE_DTYPE)
+    traded = np.concatenate([c["traded"] for c in chunks]) if chunks else np.empty(0)
+
+    closed = trades[trades["reason"] != EXIT_NONE]
+    n_trades = np.bincount(closed["symbol"], minlength=len(codes))
+    wins = np.bincount(closed["symbol"], weights=closed["pnl"] > 0, minlength=len(codes))
+
+    symbols = pd.DataFrame({
+        "code": codes,
+        "final_equity": final_equity,
+        "pnl": final_equity - cash,
+        "return_pct": (final_equity / cash - 1) * 100,
+        "max_drawdown_pct": np.concatenate([c["max_drawdown"] for c in chunks]) * 100 if chunks else [],
+        "trades": n_trades,
+        "win_rate_pct": np.divide(wins, n_trades, out=np.zeros(len(codes)), where=n_trades > 0) * 100,
+        "turnover": traded / cash,
+    })
+
+    index = pd.Index(dates, name="date") if dates is not None and len(dates) == len(equity) else None
+    equity = pd.Series(equity, index=index, name="equity")
+
+    trade_frame = pd.DataFrame(trades)
+    if len(trade_frame):
+        trade_frame.insert(0, "code", np.asarray(codes)[trade_frame["symbol"]])
+        if index is not None:
+            trade_frame["entry_date"] = index.values[trade_frame["entry_bar"]]
+            trade_frame["exit_date"] = index.values[trade_frame["exit_bar"]]
+        trade_frame["reason"] = trade_frame["reason"].map(lambda r: EXIT_NAMES.get(r, "보유 중"))
+
+    summary = portfolio_summary(equity.values, closed, traded.sum(), cash * len(codes))
+    summary["symbols"] = len(codes)
+    return {"symbols": symbols, "equity": equity, "trades": trade_frame, "summary": summary}
+
+
+def portfolio_summary(equity, closed, traded, initial, bars_per_year=252):
+    """포트폴리오 평가금액 곡선 + 청산 거래 → 성과 지표 dict (파라미터 탐색에서도 사용)"""
+    if not len(equity):
+        return {"bars": 0, "initial_equity": initial, "final_equity": initial, "return_pct": 0.0,
+                "max_drawdown_pct": 0.0, "sharpe": 0.0, "turnover": 0.0, "trades": 0, "win_rate_pct": 0.0,
+                "exits": {name: 0 for name in EXIT_NAMES.values()}}
+
+    running_peak = np.maximum.accumulate(equity)
+    returns = np.diff(equity) / equity[:-1]
+    std = returns.std() if len(returns) else 0.0
+    return {
+        "bars": len(equity),
+        "initial_equity": initial,
+        "final_equity": float(equity[-1]),
+        "return_pct": (float(equity[-1]) / initial - 1) * 100 if initial else 0.0,
+        "max_drawdown_pct": float(np.max(1 - equity / running_peak)) * 100,
+        "sharpe": float(returns.mean() / std * np.sqrt(bars_per_year)) if std > 0 else 0.0,
+        "turnover": float(traded / equity.mean()),
+        "trades": int(len(closed)),
+        "win_rate_pct": float((closed["pnl"] > 0).mean() * 100) if len(closed) else 0.0,
+        "exits": {EXIT_NAMES[r]: int((closed["reason"] == r).sum()) for r in EXIT_NAMES},
+    }
+
+
+def print_report(report, top=10):
+    """백테스트 결과 콘솔 출력"""
+    s = report["summary"]
+    print(f"[📊 백테스트 결과] {s['symbols']:,}종목 × {s['bars']:,}봉 / {s.get('elapsed', 0):.2f}초")
+    print(f"[💰 포트폴리오] 수익률 {s['return_pct']:.2f}% / 최대 낙폭 {s['max_drawdown_pct']:.2f}% / "
+          f"샤프 {s['sharpe']:.2f} / 회전율 {s['turnover']:.2f}회")
+    print(f"[📝 거래] {s['trades']:,}건 / 승률 {s['win_rate_pct']:.1f}% / "
+          + " / ".join(f"{name} {count:,}건" for name, count in s["exits"].items()))
+
+    symbols = report["symbols"].sort_values("return_pct", ascending=False)
+    if top and len(symbols):
+        print(f"[🏆 상위 {min(top, len(symbols))}종목]")
+        print(symbols.head(top).to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
@@ -0,0 +1,102 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import numpy as np
+
+# 저장 필드 (종가 + 지표)
+BAR_FIELDS = ("close", "ema5", "ema12", "ema26", "macd", "signal")
+
+# -----------------------------------
+# 🔵 2. 종목별 일봉 컬럼 저장소
+# -----------------------------------
+class BarStore:
+    """
+    종목 × 봉 × 필드 형태의 사전 할당 NumPy 배열에 일봉을 저장
+    - 종목별 고정 크기 링 버퍼 (capacity 봉 초과 시 가장 오래된 봉부터 덮어씀)
+    - 종목 조회는 정수 인덱스로 수행 (index_of)
+    """
+    __slots__ = ("capacity", "fields", "_field_index", "_index", "_codes", "_data", "_head", "_length")
+
+    def __init__(self, capacity=600, max_symbols=64, fields=BAR_FIELDS, dtype=np.float64):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self._field_index = {name: i for i, name in enumerate(self.fields)}
+        self._index = {}                # 종목코드 → 정수 인덱스
+        self._codes = []                # 정수 인덱스 → 종목코드
+        self._data = np.full((max(max_symbols, 1), capacity, len(self.fields)), np.nan, dtype=dtype)
+        self._head = np.zeros(len(self._data), dtype=np.int32)     # 다음에 쓸 위치
+        self._length = np.zeros(len(self._data), dtype=np.int32)   # 저장된 봉 수
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __contains__(self, code):
+        return code in self._index
+
+    @property
+    def codes(self):
+        return list(self._codes)
+
+    def index_of(self, code):
+        """종목코드의 정수 인덱스 (없으면 새로 할당, 공간 부족 시 2배 확장)"""
+        idx = self._index.get(code)
+        if idx is not None:
+            return idx
+
+        idx = len(self._codes)
+        if idx >= len(self._data):
+            grow = len(self._data)
+            self._data = np.concatenate([self._data, np.full((grow, self.capacity, len(self.fields)), np.nan, dtype=self._data.dtype)])
+            self._head = np.concatenate([self._head, np.zeros(grow, dtype=np.int32)])
+            self._length = np.concatenate([self._length, np.zeros(grow, dtype=np.int32)])
+        self._index[code] = idx
+        self._codes.append(code)
+        return idx
+
+    def load(self, code, **columns):
+        """과거 → 최신 순 배열로 종목 이력 전체를 다시 씀 (마지막 capacity 봉만 보관)"""
+        idx = self.index_of(code)
+        n = min(len(next(iter(columns.values()))), self.capacity)
+        block = self._data[idx]
+        block[:] = np.nan
+        for name, values in columns.items():
+            block[:n, self._field_index[name]] = np.asarray(values)[-n:]
+        self._head[idx] = n % self.capacity
+        self._length[idx] = n
+        return idx
+
+    def append(self, code, **values):
+        """최신 봉 1개 추가 (링 버퍼)"""
+        idx = self.index_of(code)
+        pos = self._head[idx]
+        row = self._data[idx, pos]
+        row[:] = np.nan
+        for name, value in values.items():
+            row[self._field_index[name]] = value
+        self._head[idx] = (pos + 1) % self.capacity
+        self._length[idx] = min(self._length[idx] + 1, self.capacity)
+
+    def length(self, code):
+        idx = self._index.get(code)
+        return 0 if idx is None else int(self._length[idx])
+
+    def value(self, code, field, offset=-1):
+        """offset 번째 봉의 값 (-1: 최신, -2: 직전 ...)"""
+        idx = self._index[code]
+        if -offset > self._length[idx]:
+            raise IndexError(f"{code}: {-offset}번째 이전 봉 없음")
+        pos = (self._head[idx] + offset) % self.capacity
+        return float(self._data[idx, pos, self._field_index[field]])
+
+    def series(self, code, field):
+        """과거 → 최신 순 필드 배열 (링 버퍼가 한 바퀴 돌지 않았으면 복사 없는 뷰)"""
+        idx = self._index[code]
+        n, head = int(self._length[idx]), int(self._head[idx])
+        column = self._data[idx, :, self._field_index[field]]
+        if n < self.capacity:
+            return column[:n]
+        return np.roll(column, -head)
+
+    def memory_usage(self):
+        """저장소가 점유한 바이트 수"""
+        return self._data.nbytes + self._head.nbytes + self._length.nbytes
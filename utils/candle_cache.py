@@ -0,0 +1,74 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import os
+import numpy as np
+
+# 일봉 레코드 (고정 크기, 리틀 엔디언)
+CANDLE_DTYPE = np.dtype([
+    ("date", "<i4"),     # YYYYMMDD
+    ("open", "<i8"),
+    ("high", "<i8"),
+    ("low", "<i8"),
+    ("close", "<i8"),
+    ("volume", "<i8"),
+])
+
+# -----------------------------------
+# 🔵 2. 종목별 일봉 디스크 캐시
+# -----------------------------------
+class CandleCache:
+    """
+    종목별 일봉(OHLCV)을 추가 전용 바이너리 파일에 저장하고 memmap 으로 읽는 캐시
+    - 파일 1개 = 종목 1개, 레코드는 날짜 오름차순
+    - 장 시작 시 마지막 캐시 일자 이후 봉만 받아서 append
+    - 수정주가 변경(액면분할 등)이 감지되면 invalidate 후 전체 재다운로드
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, code):
+        return os.path.join(self.root, f"{code}.bin")
+
+    def load(self, code):
+        """캐시된 일봉 (읽기 전용 memmap, 없으면 빈 배열)"""
+        file_path = self.path(code)
+        if not os.path.exists(file_path):
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        size = os.path.getsize(file_path)
+        count = size // CANDLE_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return np.memmap(file_path, dtype=CANDLE_DTYPE, mode='r', shape=(count,))
+
+    def last_date(self, code):
+        """마지막 캐시 일자 'YYYYMMDD' (없으면 None)"""
+        bars = self.load(code)
+        return str(int(bars["date"][-1])) if len(bars) else None
+
+    def append(self, code, rows):
+        """
+        일봉 오름차순 → 마지막 캐시 일자 이후 것만 추가
+        - rows: CANDLE_DTYPE 구조화 배열 또는 [(일자, 시가, 고가, 저가, 종가, 거래량), ...]
+        """
+        last = self.last_date(code)
+        if isinstance(rows, np.ndarray):
+            records = rows if last is None else rows[rows["date"] > int(last)]
+        else:
+            rows = [row for row in rows if last is None or str(row[0]) > last]
+            records = np.array([(int(d), o, h, lo, c, v) for d, o, h, lo, c, v in rows], dtype=CANDLE_DTYPE)
+        if not len(records):
+            return 0
+
+        records = np.ascontiguousarray(records, dtype=CANDLE_DTYPE)
+        with open(self.path(code), 'ab') as f:
+            f.write(records.tobytes())
+        return len(records)
+
+    def invalidate(self, code):
+        """종목 캐시 삭제"""
+        file_path = self.path(code)
+        if os.path.exists(file_path):
+            os.remove(file_path)
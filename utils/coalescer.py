@@ -0,0 +1,58 @@
+# -----------------------------------
+# 🔵 1. 실시간 틱 병합기
+# -----------------------------------
+class TickCoalescer:
+    """
+    종목별 최신 체결가와 구간 고가/저가만 유지하고, 변경된 종목만 한 번에 꺼냄
+    - push: 틱 수신 시 O(1) 갱신
+    - drain: 결정 루프 주기마다 변경 종목 목록 반환 후 구간 초기화
+    """
+
+    def __init__(self):
+        self._latest = {}           # 종목코드 → [최신가, 구간 고가, 구간 저가]
+        self._dirty = {}            # 변경된 종목 (삽입 순서 유지)
+        self.ticks_received = 0
+        self.evaluations = 0
+        self.batches = 0
+        self.bypassed = 0           # 병합 없이 즉시 평가한 틱 수
+
+    def push(self, code, price):
+        """틱 1건 병합"""
+        self.ticks_received += 1
+        slot = self._latest.get(code)
+        if slot is None or code not in self._dirty:
+            self._latest[code] = [price, price, price]
+        else:
+            slot[0] = price
+            if price > slot[1]:
+                slot[1] = price
+            elif price < slot[2]:
+                slot[2] = price
+        self._dirty[code] = None
+
+    def record_bypass(self):
+        """병합을 거치지 않고 즉시 평가한 틱 기록 (매도 손절 체크 등)"""
+        self.ticks_received += 1
+        self.evaluations += 1
+        self.bypassed += 1
+
+    def drain(self):
+        """변경된 종목의 (종목코드, 최신가, 구간 고가, 구간 저가) 목록"""
+        if not self._dirty:
+            return []
+        latest = self._latest
+        batch = [(code, *latest[code]) for code in self._dirty]
+        self._dirty = {}
+        self.batches += 1
+        self.evaluations += len(batch)
+        return batch
+
+    def stats(self):
+        """수신 틱 수 / 평가 횟수 / 병합률"""
+        return {
+            "ticks_received": self.ticks_received,
+            "evaluations": self.evaluations,
+            "batches": self.batches,
+            "bypassed": self.bypassed,
+            "coalesce_ratio": self.ticks_received / self.evaluations if self.evaluations else 0.0,
+        }
@@ -0,0 +1,196 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import time
+import multiprocessing as mp
+
+# 공유 블록 구조: [0] 계좌 현금, 이후 샤드별 FIELDS 칸
+CASH = 0
+RESERVED, HOLDINGS, OPEN_ORDERS, ORDERS, FILLS, STATE = range(6)
+FIELDS = 6
+
+# 워커 상태
+STARTING, RUNNING, DONE = 0, 1, 2
+STATE_NAMES = {STARTING: "시작 중", RUNNING: "실행 중", DONE: "종료"}
+
+
+def partition(target_stocks, index, count):
+    """
+    관심 종목 {코드: 이름} → index 번 샤드 몫 (코드 정렬 후 라운드 로빈, 모든 프로세스에서 같은 결과)
+    - 샤드별 종목 수 차이는 최대 1
+    """
+    codes = sorted(target_stocks)[index::count]
+    return {code: target_stocks[code] for code in codes}
+
+
+# -----------------------------------
+# 🔵 2. 샤드 워커용 리스크 클라이언트
+# -----------------------------------
+class ShardRisk:
+    """
+    워커 프로세스에서 계좌 전체 현금 / 보유 종목 수 한도를 조회·예약
+    - 틱 경로에서는 락을 잡지 않음 (매수 판단 시 예약, 체결 이벤트마다 자기 샤드 칸 갱신 때만 사용)
+    - 자기 샤드 칸(예약 현금, 보유+매수 중 종목 수, 미체결 주문 수)은 로컬 주문 관리자 값을 그대로 덮어써
+      예약과 실제 주문 상태가 어긋나도 다음 동기화에서 바로잡힘
+    """
+
+    def __init__(self, block, lock, shard, shards, max_holding_count=0):
+        self.block = block
+        self.lock = lock
+        self.shard = shard
+        self.shards = shards
+        self.max_holding_count = max_holding_count
+        self._row = 1 + shard * FIELDS
+
+        # 다음 동기화 때 반영할 로컬 누적분 (체결 현금 변동, 주문 / 체결 건수)
+        self._cash_delta = 0.0
+        self._orders = 0
+        self._fills = 0
+
+    def _total(self, field):
+        block = self.block
+        return sum(block[1 + i * FIELDS + field] for i in range(self.shards))
+
+    @property
+    def is_primary(self):
+        """계좌 현금 보정을 맡는 샤드 (0번)"""
+        return self.shard == 0
+
+    @property
+    def cash(self):
+        return self.block[CASH]
+
+    @property
+    def available_cash(self):
+        """주문 가능 현금 (계좌 현금 - 전체 샤드 미체결 매수 예약분)"""
+        return self.block[CASH] - self._total(RESERVED)
+
+    @property
+    def holding_count(self):
+        """전체 샤드 보유 + 매수 주문 중 종목 수"""
+        return int(self._total(HOLDINGS))
+
+    def reserve(self, amount, new_position=True):
+        """
+        매수 주문 전 현금 / 종목 수 한도를 원자적으로 확인 후 예약 → 성공하면 True
+        - max_holding_count 가 0 이면 종목 수 제한 없음
+        """
+        with self.lock:
+            if self.block[CASH] - self._total(RESERVED) < amount:
+                return False
+            if new_position and self.max_holding_count and self._total(HOLDINGS) >= self.max_holding_count:
+                return False
+            self.block[self._row + RESERVED] += amount
+            if new_position:
+                self.block[self._row + HOLDINGS] += 1
+            return True
+
+    def record_order(self):
+        self._orders += 1
+
+    def record_fill(self, is_buy, amount):
+        """체결 1건 (매수: 현금 감소, 매도: 현금 증가) – 다음 sync 에서 공유 현금에 반영"""
+        self._cash_delta += -amount if is_buy else amount
+        self._fills += 1
+
+    def sync(self, reserved, holdings, open_orders):
+        """로컬 주문 관리자 상태로 자기 샤드 칸 덮어쓰기 + 누적된 체결 현금 변동 반영"""
+        row = self._row
+        with self.lock:
+            self.block[CASH] += self._cash_delta
+            self.block[row + RESERVED] = reserved
+            self.block[row + HOLDINGS] = holdings
+            self.block[row + OPEN_ORDERS] = open_orders
+            self.block[row + ORDERS] += self._orders
+            self.block[row + FILLS] += self._fills
+        self._cash_delta, self._orders, self._fills = 0.0, 0, 0
+
+    def reconcile_cash(self, cash):
+        """잔고 조회 결과로 계좌 현금 보정 (어느 샤드든 미체결 주문이 있으면 보류) → 보정했으면 True"""
+        with self.lock:
+            if self._total(OPEN_ORDERS):
+                return False
+            self.block[CASH] = cash
+            return True
+
+    def set_state(self, state):
+        self.block[self._row + STATE] = state
+
+
+# -----------------------------------
+# 🔵 3. 리스크 / 현금 코디네이터 (부모 프로세스)
+# -----------------------------------
+class RiskCoordinator:
+    """
+    샤드 워커들이 공유하는 계좌 현금 / 보유 종목 수 블록 소유자
+    - 공유 메모리(RawArray) + 프로세스 간 락 1개, 워커에는 ShardRisk 로 전달
+    - 현금은 0번 샤드의 잔고 조회로 보정되기 전까지 0 (단일 프로세스와 같이 보정 전에는 매수하지 않음)
+    """
+
+    def __init__(self, shards, max_holding_count=0):
+        self.shards = shards
+        self.max_holding_count = max_holding_count
+        self.lock = mp.Lock()
+        self.block = mp.RawArray('d', 1 + shards * FIELDS)
+
+    def client(self, shard):
+        return ShardRisk(self.block, self.lock, shard, self.shards, self.max_holding_count)
+
+    def snapshot(self):
+        """현재 공유 상태 요약"""
+        with self.lock:
+            block = list(self.block)
+        rows = [block[1 + i * FIELDS:1 + (i + 1) * FIELDS] for i in range(self.shards)]
+        return {
+            "cash": block[CASH],
+            "reserved": sum(r[RESERVED] for r in rows),
+            "holdings": int(sum(r[HOLDINGS] for r in rows)),
+            "open_orders": int(sum(r[OPEN_ORDERS] for r in rows)),
+            "orders": int(sum(r[ORDERS] for r in rows)),
+            "fills": int(sum(r[FILLS] for r in rows)),
+            "shards": [
+                {"holdings": int(r[HOLDINGS]), "orders": int(r[ORDERS]), "fills": int(r[FILLS]),
+                 "state": STATE_NAMES.get(int(r[STATE]), "?")}
+                for r in rows
+            ],
+        }
+
+    def run(self, worker, args=(), status_interval=60.0):
+        """
+        샤드마다 프로세스 1개로 worker(shard, shards, risk, *args) 실행, 모두 끝날 때까지 상태 출력
+        - worker 는 모듈 최상위 함수여야 함 (Windows spawn 에서 피클링)
+        → 샤드별 종료 코드 목록
+        """
+        processes = [
+            mp.Process(target=worker, args=(i, self.shards, self.client(i), *args), name=f"shard-{i}")
+            for i in range(self.shards)
+        ]
+        for process in processes:
+            process.start()
+        print(f"[🧩 샤드 워커 {self.shards}개 시작] 최대 보유 종목 {self.max_holding_count or '제한 없음'}")
+
+        try:
+            last = time.monotonic()
+            while True:
+                alive = [p for p in processes if p.is_alive()]
+                if not alive:
+                    break
+                alive[0].join(timeout=1.0)
+                if time.monotonic() - last >= status_interval:
+                    last = time.monotonic()
+                    self.print_status()
+        except KeyboardInterrupt:
+            # 콘솔 Ctrl+C 는 워커에도 전달됨 → 각 워커가 안전 종료할 때까지 대기
+            print("\n[🔴 강제 종료 요청] 샤드 워커 종료 대기")
+            for process in processes:
+                process.join()
+
+        self.print_status()
+        return [p.exitcode for p in processes]
+
+    def print_status(self):
+        snap = self.snapshot()
+        states = " / ".join(f"#{i} {s['state']} 보유 {s['holdings']} 체결 {s['fills']}"
+                            for i, s in enumerate(snap["shards"]))
+        print(f"[🧩 코디네이터] 현금 {snap['cash']:,.0f}원 / 예약 {snap['reserved']:,.0f}원 / "
+              f"보유 {snap['holdings']}종목 / 주문 {snap['orders']:,}건 / 체결 {snap['fills']:,}건 | {states}")
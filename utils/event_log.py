@@ -0,0 +1,191 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import os
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+
+# 로그 레벨
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+
+def parse_level(name):
+    """'debug' / 'INFO' / '30' → 레벨 숫자"""
+    name = str(name).strip().upper()
+    if name.isdigit():
+        return int(name)
+    for level, level_name in LEVEL_NAMES.items():
+        if level_name == name:
+            return level
+    raise ValueError(f"알 수 없는 로그 레벨: {name}")
+
+
+# -----------------------------------
+# 🔵 2. 버퍼링 구조화 로거
+# -----------------------------------
+class EventLogger:
+    """
+    매매 스레드에서는 레코드 튜플만 큐에 넣고, 백그라운드 스레드가 모아서 JSONL 파일에 기록
+    - 레벨 필터: level 미만은 큐에 넣지도 않음, console_level 이상은 기록 스레드가 콘솔에도 출력
+    - sample=True 레코드는 (이벤트, 종목)별로 sample_every 건 중 1건만 기록 (틱마다 나오는 메시지용)
+    - 파일: log_dir/{prefix}_YYYYMMDD.jsonl, max_bytes 초과 시 .1 ~ .backup_count 로 순환
+      (샤드 워커는 prefix 를 달리해 프로세스마다 다른 파일에 기록)
+    """
+
+    def __init__(self, log_dir, level=DEBUG, console_level=INFO, max_bytes=10 * 1024 * 1024,
+                 backup_count=5, sample_every=100, flush_interval_ms=200, max_queue=100_000, prefix="trading"):
+        self.log_dir = log_dir
+        self.prefix = prefix
+        self.level = level
+        self.console_level = console_level
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.sample_every = max(int(sample_every), 1)
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue = max_queue
+
+        self._queue = deque()               # append / popleft 는 락 없이 스레드 안전
+        self._samples = {}                  # (이벤트, 종목) → 누적 건수
+        self._wake = threading.Event()
+        self._closed = False
+        self._file = None
+        self._file_date = None
+
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.latency = None                 # 배치 기록 시간 히스토그램 (metrics 계측 시에만 설정)
+
+        self._thread = threading.Thread(target=self._worker, name="event-log", daemon=True)
+        self._thread.start()
+
+    # ---- 매매 스레드 (큐 등록만) ----
+    def log(self, level, event, message="", code=None, sample=False, **fields):
+        """레코드 1건 등록 (등록했으면 True)"""
+        if level < self.level:
+            return False
+        if sample:
+            key = (event, code)
+            count = self._samples.get(key, 0)
+            self._samples[key] = count + 1
+            if count % self.sample_every:
+                self.sampled_out += 1
+                return False
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return False
+
+        record = (time.time(), level, event, code, message, fields)
+        if self._closed:
+            self._write_batch([record])     # 종료 후 들어온 기록은 직접 기록
+            self._close_file()
+            return True
+        self._queue.append(record)
+        if level >= ERROR:
+            self._wake.set()
+        return True
+
+    def debug(self, event, message="", code=None, sample=False, **fields):
+        return self.log(DEBUG, event, message, code, sample, **fields)
+
+    def info(self, event, message="", code=None, sample=False, **fields):
+        return self.log(INFO, event, message, code, sample, **fields)
+
+    def warning(self, event, message="", code=None, sample=False, **fields):
+        return self.log(WARNING, event, message, code, sample, **fields)
+
+    def error(self, event, message="", code=None, sample=False, **fields):
+        return self.log(ERROR, event, message, code, sample, **fields)
+
+    # ---- 기록 스레드 ----
+    def _worker(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        batch = []
+        queue = self._queue
+        while queue:
+            batch.append(queue.popleft())
+        if batch:
+            start = time.perf_counter_ns()
+            self._write_batch(batch)
+            if self.latency is not None:
+                self.latency.record(time.perf_counter_ns() - start)
+
+    def _write_batch(self, batch):
+        lines = []
+        for ts, level, event, code, message, fields in batch:
+            entry = {
+                "ts": datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+                "level": LEVEL_NAMES.get(level, str(level)),
+                "event": event,
+            }
+            if code is not None:
+                entry["code"] = code
+            if message:
+                entry["msg"] = message
+            entry.update(fields)
+            lines.append(json.dumps(entry, ensure_ascii=False, default=str))
+
+            if message and level >= self.console_level:
+                print(message)
+
+        try:
+            self._open(datetime.fromtimestamp(batch[-1][0]).strftime('%Y%m%d'))
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            self.written += len(lines)
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"[⚠️ 로그 기록 실패]: {e}")
+
+    def _path(self, date):
+        return os.path.join(self.log_dir, f"{self.prefix}_{date}.jsonl")
+
+    def _open(self, date):
+        if self._file is not None and self._file_date == date:
+            return
+        self._close_file()
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._file = open(self._path(date), 'a', encoding='utf-8')
+        self._file_date = date
+
+    def _rotate(self):
+        """현재 파일을 .1 로 밀고 기존 백업은 한 칸씩 뒤로 (backup_count 초과분 삭제)"""
+        date = self._file_date
+        self._close_file()
+        base = self._path(date)
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{base}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{base}.{i + 1}")
+            os.replace(base, f"{base}.1")
+        else:
+            os.remove(base)
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self, timeout=2.0):
+        """남은 레코드 기록 후 종료 (여러 번 호출해도 안전)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout)
+        self._close_file()
+
+    def stats(self):
+        return {"written": self.written, "dropped": self.dropped, "sampled_out": self.sampled_out}
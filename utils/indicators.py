@@ -0,0 +1,311 @@
+# -----------------------------------
+# 🔵 1. 지표 상수
+# -----------------------------------
+EMA_SPANS = (5, 12, 26)
+SIGNAL_SPAN = 9
+
+
+def ema_alpha(span):
+    """pandas ewm(span, adjust=False) 와 동일한 평활 계수"""
+    return 2.0 / (span + 1)
+
+
+A5, A12, A26, A9 = (ema_alpha(s) for s in (*EMA_SPANS, SIGNAL_SPAN))
+
+# -----------------------------------
+# 🔵 2. 종목별 증분 지표 상태
+# -----------------------------------
+class SymbolIndicators:
+    """
+    종목 1개의 EMA/MACD 상태
+    - 확정값: 마지막으로 마감된 일봉 기준
+    - 잠정값: 장중 실시간 가격으로 만든 오늘 봉 기준 (마감 시 확정값으로 반영)
+    """
+    __slots__ = (
+        "close", "ema5", "ema12", "ema26", "macd", "signal",
+        "prev_macd", "prev_signal",
+        "p_close", "p_ema5", "p_ema12", "p_ema26", "p_macd", "p_signal",
+        "has_provisional",
+    )
+
+    def __init__(self, close, ema5, ema12, ema26, signal, prev_macd, prev_signal):
+        self.close = float(close)
+        self.ema5 = float(ema5)
+        self.ema12 = float(ema12)
+        self.ema26 = float(ema26)
+        self.macd = self.ema12 - self.ema26
+        self.signal = float(signal)
+        self.prev_macd = float(prev_macd)
+        self.prev_signal = float(prev_signal)
+        self.has_provisional = False
+
+    def update(self, price):
+        """실시간 가격으로 오늘 봉의 잠정 지표 갱신 (O(1))"""
+        self.p_close = price
+        self.p_ema5 = A5 * price + (1 - A5) * self.ema5
+        self.p_ema12 = A12 * price + (1 - A12) * self.ema12
+        self.p_ema26 = A26 * price + (1 - A26) * self.ema26
+        self.p_macd = self.p_ema12 - self.p_ema26
+        self.p_signal = A9 * self.p_macd + (1 - A9) * self.signal
+        self.has_provisional = True
+
+    def commit(self):
+        """잠정 봉을 확정 봉으로 반영 (장 마감 시, 반영했으면 True)"""
+        if not self.has_provisional:
+            return False
+        self.prev_macd, self.prev_signal = self.macd, self.signal
+        self.close = self.p_close
+        self.ema5, self.ema12, self.ema26 = self.p_ema5, self.p_ema12, self.p_ema26
+        self.macd, self.signal = self.p_macd, self.p_signal
+        self.has_provisional = False
+        return True
+
+    def current(self):
+        """(종가, EMA5, MACD, Signal) – 잠정 봉이 있으면 잠정값"""
+        if self.has_provisional:
+            return self.p_close, self.p_ema5, self.p_macd, self.p_signal
+        return self.close, self.ema5, self.macd, self.signal
+
+    def previous(self):
+        """현재 봉 직전 확정 봉의 (MACD, Signal)"""
+        if self.has_provisional:
+            return self.macd, self.signal
+        return self.prev_macd, self.prev_signal
+
+    def golden_cross(self):
+        """직전 확정 봉 대비 현재 봉에서 MACD 가 Signal 을 상향 돌파했는지"""
+        if self.has_provisional:
+            return self.macd < self.signal and self.p_macd > self.p_signal
+        return self.prev_macd < self.prev_signal and self.macd > self.signal
+
+
+# -----------------------------------
+# 🔵 3. 증분 지표 엔진
+# -----------------------------------
+# 확정 봉 상태 행 순서 (엔진 배열의 행)
+STATE_FIELDS = ("close", "ema5", "ema12", "ema26", "macd", "signal", "prev_macd", "prev_signal")
+(_CLOSE, _EMA5, _EMA12, _EMA26, _MACD, _SIGNAL, _PREV_MACD, _PREV_SIGNAL) = range(len(STATE_FIELDS))
+
+
+class IndicatorEngine:
+    """
+    종목별 확정 봉 EMA/MACD 상태를 (필드 × 종목) NumPy 배열로 유지
+    - update: 틱마다 최신가만 기록 (O(1), 파이썬 dict – NumPy 원소 쓰기 없음)
+    - batch: 종목 묶음의 확정 상태를 한 번에 모으고, 최신가로 만든 오늘 봉 잠정 지표를 벡터로 계산
+      (SymbolIndicators.update 와 같은 식 → 같은 결과)
+    - NumPy 는 첫 seed 때 로드
+    """
+
+    def __init__(self, capacity=64):
+        self._capacity = max(capacity, 1)
+        self._index = {}            # 종목코드 → 배열 열 번호
+        self._codes = []
+        self._state = None          # (STATE_FIELDS × 종목) float64
+        self._alpha = None          # EMA5/12/26 평활 계수 (3 × 1, 세 EMA 를 한 번에 갱신)
+        self._decay = None          # 1 - 평활 계수
+        self._prices = {}           # 종목코드 → 오늘(장중) 최신가 (잠정 봉)
+
+    def __contains__(self, code):
+        return code in self._index
+
+    def __len__(self):
+        return len(self._codes)
+
+    def _column(self, code):
+        import numpy as np
+
+        idx = self._index.get(code)
+        if idx is not None:
+            return idx
+        if self._state is None:
+            self._state = np.zeros((len(STATE_FIELDS), self._capacity))
+            self._alpha = np.array([[A5], [A12], [A26]])
+            self._decay = np.array([[1 - A5], [1 - A12], [1 - A26]])
+        idx = len(self._codes)
+        if idx >= self._state.shape[1]:
+            self._state = np.concatenate([self._state, np.zeros_like(self._state)], axis=1)
+        self._index[code] = idx
+        self._codes.append(code)
+        return idx
+
+    def get(self, code):
+        """종목 1개 상태 사본 (SymbolIndicators, 최신가가 있으면 잠정값 포함) – 없으면 None"""
+        idx = self._index.get(code)
+        if idx is None:
+            return None
+        close, ema5, ema12, ema26, _, signal, prev_macd, prev_signal = self._state[:, idx].tolist()
+        state = SymbolIndicators(close, ema5, ema12, ema26, signal, prev_macd, prev_signal)
+        price = self._prices.get(code)
+        if price is not None:
+            state.update(price)
+        return state
+
+    def seed(self, code, close, ema5, ema12, ema26, signal, prev_macd, prev_signal):
+        """과거 일봉으로 계산된 마지막 지표값으로 초기화 (잠정 봉은 비움)"""
+        idx = self._column(code)
+        self._state[:, idx] = (close, ema5, ema12, ema26, float(ema12) - float(ema26), signal, prev_macd, prev_signal)
+        self._prices.pop(code, None)
+        return self.get(code)
+
+    def seed_from_closes(self, code, closes):
+        """종가 목록(과거 → 최신)으로 지표를 재귀 계산해 초기화"""
+        it = iter(closes)
+        first = float(next(it))
+        ema5 = ema12 = ema26 = first
+        signal = prev_macd = prev_signal = 0.0
+        for close in it:
+            prev_macd, prev_signal = ema12 - ema26, signal
+            ema5 = A5 * close + (1 - A5) * ema5
+            ema12 = A12 * close + (1 - A12) * ema12
+            ema26 = A26 * close + (1 - A26) * ema26
+            signal = A9 * (ema12 - ema26) + (1 - A9) * signal
+        return self.seed(code, float(closes[-1]), ema5, ema12, ema26, signal, prev_macd, prev_signal)
+
+    def update(self, code, price):
+        """실시간 가격 반영 (상태가 없으면 False)"""
+        if code in self._index:
+            self._prices[code] = price
+            return True
+        return False
+
+    def latest_prices(self):
+        """오늘(장중) 잠정 봉 최신가 복사본 {종목코드: 가격} (아직 확정되지 않은 종목만)"""
+        return dict(self._prices)
+
+    def batch(self, codes, prices):
+        """
+        종목 묶음 → 지표 배열 dict (codes 와 같은 순서, 상태가 없는 종목은 제외 → "codes" 에 실제 포함된 종목)
+        - close / ema5 / ema12 / ema26 / macd / signal: 현재가로 만든 오늘 봉 잠정값
+        - prev_macd / prev_signal: 직전 확정 봉 값
+        """
+        import numpy as np
+
+        index = self._index
+        if len(codes) and all(code in index for code in codes):
+            kept = list(codes)
+            price = np.asarray(prices, dtype=np.float64)
+        else:
+            pairs = [(code, p) for code, p in zip(codes, prices) if code in index]
+            kept = [code for code, _ in pairs]
+            price = np.array([p for _, p in pairs], dtype=np.float64)
+        rows = np.fromiter((index[code] for code in kept), dtype=np.intp, count=len(kept))
+        if self._state is None:
+            rows = rows[:0]
+            state, ema = np.zeros((len(STATE_FIELDS), 0)), np.zeros((3, 0))
+        else:
+            state = self._state[:, rows]
+            ema = self._alpha * price + self._decay * state[_EMA5:_EMA26 + 1]
+        macd = ema[1] - ema[2]
+        return {
+            "codes": kept,
+            "rows": rows,
+            "close": price,
+            "ema5": ema[0],
+            "ema12": ema[1],
+            "ema26": ema[2],
+            "macd": macd,
+            "signal": A9 * macd + (1 - A9) * state[_SIGNAL],
+            "prev_macd": state[_MACD],
+            "prev_signal": state[_SIGNAL],
+        }
+
+    def commit_all(self):
+        """모든 종목의 잠정 봉을 확정 (장 마감 시 1회) → 확정된 종목코드 목록"""
+        if not self._prices:
+            return []
+        codes = list(self._prices)
+        values = self.batch(codes, [self._prices[code] for code in codes])
+        rows, state = values["rows"], self._state
+        state[_PREV_MACD, rows] = state[_MACD, rows]
+        state[_PREV_SIGNAL, rows] = state[_SIGNAL, rows]
+        for field, name in ((_CLOSE, "close"), (_EMA5, "ema5"), (_EMA12, "ema12"), (_EMA26, "ema26"),
+                            (_MACD, "macd"), (_SIGNAL, "signal")):
+            state[field, rows] = values[name]
+        self._prices.clear()
+        return codes
+
+
+# -----------------------------------
+# 🔵 4. 전 종목 일괄(벡터화) 지표 계산
+# -----------------------------------
+def closes_to_matrix(close_lists, max_bars=None):
+    """종목별 종가 목록(과거 → 최신)을 왼쪽 NaN 패딩된 (종목 × 봉) 행렬로 변환"""
+    import numpy as np
+
+    width = max((len(c) for c in close_lists), default=0)
+    if max_bars:
+        width = min(width, max_bars)
+    matrix = np.full((len(close_lists), width), np.nan)
+    for row, closes in enumerate(close_lists):
+        tail = np.asarray(closes, dtype=np.float64)[-width:] if width else []
+        if len(tail):
+            matrix[row, width - len(tail):] = tail
+    return matrix
+
+
+def _ema_time_major(series, span):
+    """(봉 × 종목) 배열의 EMA – 봉 방향 재귀, 종목 방향 벡터 연산 (앞쪽 패딩은 채워진 상태여야 함)"""
+    import numpy as np
+
+    alpha = ema_alpha(span)
+    out = np.empty_like(series)
+    out[0] = series[0]
+    scaled = alpha * series
+    for t in range(1, len(series)):
+        np.multiply(out[t - 1], 1 - alpha, out=out[t])
+        out[t] += scaled[t]
+    return out
+
+
+def _fill_leading_nan(values):
+    """앞쪽 NaN 패딩을 종목별 첫 유효값으로 채운 (봉 × 종목) 배열과 (봉 × 종목) 패딩 마스크 반환"""
+    import numpy as np
+
+    pad = np.isnan(values).T
+    first = np.argmax(~pad, axis=0)
+    series = np.where(pad, values[np.arange(len(values)), first], values.T)
+    return series, pad
+
+
+def ema_matrix(values, span):
+    """
+    (종목 × 봉) 행렬의 행별 EMA (pandas ewm(span, adjust=False) 와 동일)
+    - 종목별 첫 유효값부터 계산 (앞쪽 NaN 패딩 허용)
+    """
+    import numpy as np
+
+    # 앞쪽 패딩을 첫 유효값으로 채우면 EMA 가 그 값에 머물러 결과가 동일
+    series, pad = _fill_leading_nan(values)
+    return np.where(pad, np.nan, _ema_time_major(series, span)).T
+
+
+def compute_macd_matrix(closes):
+    """
+    전 종목 종가 행렬(종목 × 봉)로 EMA5/12/26, MACD, Signal 과 크로스 신호를 한 번에 계산
+    → dict (지표 행렬 + 종목별 bool 배열: golden_cross, dead_cross, ema5_breakout, buy_candidates)
+    """
+    import numpy as np
+
+    # 내부 계산은 (봉 × 종목) 배치로 한 번만 전치
+    series, pad = _fill_leading_nan(closes)
+    ema5 = _ema_time_major(series, 5)
+    ema12 = _ema_time_major(series, 12)
+    ema26 = _ema_time_major(series, 26)
+    macd = ema12 - ema26
+    signal = _ema_time_major(macd, SIGNAL_SPAN)
+
+    result = {}
+    for name, values in (("ema5", ema5), ("ema12", ema12), ("ema26", ema26), ("macd", macd), ("signal", signal)):
+        np.copyto(values, np.nan, where=pad)
+        result[name] = values.T  # (종목 × 봉) 뷰, 복사 없음
+
+    ema5, macd, signal = result["ema5"], result["macd"], result["signal"]
+    if closes.shape[1] >= 2:
+        with np.errstate(invalid="ignore"):
+            golden = (macd[:, -2] < signal[:, -2]) & (macd[:, -1] > signal[:, -1])
+            dead = (macd[:, -2] > signal[:, -2]) & (macd[:, -1] < signal[:, -1])
+            breakout = closes[:, -1] > ema5[:, -1]
+    else:
+        golden = dead = breakout = np.zeros(closes.shape[0], dtype=bool)
+    result.update(golden_cross=golden, dead_cross=dead, ema5_breakout=breakout, buy_candidates=golden.copy())
+    return result
@@ -3,40 +3,57 @@
 # -----------------------------------
 import os
 import sys
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
 import configparser
-from datetime import datetime, time as dtime
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QEventLoop, QTimer
-from PyQt5.QAxContainer import QAxWidget
-from openpyxl import Workbook
-from PyQt5.QtWidgets import QMessageBox
+from time import perf_counter_ns
+from datetime import datetime
+from transport import OcxTransport
+from indicators import IndicatorEngine, closes_to_matrix, compute_macd_matrix
+from tr_scheduler import TrScheduler
+from screens import ScreenManager
+from coalescer import TickCoalescer
+from order_manager import OrderManager, BUY, SELL
+from notifier import Notifier, build_sinks
+from event_log import EventLogger, parse_level
+from trade_journal import TradeJournal, ORDER, FILL, SALE, REJECT, CANCEL
+from pnl import PnLTracker
+from strategy import (MIN_HISTORY_BARS, TRAILING_STOP_RATIO, profit_rate, split_buy_quantities,
+                      EXIT_NONE, EXIT_TAKE_PROFIT, EXIT_STOP_LOSS, EXIT_TRAILING_STOP)
+from strategy_plugins import StrategyBook, StrategyView, GROUP_PREFIX
+from position_risk import PositionRisk
+from market_calendar import (KrxCalendar, SessionScheduler, PHASE_NAMES, CLOSED, CONTINUOUS, AFTER_HOURS,
+                             TRADING_PHASES, AUCTION_PHASES)
+
+# 틱 저장 시 등록할 실시간 FID (체결가, 체결량, 누적거래량, 체결시간, 최우선 매도/매수호가)
+DEFAULT_TICK_FIDS = "10;15;13;20;27;28"
+TICK_EXTRA_FIDS = (15, 13, 27, 28)   # tickstore 의 volume, cum_volume, ask, bid 순서
 
 # -----------------------------------
 # 🔵 2. Kiwoom 클래스 정의 (메인)
 # -----------------------------------
 class Kiwoom:
-    def __init__(self):
-        """프로그램 초기화 (PyQt, API 연결, 설정 파일 로드, 내부 변수 초기화)"""
+    def __init__(self, transport=None, config_path='config.ini', shard=None, risk=None):
+        """
+        프로그램 초기화 (PyQt, API 연결, 설정 파일 로드, 내부 변수 초기화)
+        - transport: 브로커 전송 계층 (기본값: 실제 키움 OCX, 시뮬레이터로 교체 가능)
+        - shard: (샤드 번호, 샤드 수) → target_list 중 이 샤드 몫만 감시 (coordinator.partition)
+        - risk: 샤드 간 공유 현금 / 보유 종목 수 한도 (coordinator.ShardRisk, 없으면 로컬 원장만 사용)
+        """
         print("[🟢 프로그램 초기화 중...]")
 
-        # PyQt5 애플리케이션 생성 (필수)
-        self.app = QApplication(sys.argv)
-
-        # 키움 API 연결 객체 생성
-        self.ocx = QAxWidget("KHOPENAPI.KHOpenAPICtrl.1")
+        # 키움 API 연결 객체 생성 (PyQt5 애플리케이션 포함)
+        self.ocx = transport if transport is not None else OcxTransport()
+        self.app = self.ocx.app
 
         # 키움 이벤트 핸들러 등록
         self.ocx.OnEventConnect.connect(self._on_login)
         self.ocx.OnReceiveTrData.connect(self._on_receive_tr_data)
         self.ocx.OnReceiveRealData.connect(self._on_receive_real_data)
         self.ocx.OnReceiveChejanData.connect(self._on_receive_chejan_data)
+        self.ocx.OnReceiveMsg.connect(self._on_receive_msg)
 
         # 설정 파일 로드 (config.ini)
         config = configparser.ConfigParser()
-        config.read('config.ini', encoding='utf-8')
+        config.read(config_path, encoding='utf-8')
 
         # 사용자 설정값 저장
         self.account_pw = config['USER']['account_pw']
@@ -46,31 +63,242 @@ class Kiwoom:
         self.target_stocks = eval(config['TRADING']['target_list'])
         self.max_stock_ratio = float(config['TRADING']['max_stock_ratio'])
         self.buy_split_count = int(config['TRADING']['buy_split_count'])
-        self.restart_after_close = config.getboolean('TRADING', 'restart_after_close')
+        self.trailing_stop_ratio = config.getfloat('TRADING', 'trailing_stop_ratio', fallback=TRAILING_STOP_RATIO)
+        self.restart_after_close = config.getboolean('TRADING', 'restart_after_close')  # 장 종료 후 다음 거래일로 이어서 실행
+        # 비정상 종료 시 자동 재시작 (연속 max_restarts 회까지, 대기 시간은 restart_delay_sec 부터 2배씩)
+        self.max_restarts = config.getint('TRADING', 'max_restarts', fallback=5)
+        self.restart_delay_sec = config.getfloat('TRADING', 'restart_delay_sec', fallback=30)
+
+        # 샤드 모드: 종목을 워커 프로세스끼리 나누고 현금 / 보유 종목 수는 코디네이터와 공유
+        self.shard = shard
+        self.risk = risk
+        self.screen_offset = 0
+        if shard is not None:
+            from coordinator import partition
+            self.target_stocks = partition(self.target_stocks, *shard)
+            self.screen_offset = shard[0] * 100   # 샤드별 실시간 / 주문 화면번호 대역
+        self.reconcile_interval_min = config.getint('TRADING', 'reconcile_interval_min', fallback=60)
+        self.order_timeout_sec = config.getfloat('TRADING', 'order_timeout_sec', fallback=60)  # 0: 미체결 주문 정리 안 함
+
+        # 화면번호 관리 (TR 는 요청마다 빌려 쓰고 반납, 실시간은 화면당 codes_per_screen 종목까지 채움)
+        self.screens = ScreenManager(
+            self.ocx,
+            offset=self.screen_offset,
+            codes_per_screen=config.getint('REALTIME', 'codes_per_screen', fallback=100),
+        )
+
+        # TR 조회 제한 / 연속조회 설정 (없으면 기본값)
+        self.daily_history_pages = config.getint('TR', 'daily_history_pages', fallback=1)
+        self.tr_scheduler = TrScheduler(
+            self.ocx,
+            per_second=config.getint('TR', 'per_second', fallback=5),
+            per_hour=config.getint('TR', 'per_hour', fallback=1000),
+            timeout_ms=config.getint('TR', 'timeout_ms', fallback=5000),
+            max_retries=config.getint('TR', 'max_retries', fallback=2),
+            screens=self.screens,
+        )
+
+        # 실시간 틱 병합 / 결정 루프 설정 (decision_interval_ms = 0 이면 틱마다 즉시 평가)
+        self.decision_interval_ms = config.getint('REALTIME', 'decision_interval_ms', fallback=50)
+        self.sell_bypass_coalescing = config.getboolean('REALTIME', 'sell_bypass_coalescing', fallback=True)
+
+        # 매수 / 매도 전략 플러그인 ([STRATEGY], [STRATEGY:그룹명] – 없으면 MACD 골든크로스, 실패 시 5일선 돌파)
+        self.strategies = StrategyBook.from_config(config)
+
+        # 종목 그룹별 트레일링 스탑 비율 ([STRATEGY:그룹명] trailing_stop_ratio, 없으면 [TRADING] 값)
+        self.trailing_ratios = {}
+        for name, (codes, _) in self.strategies.groups.items():
+            ratio = config.getfloat(GROUP_PREFIX + name, 'trailing_stop_ratio', fallback=None)
+            if ratio is not None:
+                self.trailing_ratios.update(dict.fromkeys(codes, ratio))
+
+        # 구조화 로그 (기록 스레드가 JSONL 파일에 일괄 기록, 틱 단위 메시지는 종목별 샘플링)
+        # 로그 폴더는 한 번만 정해 로그 / 알림 로그 / 저널 / 메트릭 스냅샷 기본 경로에 같이 사용
+        log_dir = config.get('LOG', 'log_dir', fallback=os.path.join(os.path.dirname(__file__), '..', 'logs'))
+        self.log = EventLogger(
+            log_dir,
+            level=parse_level(config.get('LOG', 'level', fallback='DEBUG')),
+            console_level=parse_level(config.get('LOG', 'console_level', fallback='INFO')),
+            max_bytes=config.getint('LOG', 'max_bytes', fallback=10 * 1024 * 1024),
+            backup_count=config.getint('LOG', 'backup_count', fallback=5),
+            sample_every=config.getint('LOG', 'sample_every', fallback=100),
+            flush_interval_ms=config.getint('LOG', 'flush_interval_ms', fallback=200),
+            prefix="trading" if shard is None else f"trading_shard{shard[0]}",
+        )
+
+        # 비동기 알림 (싱크: log, toast, webhook, null)
+        self.notifier = Notifier(
+            build_sinks(
+                config.get('NOTIFY', 'sinks', fallback='log,toast'),
+                log_dir,
+                webhook_url=config.get('NOTIFY', 'webhook_url', fallback=None),
+                headless=self.ocx.headless,
+            ),
+            max_pending=config.getint('NOTIFY', 'max_pending', fallback=256),
+            policy=config.get('NOTIFY', 'policy', fallback='coalesce'),
+        )
+
+        # 매매 저널 (주문 / 체결 / 매도를 발생 즉시 SQLite WAL 에 기록, 엑셀/CSV 는 src/export_journal.py)
+        self.journal = TradeJournal(
+            config.get('JOURNAL', 'path', fallback=os.path.join(log_dir, 'trade_journal.db')),
+            flush_interval_ms=config.getint('JOURNAL', 'flush_interval_ms', fallback=100),
+            clock=self.ocx.now,   # 시뮬레이터 / 리플레이에서도 기록 날짜가 가상 거래일과 일치하도록
+        )
+
+        # 실현/평가 손익 (체결마다 FIFO 매칭, 리포트·그래프는 종료 시 별도 프로세스 src/report.py)
+        self.pnl = PnLTracker()
+        self.report_on_shutdown = config.getboolean('REPORT', 'on_shutdown', fallback=True)
+        if shard is not None and shard[0] != 0:
+            self.report_on_shutdown = False   # 샤드 모드: 같은 저널을 쓰므로 0번 샤드만 리포트 실행
+
+        # 일봉 디스크 캐시 (없으면 기본값: 사용, 프로젝트 cache/candles 폴더, 첫 사용 시 생성)
+        self._candle_dir = None
+        if config.getboolean('CACHE', 'enabled', fallback=True):
+            default_dir = os.path.join(os.path.dirname(__file__), '..', 'cache', 'candles')
+            self._candle_dir = config.get('CACHE', 'candle_dir', fallback=default_dir)
+        self._candle_cache = None
+
+        # 실시간 틱 저장소 (사용 시 체결가 외 FID 도 등록, 종목별 틱 / 1분봉 컬럼 + 장 종료 시 디스크 내보내기)
+        self.real_fids = "10"
+        self._tick_config = None
+        self._tick_store = None
+        if config.getboolean('TICKS', 'enabled', fallback=False):
+            self.real_fids = config.get('TICKS', 'fids', fallback=DEFAULT_TICK_FIDS)
+            self.screens.fids = self.real_fids
+            registered = {int(fid) for fid in self.real_fids.split(';') if fid.strip()}
+            tick_dir = None
+            if config.getboolean('TICKS', 'spill', fallback=True):
+                default_dir = os.path.join(os.path.dirname(__file__), '..', 'cache', 'ticks')
+                tick_dir = config.get('TICKS', 'tick_dir', fallback=default_dir)
+            self._tick_config = {
+                "capacity": config.getint('TICKS', 'capacity', fallback=20_000),
+                "keep": config.getint('TICKS', 'keep', fallback=5_000),
+                "bar_capacity": config.getint('TICKS', 'bar_capacity', fallback=600),
+                "tick_dir": tick_dir,
+            }
+            self._tick_time_fid = 20 in registered
+            self._tick_extra_fids = [fid if fid in registered else None for fid in TICK_EXTRA_FIDS]
 
         # 내부 상태 변수
         self.account_number = None
-        self.available_cash = 0
         self.login_event_loop = None
-        self.tr_event_loop = None
-        self.macd_data = {}
-        self.own_stocks = {}
-        self.trade_log = []
+        self.order_manager = OrderManager(clock=self.ocx.now)  # 주문 상태 머신 + 로컬 현금/보유 원장
+        self._bar_store = None               # 종목별 일봉/지표 이력 (첫 사용 시 생성)
+        self.daily_closes = {}               # 종목별 확정 일봉 종가 (과거 → 최신, 일괄 지표 계산 입력)
+        self.today_closes = {}               # 종목별 오늘(장중) 잠정 종가
+        self.indicators = IndicatorEngine(len(self.target_stocks))  # 종목별 EMA/MACD 확정 상태 배열 + 최신가
+        self.daily_bar_committed = False     # 오늘 봉 지표 확정 여부
+        self.own_stocks = self.order_manager.positions  # 체결 기준 보유 종목
+        self.order_manager.on_fill = self._on_fill
+        self.order_manager.on_expire = self._on_order_expired
+        self.position_risk = PositionRisk(self.own_stocks, self.max_profit_rate, self.max_loss_rate,
+                                          self.trailing_stop_ratio, self.trailing_ratios)  # 보유 종목 매도 기준 가격
         self.logged_realtime_codes = set()
-        self.current_screen_no = 2000
-        self.screen_by_code = {}
+        self.pending_daily_codes = set()   # 일봉 수신 대기 종목
         self.real_time_success = False     # 실시간 등록 성공 여부
-        self.daily_chart_success = False   # 일봉 데이터 수신 성공 여부
+        self.daily_data_success = False    # 일봉 데이터 수신 성공 여부 (실패 시 fallback 전략)
+
+        # 장 운영 스케줄 (KRX 거래일 달력 기준 구간 전환 시각에만 단발 타이머, [SESSION])
+        self.calendar = KrxCalendar.from_config(config)
+        self.session = SessionScheduler(self.ocx, self.calendar, self._on_session_phase)
+        self.pause_in_auction = config.getboolean('SESSION', 'pause_in_auction', fallback=True)
+        self.trading_active = False          # 매매 판단 중 여부 (정규장, 동시호가 중지 안 하면 동시호가 포함)
+        self._session_day = None             # 장 시작 준비(일봉 / 지표 / 잔고)를 마친 거래일
+        self.session_started = False         # 로그인 / 초기 조회를 마치고 장 운영 스케줄을 시작했는지 (자동 재시작 조건)
+
+        # 실시간 틱 병합기 + 결정 루프 타이머
+        self.coalescer = TickCoalescer()
+        self.decision_timer = self.ocx.create_timer()
+        self.decision_timer.timeout.connect(self._run_decision_loop)
+
+        # 잔고 보정 타이머 (매매 중에만 작동, 직전 보정 이후 주문 / 체결이 있었을 때만 조회)
+        self.balance_timer = self.ocx.create_timer()
+        self.balance_timer.timeout.connect(self._reconcile_if_active)
+        self._ledger_dirty = False
+
+        # 미체결 주문 정리 타이머 (매매 중에만 작동, order_timeout_sec 이 지난 주문을 취소 상태로 정리)
+        self.order_timer = self.ocx.create_timer()
+        self.order_timer.timeout.connect(self._expire_orders)
+
+        # 재시작 복원용 상태 스냅샷 (보유 종목·최고가 / 현금 / 손익 / 확정 일봉 종가 / 장중 최신가, 별도 스레드에서 기록)
+        self.snapshot_path = None
+        self.snapshot_writer = None
+        self.snapshot_interval_sec = config.getfloat('SNAPSHOT', 'interval_sec', fallback=30)
+        self.restore_on_start = config.getboolean('SNAPSHOT', 'restore', fallback=True)
+        if config.getboolean('SNAPSHOT', 'enabled', fallback=True):
+            default_path = os.path.join(os.path.dirname(__file__), '..', 'cache', 'state', 'snapshot.bin')
+            path = config.get('SNAPSHOT', 'path', fallback=default_path)
+            if shard is not None:
+                root, ext = os.path.splitext(path)
+                path = f"{root}_shard{shard[0]}{ext}"
+            self.snapshot_path = path
+        self.snapshot_timer = self.ocx.create_timer()
+        self.snapshot_timer.timeout.connect(self.save_snapshot)
+        self._awaiting_balance = False     # 스냅샷 복원 후 첫 잔고 보정 전까지 실시간 감시 보류
+
+        # 지연 시간 계측 (비활성화면 핫 경로에서는 None 확인만)
+        self.metrics = None
+        self.metrics_exporter = None
+        if config.getboolean('METRICS', 'enabled', fallback=False):
+            self._setup_metrics(config, log_dir)
 
-        # 장 상태 체크 타이머
-        self.check_timer = QTimer()
-        self.check_timer.timeout.connect(self.check_market_status)
+        print("[✅ 프로그램 초기화 완료]")
 
-        # 잔액 조회 타이머
-        self.balance_timer = QTimer()
-        self.balance_timer.timeout.connect(self.check_balance)
+    def _setup_metrics(self, config, log_dir):
+        """
+        단계별 지연 시간 히스토그램 + 카운터 등록, 로컬 엔드포인트 / 스냅샷 파일 시작
+        - real_data: GetCommRealData 가격 변환, evaluate: 평가 1회 (즉시 평가는 종목 1개, 결정 루프는 묶음 – 지표 + 전략 + 주문)
+        - decision_loop: 병합된 틱 일괄 평가 1회, chejan: 체결 이벤트 처리, send_order: SendOrder 호출
+        - tick_to_order: 틱 수신(OnReceiveRealData) → SendOrder 반환 (병합 대기 포함, 종목별)
+        - tr_roundtrip / log_write / journal_commit: TR 응답, 로그 / 저널 기록 스레드 배치 처리
+        """
+        from metrics import Metrics, MetricsExporter
+
+        metrics = self.metrics = Metrics(per_symbol=("tick_to_order",))
+        self._tick_arrival = {}     # 종목별 마지막 틱 수신 시각 (ns)
+        self._latency_real_data = metrics.histogram("real_data")
+        self._latency_evaluate = metrics.histogram("evaluate")
+        self._latency_decision = metrics.histogram("decision_loop")
+        self._latency_chejan = metrics.histogram("chejan")
+        self.tr_scheduler.latency = metrics.histogram("tr_roundtrip")
+        self.log.latency = metrics.histogram("log_write")
+        self.journal.latency = metrics.histogram("journal_commit")
+        metrics.add_collector(self._collect_metrics)
+
+        suffix = "" if self.shard is None else f"_shard{self.shard[0]}"
+        port = config.getint('METRICS', 'port', fallback=0)
+        self.metrics_exporter = MetricsExporter(
+            metrics,
+            host=config.get('METRICS', 'host', fallback='127.0.0.1'),
+            port=port + self.shard[0] if port and self.shard is not None else port,
+            snapshot_path=config.get('METRICS', 'snapshot_path', fallback=os.path.join(log_dir, f'metrics{suffix}.json')),
+            snapshot_interval_sec=config.getfloat('METRICS', 'snapshot_interval_sec', fallback=0),
+        )
 
-        print("[✅ 프로그램 초기화 완료]")
+    def _collect_metrics(self):
+        """카운터 / 게이지 (조회 시점에 다른 객체가 세고 있는 값을 읽음)"""
+        coalescer = self.coalescer
+        scheduler = self.tr_scheduler
+        return {
+            "ticks_received_total": coalescer.ticks_received,
+            "evaluations_total": coalescer.evaluations,
+            "ticks_bypassed_total": coalescer.bypassed,
+            "tr_requests_total": scheduler.sent_count,
+            "tr_timeouts_total": scheduler.timeout_count,
+            "tr_failures_total": scheduler.failed_count,
+            "tr_late_replies_total": scheduler.late_count,
+            "tr_pending": scheduler.pending,
+            "fills_total": self.pnl.fills,
+            "journal_records_total": self.journal.written,
+            "log_records_total": self.log.written,
+            "log_dropped_total": self.log.dropped,
+            "cash": self.order_manager.cash if self.risk is None else self.risk.cash,
+            "holdings": len(self.own_stocks),
+            "realized_pnl": self.pnl.realized,
+            "unrealized_pnl": self.pnl.unrealized,
+            "session_phase": self.session.phase if self.session.phase is not None else -1,
+            "session_wakeups_total": self.session.wakeups,
+        }
 
 # -----------------------------------
 # 🔵 3. 로그인 처리
@@ -79,7 +307,7 @@ class Kiwoom:
         """키움 서버 로그인 요청"""
         print("[🔐 로그인 요청 중...]")
         self.ocx.dynamicCall("CommConnect()")   # 키움 로그인창 띄우기
-        self.login_event_loop = QEventLoop()    # 로그인 완료될 때까지 대기
+        self.login_event_loop = self.ocx.create_event_loop()    # 로그인 완료될 때까지 대기
         self.login_event_loop.exec_()
 
     def _on_login(self, err_code):
@@ -97,241 +325,620 @@ class Kiwoom:
             print(f"[❌ 로그인 실패] 에러코드: {err_code}")
         self.login_event_loop.exit()
 
+    @property
+    def candle_cache(self):
+        """일봉 디스크 캐시 (NumPy 는 로그인 이후 첫 사용 시 로드, 비활성화면 None)"""
+        if self._candle_cache is None and self._candle_dir:
+            from candle_cache import CandleCache
+            self._candle_cache = CandleCache(self._candle_dir)
+        return self._candle_cache
+
+    @property
+    def bar_store(self):
+        """종목별 일봉/지표 컬럼 저장소 (첫 사용 시 생성)"""
+        if self._bar_store is None:
+            from barstore import BarStore
+            self._bar_store = BarStore(capacity=600 * self.daily_history_pages, max_symbols=len(self.target_stocks))
+        return self._bar_store
+
+    @property
+    def tick_store(self):
+        """실시간 틱 / 분봉 컬럼 저장소 (틱 저장 사용 시 첫 틱에서 생성, 내보내기 폴더는 세션 일자별 / 비활성화면 None)"""
+        if self._tick_store is None and self._tick_config is not None:
+            from tickstore import TickStore
+            settings = self._tick_config
+            spill_dir = None
+            if settings["tick_dir"]:
+                spill_dir = os.path.join(settings["tick_dir"], self.ocx.now().strftime('%Y%m%d'))
+            self._tick_store = TickStore(
+                capacity=settings["capacity"],
+                keep=settings["keep"],
+                max_symbols=len(self.target_stocks),
+                bar_capacity=settings["bar_capacity"],
+                spill_dir=spill_dir,
+            )
+        return self._tick_store
+
 # -----------------------------------
-# 🔵 4. 잔액 조회 (초기 현금 확보)
+# 🔵 4. 잔고 조회 (로컬 원장 보정)
 # -----------------------------------
+    @property
+    def available_cash(self):
+        """주문 가능 현금 (로컬 원장: 체결 반영 현금 - 미체결 매수 예약분, 샤드 모드면 계좌 전체 기준)"""
+        if self.risk is not None:
+            return self.risk.available_cash
+        return self.order_manager.available_cash
+
+    def _sync_risk(self):
+        """로컬 주문 관리자 상태를 코디네이터 공유 블록에 반영 (샤드 모드)"""
+        manager = self.order_manager
+        self.risk.sync(manager.reserved_cash, len(manager.holding_codes()), manager.open_order_count)
+
     def check_balance(self):
-        """계좌 잔액 조회 요청"""
-        print("[💰 초기에 잔액 조회 요청 중...]")
-        self.ocx.dynamicCall("SetInputValue(QString, QString)", "계좌번호", self.account_number)
-        self.ocx.dynamicCall("SetInputValue(QString, QString)", "비밀번호", self.account_pw)
-        self.ocx.dynamicCall("SetInputValue(QString, QString)", "비밀번호입력매체구분", "00")
-        self.ocx.dynamicCall("SetInputValue(QString, QString)", "조회구분", "2")
-        self.ocx.dynamicCall("CommRqData(QString, QString, int, QString)", "opw00018_req", "opw00018", 0, "2000")
-        self.tr_event_loop = QEventLoop()
-        self.tr_event_loop.exec_()
+        """계좌 잔고 조회 요청 (TR 스케줄러로 비동기 처리, 결과로 로컬 원장 보정)"""
+        print("[💰 잔고 조회 요청 (원장 보정)]")
+        self.tr_scheduler.submit(
+            "opw00018",
+            [("계좌번호", self.account_number), ("비밀번호", self.account_pw),
+             ("비밀번호입력매체구분", "00"), ("조회구분", "2")],
+            None,   # 화면번호는 전송 시 화면번호 관리자에서 빌림
+            on_page=self.handle_balance,
+            on_done=self._on_balance_done,
+            on_error=self._on_balance_error,
+            context={},
+            max_pages=10,
+        )
 
     def _on_receive_tr_data(self, screen_no, rqname, trcode, recordname, prev_next):
-        """TR 데이터 수신 이벤트"""
-        if rqname == "opw00018_req":
-            self.handle_balance(trcode, rqname)
-        elif rqname == "opt10081_req":
-            self.handle_daily_chart(trcode, rqname, screen_no)
-
-    def handle_balance(self, trcode, rqname):
-        """잔액 조회 결과 저장"""
-        try:
-            cash_raw = self.ocx.dynamicCall("GetCommData(QString, QString, int, QString)", trcode, rqname, 0, "출금가능금액").strip()
-            if cash_raw and cash_raw.lstrip('-').isdigit():
-                self.available_cash = abs(int(cash_raw))
-                print(f"[💰 현재 출금 가능 금액]: {self.available_cash:,}원")
-            else:
-                self.available_cash = 0
-                print("[⚠️ 출금 가능 금액 없음]")
-        except Exception as e:
-            print(f"[❌ 잔액 조회 실패]: {e}")
-            self.save_error_log(str(e))
-        finally:
-            self.tr_event_loop.exit()
+        """TR 데이터 수신 이벤트 (스케줄러 요청 ID 로 라우팅)"""
+        self.tr_scheduler.handle(screen_no, rqname, trcode, recordname, prev_next)
+
+    def handle_balance(self, request, trcode, rqname, prev_next):
+        """잔고 조회 페이지 수신 (예수금 + 보유 종목 – 멀티 데이터는 GetCommDataEx 1회로 일괄 수신)"""
+        from tr_records import BALANCE_RECORD, parse_balance
+
+        if request.page == 1:
+            cash_raw = self.ocx.dynamicCall(
+                "GetCommData(QString, QString, int, QString)", trcode, rqname, 0, "출금가능금액"
+            ).strip()
+            request.context["cash"] = abs(int(cash_raw)) if cash_raw and cash_raw.lstrip('-').isdigit() else 0
+
+        data = self.ocx.dynamicCall("GetCommDataEx(QString, QString)", trcode, BALANCE_RECORD)
+        request.rows.extend(parse_balance(data))
+
+    def _on_balance_done(self, request):
+        """잔고 조회 완료 → 로컬 원장 보정 (미체결 주문이 있으면 다음 주기로 보류)"""
+        cash = request.context.get("cash", 0)
+        holdings = {code: (quantity, buy_price) for code, quantity, buy_price in request.rows}
+        if self.shard is not None:
+            # 다른 샤드가 맡은 종목은 제외, 계좌 현금은 0번 샤드만 코디네이터에 보정
+            holdings = {code: value for code, value in holdings.items() if code in self.target_stocks}
+        if self.order_manager.reconcile(cash, holdings, stale_after=self.order_timeout_sec or None):
+            self._ledger_dirty = False
+            self.position_risk.sync()
+            self.sweep_exits()   # 매입가 / 보유 종목이 바뀌었을 수 있으므로 보유 전 종목 다시 점검
+            if self.risk is not None:
+                self._sync_risk()
+                if self.risk.is_primary and not self.risk.reconcile_cash(cash):
+                    print("[⏸️ 다른 샤드 미체결 주문 존재 → 계좌 현금 보정 보류]")
+            print(f"[💰 원장 보정 완료] 주문 가능 금액: {self.available_cash:,}원 / 보유 {len(holdings)}종목")
+        else:
+            print("[⏸️ 미체결 주문 존재 → 원장 보정 보류]")
+        self._on_first_balance()
+
+    def _reconcile_if_active(self):
+        """주기적 잔고 보정 (직전 보정 이후 주문 / 체결이 없으면 건너뜀 – 장 시작 준비 / 장 마감 후에는 항상 조회)"""
+        if self._ledger_dirty:
+            self.check_balance()
+
+    def _expire_orders(self):
+        """응답이 끊긴 주문 / 잔량이 남은 부분 체결을 정리 (order_timeout_sec 경과) → 정리했으면 잔고 조회로 원장 보정"""
+        if self.order_manager.open_order_count and self.order_manager.expire(self.order_timeout_sec):
+            if self.risk is not None:
+                self._sync_risk()
+            self._ledger_dirty = True
+            self.check_balance()
+
+    def _on_order_expired(self, order):
+        """미체결 주문 시간 초과 정리 1건 → 매매 저널 기록 (주문 관리자 콜백)"""
+        side = "매도" if order.side == SELL else "매수"
+        self.journal.record(CANCEL, order.code, side, order.quantity - order.filled_qty, order.est_price,
+                            order.order_no, "시간 초과")
+        self.log.warning("order_expired", f"[⏰ 미체결 주문 정리] {order.code} {side} "
+                         f"{order.quantity - order.filled_qty}주 (주문번호 {order.order_no or '미수신'}, {order.state})",
+                         code=order.code, order_no=order.order_no)
+
+    def _on_balance_error(self, request, reason):
+        """잔고 조회 재시도 초과 (원장 보정은 다음 주기로)"""
+        self.save_error_log(f"잔고 조회 실패: {reason}")
+        self._on_first_balance()
+
+    def _on_first_balance(self):
+        """스냅샷 복원 후 첫 잔고 조회가 끝나면 보류했던 실시간 감시 시작"""
+        if self._awaiting_balance:
+            self._awaiting_balance = False
+            self._start_monitoring_when_ready()
 
 # -----------------------------------
 # 🔵 5. 관심 종목 일봉 데이터 요청
 # -----------------------------------
     def request_daily_chart(self, code):
-        """특정 종목 코드에 대해 일봉 데이터 요청"""
+        """
+        특정 종목 코드에 대해 일봉 데이터 요청 (TR 스케줄러 등록)
+        - 캐시가 있으면 마지막 캐시 일자 이후 봉이 나올 때까지만 연속조회
+        - 캐시가 없으면 daily_history_pages 페이지까지 연속조회
+        """
         print(f"[📈 {code}] 일봉 데이터 요청")
-        self.current_screen_no += 1
-        screen_no = str(self.current_screen_no)
-        self.screen_by_code[code] = screen_no
-
-        today = datetime.now().strftime("%Y%m%d")
-        self.ocx.dynamicCall("SetInputValue(QString, QString)", "종목코드", code)
-        self.ocx.dynamicCall("SetInputValue(QString, QString)", "기준일자", today)
-        self.ocx.dynamicCall("SetInputValue(QString, QString)", "수정주가구분", "1")
-        self.ocx.dynamicCall("CommRqData(QString, QString, int, QString)", "opt10081_req", "opt10081", 0, screen_no)
-        self.tr_event_loop = QEventLoop()
-        self.tr_event_loop.exec_()
+        today = self.ocx.now().strftime("%Y%m%d")
+        self.tr_scheduler.submit(
+            "opt10081",
+            [("종목코드", code), ("기준일자", today), ("수정주가구분", "1")],
+            None,   # 화면번호는 전송 시 화면번호 관리자에서 빌리고 연속조회가 끝나면 반납
+            on_page=self.handle_daily_chart,
+            on_done=self._on_daily_chart_done,
+            on_error=self._on_daily_chart_error,
+            context=code,
+            max_pages=self.daily_history_pages,
+        )
 
 # -----------------------------------
 # 🔵 6. 일봉 데이터 수신 및 분석
 # -----------------------------------
-    def handle_daily_chart(self, trcode, rqname, screen_no):
-        """서버로부터 받은 일봉 데이터 처리 (MACD, EMA, 5일 이평선 계산)"""
-        print(f"[📥 {screen_no}] 일봉 데이터 수신 처리 시작")
-
-        try:
-            count = self.ocx.dynamicCall("GetRepeatCnt(QString, QString)", trcode, rqname)
-            closes = []
-
-            # 종가 데이터 수집
-            for i in range(count):
-                close = self.ocx.dynamicCall(
-                    "GetCommData(QString, QString, int, QString)", trcode, rqname, i, "현재가"
-                ).strip()
-                if close and close.lstrip('-').isdigit():
-                    closes.append(abs(int(close)))
-
-            if len(closes) < 50:
-                print(f"[⚠️ {screen_no}] 데이터 부족: {len(closes)}개 → 종목 제외")
-                self.tr_event_loop.exit()
-                return
-
-            closes.reverse()  # 최신순 → 과거순 변환
-            closes = pd.Series(closes)
-
-            # 기술적 지표 계산
-            ema5 = closes.ewm(span=5, adjust=False).mean()
-            ema12 = closes.ewm(span=12, adjust=False).mean()
-            ema26 = closes.ewm(span=26, adjust=False).mean()
-            macd_line = ema12 - ema26
-            signal_line = macd_line.ewm(span=9, adjust=False).mean()
-
-            code = [k for k, v in self.screen_by_code.items() if v == screen_no][0]
+    def handle_daily_chart(self, request, trcode, rqname, prev_next):
+        """
+        일봉 데이터 페이지 수신 → request.rows 에 페이지별 OHLCV 구조화 배열 (최신 → 과거)
+        - GetCommDataEx 1회로 페이지 전체를 받아 NumPy 로 일괄 변환 (행 / 필드별 GetCommData 호출 없음)
+        """
+        from tr_records import DAILY_CHART_RECORD, parse_daily_chart
+
+        code = request.context
+        print(f"[📥 {code}] 일봉 데이터 {request.page}페이지 수신 처리 시작")
+        bars = parse_daily_chart(self.ocx.dynamicCall("GetCommDataEx(QString, QString)", trcode, DAILY_CHART_RECORD))
+
+        # 첫 페이지 첫 행(최신)이 오늘 날짜면 장중 잠정 봉으로 분리
+        if request.page == 1 and len(bars) and bars["date"][0] == int(self.ocx.now().strftime("%Y%m%d")):
+            self.today_closes[code] = float(bars["close"][0])
+            bars = bars[1:]
+
+        if len(bars):
+            request.rows.append(bars)
+
+        # 캐시 마지막 일자까지 받았으면 연속조회 중단
+        last_cached = self.candle_cache.last_date(code) if self.candle_cache else None
+        if last_cached and len(bars) and bars["date"][-1] <= int(last_cached):
+            return False
+        return True
+
+    def _on_daily_chart_done(self, request):
+        """연속조회 완료 → 캐시 갱신 후 확정 봉 저장 (지표는 recompute_indicators 에서 일괄 계산)"""
+        import numpy as np
+        from candle_cache import CANDLE_DTYPE
+
+        code = request.context
+        # 페이지 연결 후 최신순 → 과거순 변환
+        rows = np.concatenate(request.rows)[::-1] if request.rows else np.empty(0, dtype=CANDLE_DTYPE)
+
+        if self.candle_cache:
+            cached = self.candle_cache.load(code)
+            if len(cached):
+                last_date, last_close = int(cached["date"][-1]), int(cached["close"][-1])
+                del cached  # memmap 해제 (Windows 파일 삭제 대비)
+                overlap = rows["close"][rows["date"] == last_date]
+                if not len(overlap) or overlap[0] != last_close:
+                    # 수정주가 변경(액면분할 등) 또는 캐시 이후 공백 → 캐시 폐기 후 전체 재조회
+                    print(f"[♻️ {code}] 일봉 캐시 불일치 (수정주가 변경/공백) → 전체 재조회")
+                    self.candle_cache.invalidate(code)
+                    self.request_daily_chart(code)
+                    return
+
+            added = self.candle_cache.append(code, rows)
+            bars = self.candle_cache.load(code)
+            closes = bars["close"][-self.bar_store.capacity:].astype(float)
+            print(f"[💾 {code}] 일봉 캐시 {added}봉 추가 / 총 {len(bars)}봉")
+            del bars
+        else:
+            closes = rows["close"].astype(float)
 
-            # 종목별 데이터 저장
-            self.macd_data[code] = {
-                "ema5": ema5,
-                "macd": macd_line,
-                "signal": signal_line,
-                "closes": closes
-            }
+        if len(closes) < MIN_HISTORY_BARS:
+            print(f"[⚠️ {code}] 데이터 부족: {len(closes)}개 → 종목 제외")
+            self.today_closes.pop(code, None)
+        else:
+            self.daily_closes[code] = closes
             self.daily_data_success = True  # 일봉 데이터 수신 성공 기록
 
-        except Exception as e:
-            self.save_error_log(str(e))
-            print(f"[❌ 일봉 데이터 처리 실패]: {e}")
-            self.daily_data_success = False  # 실패 기록
-        finally:
-            self.tr_event_loop.exit()
-
-# -----------------------------------
-# 🔵 7. 실시간 체결 감시 등록
-# -----------------------------------
-    def start_real_time_monitoring(self):
-        """관심 종목에 대해 실시간 체결 감시 등록 (10개씩 나눠서 등록)"""
-        print("[📡 실시간 체결 감시 등록 시작]")
+        self._finish_daily_chart(code)
 
-        fids = "10"  # 체결가격 FID
-        codes_list = list(self.target_stocks.keys())
-        batch_size = 10  # 한 번에 10종목씩 등록
-        self.real_time_success = True
+    def _on_daily_chart_error(self, request, reason):
+        """일봉 요청 재시도 초과"""
+        self.save_error_log(f"{request.context} 일봉 데이터 처리 실패: {reason}")
+        print(f"[❌ 일봉 데이터 처리 실패]: {request.context} / {reason}")
+        self.daily_data_success = False  # 실패 기록
+        self._finish_daily_chart(request.context)
 
-        for idx in range(0, len(codes_list), batch_size):
-            batch_codes = codes_list[idx:idx + batch_size]
-            code_str = ";".join(batch_codes)
-            screen_no = str(5000 + idx // batch_size)
+    def _finish_daily_chart(self, code):
+        """모든 종목의 일봉 수신이 끝나면 지표 일괄 계산 후 실시간 감시 시작"""
+        self.pending_daily_codes.discard(code)
+        if self.pending_daily_codes:
+            return
 
-            try:
-                self.ocx.dynamicCall(
-                    "SetRealReg(QString, QString, QString, QString)",
-                    screen_no, code_str, fids, "0"
-                )
-                print(f"[✅ 실시간 등록 완료] 화면번호 {screen_no} → 종목 {batch_codes}")
-            except Exception as e:
-                self.save_error_log(str(e))
-                print(f"[⚠️ 실시간 등록 실패]: {e}")
-                self.real_time_success = False
-
-# -----------------------------------
-# 🔵 8. 매수 조건 판단
-# -----------------------------------
-    def predict_trading(self, code):
-        """성공/실패 상황에 따라 매수 전략 선택"""
-        print(f"[⚙️ {code}] 매수 전략 판단 시작")
-
-        # 일봉+실시간 데이터가 모두 성공한 경우 → 기존 MACD 전략 사용
-        if self.daily_data_success and self.real_time_success:
-            self.predict_by_macd_strategy(code)
-        else:
-            # 실패 시 → 5일 이평선 돌파 전략 사용
-            self.predict_by_ema5_breakout(code)
+        # 전 종목 지표 일괄 계산
+        self.recompute_indicators()
+        print(f"[💾 일봉 저장소] {len(self.bar_store)}종목 / {self.bar_store.memory_usage() / 1024:,.1f} KB")
 
-    def predict_by_macd_strategy(self, code):
-        """MACD + Signal Line 전략"""
-        print(f"[🔵 {code}] MACD 전략 적용")
+        # 실시간 체결 감시 시작
+        self._start_monitoring_when_ready()
 
-        data = self.macd_data.get(code)
-        if not data:
-            print(f"[⚠️ {code}] 데이터 없음")
+    def _start_monitoring_when_ready(self):
+        """일봉 수신이 모두 끝나고, 스냅샷을 복원했다면 첫 잔고 보정까지 끝난 뒤 실시간 감시 시작"""
+        if self.pending_daily_codes or self._awaiting_balance:
             return
+        self.start_real_time_monitoring()
 
-        macd_now = data["macd"].iloc[-1]
-        macd_prev = data["macd"].iloc[-2]
-        signal_now = data["signal"].iloc[-1]
-        signal_prev = data["signal"].iloc[-2]
-
-        is_golden_cross = macd_prev < signal_prev and macd_now > signal_now
+    def recompute_indicators(self, codes=None):
+        """
+        수신한 종목 전체의 지표를 (종목 × 봉) 행렬로 한 번에 계산
+        - 일봉 저장소 적재 + 증분 지표 엔진 초기화
+        - 장 시작 전 / 설정 변경 후 재계산에도 사용
+        """
+        codes = [c for c in (codes or self.daily_closes) if c in self.daily_closes]
+        if not codes:
+            return None
+
+        start = datetime.now()
+        close_lists = [self.daily_closes[code] for code in codes]
+        matrix = closes_to_matrix(close_lists, max_bars=self.bar_store.capacity)
+        result = compute_macd_matrix(matrix)
+
+        for row, code in enumerate(codes):
+            n = min(len(close_lists[row]), matrix.shape[1])
+            self.bar_store.load(code, **{
+                "close": matrix[row, -n:],
+                **{name: result[name][row, -n:] for name in ("ema5", "ema12", "ema26", "macd", "signal")},
+            })
+            self._seed_indicators(code)
+            if code in self.today_closes:
+                self.indicators.update(code, self.today_closes[code])
+
+        elapsed_ms = (datetime.now() - start).total_seconds() * 1000
+        print(f"[🧮 지표 일괄 계산] {len(codes)}종목 / 골든크로스 후보 {int(result['buy_candidates'].sum())}종목 / {elapsed_ms:.1f}ms")
+        return dict(result, codes=codes)
+
+    def _seed_indicators(self, code):
+        """일봉 저장소의 마지막 확정 봉으로 증분 지표 엔진 초기화"""
+        value = self.bar_store.value
+        self.indicators.seed(
+            code, value(code, "close"), value(code, "ema5"), value(code, "ema12"), value(code, "ema26"),
+            value(code, "signal"), value(code, "macd", -2), value(code, "signal", -2)
+        )
 
-        if is_golden_cross:
-            print(f"[🌟 {code}] MACD 골든크로스 감지 → 매수 시도")
-            self.try_buy(code)
-        else:
-            print(f"[⚪ {code}] MACD 골든크로스 없음 → 매수 보류")
+    def commit_daily_bars(self):
+        """장 마감: 오늘 잠정 봉을 지표 엔진, 일봉 저장소, 확정 일봉 종가에 확정"""
+        import numpy as np
+
+        print("[📌 장 마감] 오늘 봉 지표 확정")
+        for code in self.indicators.commit_all():
+            state = self.indicators.get(code)
+            if code in self.daily_closes:
+                self.daily_closes[code] = np.append(self.daily_closes[code], state.close)
+            self.today_closes.pop(code, None)
+            self.bar_store.append(
+                code, close=state.close, ema5=state.ema5, ema12=state.ema12,
+                ema26=state.ema26, macd=state.macd, signal=state.signal
+            )
+        self.daily_bar_committed = True
 
-    def predict_by_ema5_breakout(self, code):
-        """5일 이평선 돌파 전략"""
-        print(f"[🟡 {code}] 5일 이평선 돌파 전략 적용")
+# -----------------------------------
+# 🔵 7. 실시간 체결 감시 등록
+# -----------------------------------
+    def start_real_time_monitoring(self):
+        """
+        관심 종목 실시간 체결 감시 등록 (이미 등록된 종목은 건너뜀)
+        - 화면당 최대 codes_per_screen 종목씩 채워 최소 화면 수로 등록 (FID: real_fids)
+        """
+        print("[📡 실시간 체결 감시 등록 시작]")
+        codes = list(self.target_stocks)
+        try:
+            self.screens.add_real(codes)
+            self.real_time_success = all(code in self.screens for code in codes)
+        except Exception as e:
+            self.save_error_log(str(e))
+            print(f"[⚠️ 실시간 등록 실패]: {e}")
+            self.real_time_success = False
 
-        data = self.macd_data.get(code)
-        if not data:
-            print(f"[⚠️ {code}] 데이터 없음")
-            return
+    def add_target_stocks(self, stocks):
+        """
+        장중 관심 종목 추가 {코드: 이름} → 일봉 조회 후 지표 계산이 끝나면 실시간 등록 (기존 종목은 재등록하지 않음)
+        """
+        new_codes = [code for code in stocks if code not in self.target_stocks]
+        if not new_codes:
+            return []
+        for code in new_codes:
+            self.target_stocks[code] = stocks[code]
+        print(f"[➕ 관심 종목 추가] {new_codes}")
+        self.pending_daily_codes.update(new_codes)
+        for code in new_codes:
+            self.request_daily_chart(code)
+        return new_codes
 
-        close_today = data["closes"].iloc[-1]
-        ema5_today = data["ema5"].iloc[-1]
+    def remove_target_stocks(self, codes):
+        """
+        장중 관심 종목 제외 → 실시간 해제 (보유 중인 종목은 매도 감시를 위해 등록 유지, 매수만 중단)
+        """
+        removed = [code for code in codes if self.target_stocks.pop(code, None) is not None]
+        self.pending_daily_codes.difference_update(removed)
+        self.screens.remove_real([code for code in removed if code not in self.own_stocks])
+        if removed:
+            print(f"[➖ 관심 종목 제외] {removed}")
+        return removed
 
-        # 오늘 종가가 5일 이평선 돌파
-        if close_today > ema5_today:
-            print(f"[🌟 {code}] 종가 5일선 돌파 감지 → 매수 시도")
-            self.try_buy(code)
-        else:
-            print(f"[⚪ {code}] 5일선 돌파 아님 → 매수 보류")
+# -----------------------------------
+# 🔵 8. 매수 / 매도 조건 판단 (전략 플러그인)
+# -----------------------------------
+    def _evaluate_batch(self, batch):
+        """
+        종목 묶음 평가 [(종목코드, 최신가, 구간 고가, 구간 저가), ...] (즉시 평가는 1종목, 결정 루프는 병합된 전 종목)
+        - 지표 엔진에 최신가 반영 → 미보유 관심 종목(매도 전략이 있으면 보유 종목도)을 전략 플러그인으로 한 번에 판단
+        - 일봉 + 실시간 등록이 모두 성공했으면 종목 그룹별 전략, 아니면 fallback 전략 ([STRATEGY])
+        - 묶음 순서대로 보유 종목은 매도 판단, 매수 신호 종목은 매수 시도
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter_ns()
+
+        own, targets, indicators = self.own_stocks, self.target_stocks, self.indicators
+        strategy_sell = self.strategies.has_sell
+        codes, prices, highs, lows, held = [], [], [], [], []
+        for code, price, high, low in batch:
+            if not indicators.update(code, price):
+                if code not in own and code in targets:
+                    self.log.warning("no_data", f"[⚠️ {code}] 데이터 없음", code=code, sample=True)
+                continue
+            is_held = code in own
+            if (strategy_sell and is_held) or (not is_held and code in targets):
+                codes.append(code)
+                prices.append(price)
+                highs.append(high)
+                lows.append(low)
+                held.append(is_held)
+
+        buys = sells = {}
+        if codes:
+            import numpy as np
+
+            arrays = indicators.batch(codes, prices)
+            arrays.update(high=np.array(highs, dtype=np.float64), low=np.array(lows, dtype=np.float64),
+                          held=np.array(held, dtype=bool))
+            fallback = not (self.daily_data_success and self.real_time_success)
+            buys, sells = self.strategies.evaluate(StrategyView(arrays, self._tick_store), fallback=fallback)
+
+        for code, price, high, low in batch:
+            if code in own:
+                # 보유한 종목 → 평가손익 갱신 후 매도 판단
+                self.pnl.mark(code, price)
+                self.try_sell(code, price, high, strategy=sells.get(code))
+            elif code in buys:
+                # 보유 안 한 관심 종목 → 매수 신호면 매수 시도 (장중 제외한 종목은 매수하지 않음)
+                self.log.info("buy_signal", f"[🌟 {code}] 매수 신호 ({buys[code]}) → 매수 시도", code=code,
+                              strategy=buys[code])
+                self.try_buy(code)
+
+        if metrics is not None:
+            self._latency_evaluate.record(perf_counter_ns() - start)
 
     def _on_receive_real_data(self, code, real_type, real_data):
         """실시간 체결 데이터 수신 이벤트"""
         if real_type != "주식체결":
             return
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter_ns()
 
         try:
             price_raw = self.ocx.dynamicCall("GetCommRealData(QString, int)", code, 10).strip()
             price = abs(int(price_raw))
         except (ValueError, AttributeError) as e:
-            print(f"[❌ 실시간 데이터 변환 에러] 종목: {code} / 에러: {e}")
+            self.log.warning("real_data_error", f"[❌ 실시간 데이터 변환 에러] 종목: {code} / 에러: {e}", code=code,
+                             sample=True)
             return
 
-        if code not in self.own_stocks:
-            # 보유 안 한 종목 → 매수 판단
-            self.predict_trading(code)
+        if self._tick_config is not None:
+            self._record_tick(code, price)
+
+        if metrics is not None:
+            self._latency_real_data.record(perf_counter_ns() - start)
+            self._tick_arrival[code] = start
+
+        if not self.trading_active:
+            # 동시호가 / 장 마감 후: 최신가만 남기고 판단하지 않음 (정규장 시작 / 장 마감 시 반영)
+            self.coalescer.push(code, price)
+        elif self.decision_interval_ms <= 0 or (self.sell_bypass_coalescing and code in self.own_stocks):
+            # 병합 없이 즉시 평가 (보유 종목 손절/익절 체크 우선)
+            self.coalescer.record_bypass()
+            self._evaluate_tick(code, price, price)
         else:
-            # 보유한 종목 → 매도 판단
-            self.try_sell(code, price)
+            # 최신가/고가/저가만 남기고 결정 루프에서 일괄 평가
+            self.coalescer.push(code, price)
+
+    def _record_tick(self, code, price):
+        """등록한 FID 를 읽어 틱 저장소에 기록 (등록하지 않은 FID 는 0, 체결시간이 없으면 현재 시각)"""
+        get = self.ocx.dynamicCall
+        t = None
+        if self._tick_time_fid:
+            raw = get("GetCommRealData(QString, int)", code, 20).strip()
+            if raw.isdigit():
+                hhmmss = int(raw)
+                t = hhmmss // 10000 * 3600 + hhmmss // 100 % 100 * 60 + hhmmss % 100
+        if t is None:
+            now = self.ocx.now()
+            t = now.hour * 3600 + now.minute * 60 + now.second
+
+        values = []
+        for fid in self._tick_extra_fids:
+            if fid is None:
+                values.append(0)
+                continue
+            try:
+                values.append(int(get("GetCommRealData(QString, int)", code, fid).strip() or 0))
+            except ValueError:
+                values.append(0)
+        volume, cum_volume, ask, bid = values
+        self.tick_store.append(code, t, price, volume, abs(cum_volume), abs(ask), abs(bid))
+
+    def _run_decision_loop(self):
+        """결정 루프: 직전 주기 이후 가격이 바뀐 종목만 한 묶음으로 평가"""
+        batch = self.coalescer.drain()
+        if not batch:
+            return
+        if self.metrics is not None:
+            start = perf_counter_ns()
+        self._evaluate_batch(batch)
+        if self.metrics is not None:
+            self._latency_decision.record(perf_counter_ns() - start)
+
+    def _evaluate_tick(self, code, price, high):
+        """종목 1개 즉시 평가 (병합 없이 틱마다 / 보유 종목 매도 우선 체크)"""
+        self._evaluate_batch(((code, price, high, price),))
 
     def _on_receive_chejan_data(self, gubun, item_cnt, fid_list):
         """체결/잔고 데이터 수신 이벤트"""
-        print(f"[📩 체결 데이터 수신] 구분: {gubun} / 항목 수: {item_cnt}")
-
-        if gubun == "0":  # 0: 주문체결
-            code = self.ocx.dynamicCall("GetChejanData(int)", 9001).strip()  # 종목코드
-            order_status = self.ocx.dynamicCall("GetChejanData(int)", 913).strip()  # 주문상태
-            filled_qty = self.ocx.dynamicCall("GetChejanData(int)", 911).strip()  # 체결수량
-            price = self.ocx.dynamicCall("GetChejanData(int)", 910).strip()  # 체결가격
-            print(f"[체결완료] {code} / 상태: {order_status} / 체결수량: {filled_qty} / 체결가격: {price}")
-
-    def check_market_status(self):
-        """장 종료 감지 후 프로그램 종료"""
-        now = datetime.now().time()
-        if now < dtime(8, 0) or now > dtime(18, 0):
+        if self.metrics is not None:
+            start = perf_counter_ns()
+        self.log.debug("chejan", gubun=gubun, item_cnt=item_cnt)
+        self._ledger_dirty = True
+
+        if gubun == "0":  # 0: 주문체결 → 주문 상태 머신 / 로컬 원장 갱신
+            fields = {
+                fid: self.ocx.dynamicCall("GetChejanData(int)", fid).strip()
+                for fid in (9203, 904, 9001, 913, 905, 907, 900, 902, 910, 911, 914, 915)
+            }
+            order = self.order_manager.on_chejan(fields)
+            if self.risk is not None:
+                self._sync_risk()
+            if order is not None and not order.is_open and fields[913] in ("거부", "취소", "확인"):
+                self.journal.record(REJECT if fields[913] == "거부" else CANCEL, order.code,
+                                    "매도" if order.side == SELL else "매수", order.quantity - order.filled_qty,
+                                    order.est_price, order.order_no, fields[913])
+            self.log.info(
+                "order_event",
+                f"[체결완료] {fields[9001]} / 상태: {fields[913]} / 체결수량: {fields[911]} / 체결가격: {fields[910]}"
+                + (f" / 주문 {order.order_no}: {order.state}" if order else ""),
+                code=fields[9001].lstrip('A'), status=fields[913], filled=fields[911], price=fields[910],
+                order_no=order.order_no if order else None,
+            )
+        if self.metrics is not None:
+            self._latency_chejan.record(perf_counter_ns() - start)
+
+    def _on_receive_msg(self, screen_no, rqname, trcode, msg):
+        """
+        서버 메시지 수신 이벤트
+        - 주문 거부가 체결 이벤트 없이 메시지로만 오는 경우(예: 모의투자 증거금 부족) 해당 주문을 거부 처리
+        """
+        self.log.debug("msg", msg, screen_no=screen_no, rqname=rqname, trcode=trcode)
+        order = self.order_manager.on_msg(screen_no, rqname, msg)
+        if order is None:
+            return
+        if self.risk is not None:
+            self._sync_risk()
+        side = "매도" if order.side == SELL else "매수"
+        self.journal.record(REJECT, order.code, side, order.quantity, order.est_price, None, msg)
+        self.log.error("order_rejected", f"[❌ 주문 거부] {order.code} {side} {order.quantity}주: {msg}",
+                       code=order.code, msg=msg)
+
+    def _on_fill(self, order, quantity, price):
+        """체결 1건 → 매매 저널 기록 + 손익 갱신 (주문 관리자 콜백)"""
+        self.pnl.on_fill(order.code, order.side, quantity, price)
+        self.position_risk.refresh(order.code)
+        if self.risk is not None:
+            self.risk.record_fill(order.side == BUY, quantity * price)
+        self.journal.record(FILL, order.code, "매도" if order.side == SELL else "매수", quantity, price,
+                            order.order_no, order.state)
+
+    def _on_session_phase(self, phase, previous):
+        """
+        장 운영 구간 전환 (SessionScheduler 콜백)
+        - 새 거래일의 첫 구간: 장 시작 준비 (warm_up)
+        - 정규장(동시호가 중지를 끄면 동시호가 포함)에만 결정 루프 / 잔고 보정 타이머 작동
+        - 장 마감: 동시호가 동안 모인 최신가 반영 후 오늘 봉 확정, 잔고 조회
+        - 장 종료: 자동 재시작이면 당일 마무리 후 다음 거래일까지 대기, 아니면 프로그램 종료
+        """
+        print(f"[🕘 장 운영 구간] {PHASE_NAMES.get(previous, '시작')} → {PHASE_NAMES[phase]} "
+              f"(다음 전환 {self.session.next_change:%m-%d %H:%M})")
+        today = self.ocx.now().date()
+        if phase != CLOSED and self._session_day != today:
+            self.warm_up()
+
+        self._set_trading(phase == CONTINUOUS or (phase in AUCTION_PHASES and not self.pause_in_auction))
+
+        if phase in (AFTER_HOURS, CLOSED) and previous in TRADING_PHASES and not self.daily_bar_committed:
+            for code, price, _, _ in self.coalescer.drain():
+                self.indicators.update(code, price)
+            self.commit_daily_bars()
+            self.check_balance()
+
+        if phase == CLOSED:
+            self.snapshot_timer.stop()
+            if previous is not None:
+                self.end_session()
+        elif self.snapshot_path and self.snapshot_interval_sec > 0 and not self.snapshot_timer.isActive():
+            self.snapshot_timer.start(int(self.snapshot_interval_sec * 1000))  # 주기적 상태 스냅샷
+
+    def _set_trading(self, active):
+        """매매 판단 시작 / 중지 (중지 중 틱은 병합기에 최신가만 남김)"""
+        if active == self.trading_active:
+            return
+        self.trading_active = active
+        if active:
+            if self.decision_interval_ms > 0:
+                self.decision_timer.start(self.decision_interval_ms)  # 병합된 틱 평가 주기
+            self.balance_timer.start(self.reconcile_interval_min * 60 * 1000)  # 주기적 잔고 보정
+            if self.order_timeout_sec > 0:
+                self.order_timer.start(int(self.order_timeout_sec * 1000))     # 미체결 주문 정리
+            self._run_decision_loop()   # 중지 중 바뀐 최신가 평가
+        else:
+            self.decision_timer.stop()
+            self.balance_timer.stop()
+            self.order_timer.stop()
+
+    def warm_up(self):
+        """
+        장 시작 전 준비 (새 거래일, 프로세스 재시작 없이 다음 세션으로)
+        - 오늘 봉 상태 초기화 → 일봉 캐시 공백 보충 (마지막 캐시 일자 이후 봉만 조회) → 지표 일괄 재계산 → 실시간 등록 확인
+        - 잔고 조회로 원장 보정, 틱 저장소는 새 일자 폴더로
+        """
+        today = self.ocx.now().date()
+        print(f"[🌅 장 시작 준비] {today} – 일봉 보충 / 지표 계산 / 잔고 조회")
+        self._session_day = today
+        self.daily_bar_committed = False
+        self.today_closes.clear()
+        self._tick_store = None
+        self.check_balance()
+        codes = list(self.target_stocks)
+        self.pending_daily_codes = set(codes)
+        for code in codes:
+            self.request_daily_chart(code)
+
+    def end_session(self):
+        """장 종료: 자동 재시작이 아니면 프로그램 종료, 맞으면 당일 마무리 (틱 저장, 저널 커밋, 리포트, 스냅샷) 후 대기"""
+        if not self.restart_after_close:
             print("[🚪 장 종료 감지] 프로그램 종료 시작")
             self.shutdown()
+            return
+        self._spill_tick_store()
+        self.save_trade_log()
+        self.draw_profit_graph()
+        if self.snapshot_path:
+            self.save_snapshot()
+        next_day = self.calendar.next_trading_day(self.ocx.now().date())
+        print(f"[🌙 장 종료] 다음 거래일 {next_day} 장 시작 준비까지 대기 (프로세스 유지)")
 
 
 # -----------------------------------
 # 🔵 9. 매수 실행 (분할 매수 + 투자비율 제한)
 # -----------------------------------
     def try_buy(self, code):
-        """실제 매수 실행 (분할 매수 + 종목당 투자비율 제한)"""
-        if code in self.own_stocks:
-            print(f"[🚫 {code}] 이미 보유 중 → 추가 매수 금지")
+        """실제 매수 실행 (분할 매수 + 종목당 투자비율 제한, 보유 반영은 체결 이벤트에서)"""
+        if code in self.own_stocks or self.order_manager.has_open_order(code):
+            self.log.debug("buy_skip", f"[🚫 {code}] 이미 보유/주문 중 → 추가 매수 금지", code=code, sample=True)
             return
 
         # 현재가 조회
@@ -345,114 +952,154 @@ class Kiwoom:
 
         # 투자 금액 계산
         if self.available_cash < price:
-            print(f"[⚠️ {code}] 잔액 부족 → 매수 불가")
+            self.log.info("buy_skip", f"[⚠️ {code}] 잔액 부족 → 매수 불가", code=code, sample=True)
             return
 
         max_invest_amount = self.available_cash * (self.max_stock_ratio / 100)
         split_amount = max_invest_amount / self.buy_split_count
 
-        print(f"[🛒 {code}] 최대 {max_invest_amount:,.0f}원 / 1회 {split_amount:,.0f}원 매수 시작")
+        self.log.info("buy_start", f"[🛒 {code}] 최대 {max_invest_amount:,.0f}원 / 1회 {split_amount:,.0f}원 매수 시작",
+                      code=code, max_invest=max_invest_amount, split=split_amount)
 
+        # 회차별 수량 (잔액 부족 회차는 중단, 수량 0 회차는 제외 – 백테스트와 같은 규칙)
+        quantities = split_buy_quantities(self.available_cash, price, self.max_stock_ratio, self.buy_split_count)
         total_quantity = 0
 
-        for i in range(self.buy_split_count):
-            if self.available_cash < split_amount:
-                print(f"[⚠️ {code}] 잔액 부족 → {i+1}회차 중단")
-                break
-
-            quantity = int(split_amount // price)
-            if quantity < 1:
-                print(f"[⚠️ {code}] {i+1}회차 매수 실패 (수량 0)")
-                continue
-
-            self.send_order(code, 1, quantity)
-            self.available_cash -= quantity * price
-            total_quantity += quantity
+        # 보유 종목 수 한도 (샤드 모드: 코디네이터에서 계좌 전체 현금 / 종목 수를 원자적으로 확인 후 예약)
+        if self.risk is not None:
+            if quantities and not self.risk.reserve(sum(quantities) * price):
+                self.log.info("buy_skip", f"[⚠️ {code}] 계좌 현금 / 보유 종목 한도 초과 → 매수 불가", code=code,
+                              sample=True)
+                return
+        elif self.max_holding_count and len(self.order_manager.holding_codes()) >= self.max_holding_count:
+            self.log.info("buy_skip", f"[⚠️ {code}] 최대 보유 종목 수 도달 → 매수 불가", code=code, sample=True)
+            return
 
-            print(f"[🛒 {code}] {i+1}회차 {quantity}주 매수 완료")
+        for i, quantity in enumerate(quantities):
+            # 주문 성공 시 예상 금액만큼 현금 예약 (체결 시 실제 금액으로 정산)
+            if self.send_order(code, BUY, quantity, price):
+                total_quantity += quantity
+                self.log.info("buy_split", f"[🛒 {code}] {i+1}회차 {quantity}주 매수 주문", code=code, split_no=i + 1,
+                              quantity=quantity)
+        if self.risk is not None:
+            self._sync_risk()  # 예약분을 실제 접수된 주문 기준으로 보정
 
         if total_quantity > 0:
-            self.own_stocks[code] = {
-                "buy_price": price,
-                "quantity": total_quantity,
-                "highest_price": price
-            }
-            print(f"[✅ {code}] 총 {total_quantity}주 매수 완료")
+            self.log.info("buy_done", f"[✅ {code}] 총 {total_quantity}주 매수 주문 완료 (체결 시 보유 반영)", code=code,
+                          quantity=total_quantity)
         else:
-            print(f"[⚠️ {code}] 최종 매수 실패")
+            self.log.info("buy_fail", f"[⚠️ {code}] 최종 매수 실패", code=code)
 
 # -----------------------------------
 # 🔵 10. 매도 조건 체크 (손익/손절 우선)
 # -----------------------------------
-    def try_sell(self, code, current_price):
-        """매도 조건 체크 (손익 우선, 손절 우선)"""
-        stock = self.own_stocks.get(code)
-        if not stock:
-            print(f"[🚫 {code}] 보유하지 않음 → 매도 무시")
+    def try_sell(self, code, current_price, period_high=None, strategy=None):
+        """
+        매도 조건 체크 (익절 → 손절 → 트레일링 스탑 → 전략 매도 신호, period_high: 병합 구간 고가, strategy: 매도 신호를 낸 전략 라벨)
+        - 익절 / 손절 / 트레일링 스탑은 미리 계산해 둔 종목 기준 가격과 비교만 함 (PositionRisk)
+        """
+        if code not in self.position_risk:
+            self.log.debug("sell_skip", f"[🚫 {code}] 보유하지 않음 → 매도 무시", code=code, sample=True)
             return
+        if self.order_manager.has_open_order(code):
+            return  # 미체결 주문 처리 중
 
-        buy_price = stock['buy_price']
-        quantity = stock['quantity']
-        highest_price = stock['highest_price']
-
-        if current_price > highest_price:
-            stock['highest_price'] = current_price
-            highest_price = current_price
+        reason = self.position_risk.check(code, current_price, period_high)
+        if reason == EXIT_NONE and not strategy:
+            self.log.debug("hold", f"[⚪ {code}] 매도 조건 미충족", code=code, sample=True, price=current_price)
+            return
 
-        profit_rate = self.calculate_profit_rate(buy_price, current_price)
-        trailing_stop_price = highest_price * 0.97
+        stock = self.own_stocks[code]
+        quantity = stock['quantity']
+        rate = profit_rate(stock['buy_price'], current_price)
 
-        if profit_rate >= self.max_profit_rate:
-            print(f"[🚀 {code}] 목표 수익률 도달 → 매도")
-            self.show_alert(f"[익절] {code} 수익률 {profit_rate:.2f}% 도달!")
+        if reason == EXIT_TAKE_PROFIT:
+            self.log.info("sell_signal", f"[🚀 {code}] 목표 수익률 도달 → 매도", code=code, reason="take_profit",
+                          profit_rate=rate)
             self._sell_stock(code, quantity, current_price)
-        elif profit_rate <= self.max_loss_rate:
-            print(f"[🛑 {code}] 손절 기준 도달 → 매도")
-            self.show_alert(f"[손절] {code} 수익률 {profit_rate:.2f}% 도달!")
+            self.show_alert(f"[익절] {code} 수익률 {rate:.2f}% 도달!", key=code)
+        elif reason == EXIT_STOP_LOSS:
+            self.log.info("sell_signal", f"[🛑 {code}] 손절 기준 도달 → 매도", code=code, reason="stop_loss",
+                          profit_rate=rate)
             self._sell_stock(code, quantity, current_price)
-        elif current_price < trailing_stop_price:
-            print(f"[🚨 {code}] 트레일링 스탑 발동 → 매도")
-            self.show_alert(f"[트레일링 스탑] {code} 가격 하락 → 매도")
+            self.show_alert(f"[손절] {code} 수익률 {rate:.2f}% 도달!", key=code)
+        elif reason == EXIT_TRAILING_STOP:
+            self.log.info("sell_signal", f"[🚨 {code}] 트레일링 스탑 발동 → 매도", code=code, reason="trailing_stop",
+                          profit_rate=rate)
             self._sell_stock(code, quantity, current_price)
+            self.show_alert(f"[트레일링 스탑] {code} 가격 하락 → 매도", key=code)
         else:
-            print(f"[⚪ {code}] 매도 조건 미충족 (수익률 {profit_rate:.2f}%)")
+            self.log.info("sell_signal", f"[📉 {code}] 전략 매도 신호 ({strategy}) → 매도", code=code, reason="strategy",
+                          strategy=strategy, profit_rate=rate)
+            self._sell_stock(code, quantity, current_price)
+            self.show_alert(f"[전략 매도] {code} {strategy} 신호 (수익률 {rate:.2f}%)", key=code)
+
+    def sweep_exits(self, prices=None):
+        """
+        보유 전 종목 매도 기준 일괄 점검 (시가 갭 / 잔고 보정 후 재평가) → 매도 조건에 걸린 종목 수
+        - prices: {종목코드: 현재가}, 없으면 종목별 마지막 실시간 체결가
+        """
+        if prices is None:
+            prices = {code: p.last_price for code, p in self.pnl.positions.items() if p.quantity and p.last_price}
+        exits = self.position_risk.sweep(prices)
+        for code in exits:
+            self.try_sell(code, prices[code])
+        return len(exits)
 
 
 # -----------------------------------
 # 🔵 11. 실제 매도 실행
 # -----------------------------------
     def _sell_stock(self, code, quantity, price):
-        """매도 주문 실행 및 매매 기록"""
-        print(f"[📈 {code}] 매도 {quantity}주 @ {price}원")
-        self.send_order(code, 2, quantity)
-        self.record_trade(code, "매도", quantity, price)
-        self.own_stocks.pop(code, None)
-        self.check_balance()  # 매도 후 잔액 재조회
-        
+        """매도 주문 실행 및 매매 기록 (보유/현금 정리는 체결 이벤트에서)"""
+        self.log.info("sell", f"[📈 {code}] 매도 {quantity}주 @ {price}원", code=code, quantity=quantity, price=price)
+        if self.send_order(code, SELL, quantity, price):
+            self.record_trade(code, "매도", quantity, price)
+
     def record_trade(self, code, trade_type, quantity, price):
         """매매 기록 추가"""
-        date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        self.trade_log.append([date, code, trade_type, quantity, price])
-        print(f"[📝 매매 기록 추가] {date} / {code} / {trade_type} / {quantity}주 / {price}원")
+        date = self.ocx.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.journal.record(SALE, code, trade_type, quantity, price)
+        self.log.info("trade", f"[📝 매매 기록 추가] {date} / {code} / {trade_type} / {quantity}주 / {price}원", code=code,
+                      trade_type=trade_type, quantity=quantity, price=price)
 
 
 # -----------------------------------
 # 🔵 12. 주문 전송 함수 (공통)
 # -----------------------------------
-    def send_order(self, code, order_type, quantity):
-        """키움 서버에 주문 전송 (1: 매수, 2: 매도)"""
+    def send_order(self, code, order_type, quantity, est_price=0):
+        """키움 서버에 주문 전송 (1: 매수, 2: 매도) → 성공 시 주문 관리자에 등록 후 True"""
         order_type_str = 1 if order_type == 1 else 2  # 1: 신규매수, 2: 신규매도
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter_ns()
 
         res = self.ocx.dynamicCall(
             "SendOrder(QString, QString, QString, int, QString, int, int, QString, QString)",
-            "주문", "5000", self.account_number, order_type_str, code,
+            "주문", self.screens.order_screen, self.account_number, order_type_str, code,
             quantity, 0, "03", ""  # 03: 시장가 주문
         )
 
+        if metrics is not None:
+            now = perf_counter_ns()
+            metrics.observe("send_order", now - start)
+            arrival = self._tick_arrival.get(code)
+            if arrival is not None:
+                metrics.observe("tick_to_order", now - arrival, code)
+            metrics.inc("orders_sent_total" if res == 0 else "orders_rejected_total")
+
         if res == 0:
-            print(f"[✅ 주문 성공] {code} {quantity}주 {'매도' if order_type == 2 else '매수'}")
-        else:
-            print(f"[❌ 주문 실패] {code} (결과 코드: {res})")
+            self._ledger_dirty = True
+            self.order_manager.submit(code, order_type_str, quantity, est_price, self.screens.order_screen, "주문")
+            if self.risk is not None:
+                self.risk.record_order()
+            self.journal.record(ORDER, code, "매도" if order_type_str == 2 else "매수", quantity, est_price,
+                                detail="시장가")
+            self.log.info("order_sent", f"[✅ 주문 성공] {code} {quantity}주 {'매도' if order_type == 2 else '매수'}",
+                          code=code, side=order_type_str, quantity=quantity)
+            return True
+        self.log.error("order_fail", f"[❌ 주문 실패] {code} (결과 코드: {res})", code=code, result=res)
+        return False
 
 
 # -----------------------------------
@@ -460,110 +1107,56 @@ class Kiwoom:
 # -----------------------------------
     def calculate_profit_rate(self, buy_price, current_price):
         """수익률 계산 함수"""
-        try:
-            return ((current_price - buy_price) / buy_price) * 100
-        except ZeroDivisionError:
-            return 0
+        return profit_rate(buy_price, current_price)
 
 # -----------------------------------
-# 🔵 14. 매매 기록 저장 (엑셀로 저장)
+# 🔵 14. 매매 기록 저장 (매매 저널)
 # -----------------------------------
     def save_trade_log(self):
-        """매매 기록을 엑셀 파일로 저장"""
+        """매매 저널에 남은 기록 커밋 (엑셀/CSV 는 src/export_journal.py 로 오프라인 내보내기)"""
         print("[💾 매매 기록 저장 시도]")
-
-        # logs 폴더 자동 생성
-        log_dir = os.path.join(os.path.dirname(__file__), '..', 'logs')
-        os.makedirs(log_dir, exist_ok=True)
-
-        # 엑셀 워크북 생성
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Trade Log"
-
-        # 첫 번째 행 제목
-        ws.append(["날짜", "종목코드", "매매구분", "수량", "가격"])
-
-        # 매매 기록 추가
-        for log in self.trade_log:
-            ws.append(log)
-
-        # 파일 저장
-        file_path = os.path.join(log_dir, f"trade_log_{datetime.now().strftime('%Y%m%d')}.xlsx")
-        wb.save(file_path)
-
-        print(f"[✅ 매매 기록 저장 완료]: {file_path}")
+        if self.journal.flush():
+            print(f"[✅ 매매 기록 저장 완료]: {self.journal.path} ({self.journal.written:,}건)")
+        else:
+            print("[⚠️ 매매 저널 커밋 대기 시간 초과]")
 
 # -----------------------------------
 # 🔵 15. 수익률 그래프 저장
 # -----------------------------------
     def draw_profit_graph(self):
-        """매매 결과를 바탕으로 수익률 그래프를 그리고 저장"""
-        print("[📊 수익률 그래프 그리기 시작]")
-
-        # 매도한 거래만 집계
-        profits = [(log[0][:10], float(log[4])) for log in self.trade_log if log[2] == "매도"]
-
-        if not profits:
-            print("[⚠️ 수익 데이터 없음 → 그래프 생략]")
+        """오늘 손익 리포트 / 그래프를 별도 프로세스(src/report.py)로 생성 (종료를 기다리게 하지 않음)"""
+        if not self.report_on_shutdown:
             return
+        import subprocess
 
-        # 데이터프레임 생성
-        df = pd.DataFrame(profits, columns=["date", "profit"])
-        df_grouped = df.groupby("date").sum().reset_index()
-
-        plt.figure(figsize=(10, 6))
-        plt.plot(df_grouped['date'], df_grouped['profit'], marker='o', label='일별 수익')
-        plt.axhline(y=self.max_profit_rate, color='green', linestyle='--', label=f'익절 목표 {self.max_profit_rate}%')
-        plt.axhline(y=self.max_loss_rate, color='red', linestyle='--', label=f'손절 기준 {self.max_loss_rate}%')
-
-        plt.title('📈 일별 수익률 그래프')
-        plt.xlabel('날짜')
-        plt.ylabel('수익(원)')
-        plt.legend()
-        plt.grid(True)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        # 저장
-        graph_dir = os.path.join(os.path.dirname(__file__), '..', 'logs')
-        os.makedirs(graph_dir, exist_ok=True)
-        file_path = os.path.join(graph_dir, f"profit_graph_{datetime.now().strftime('%Y%m%d')}.png")
-        plt.savefig(file_path)
-
-        print(f"[✅ 수익률 그래프 저장 완료]: {file_path}")
+        script = os.path.join(os.path.dirname(__file__), '..', 'src', 'report.py')
+        today = self.ocx.now().strftime('%Y-%m-%d')
+        subprocess.Popen(
+            [sys.executable, script, "--db", self.journal.path, "--date", today],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        print(f"[📊 수익률 리포트 생성 요청] {today} (별도 프로세스)")
 
 # -----------------------------------
 # 🔵 16. 실시간 감시 해제
 # -----------------------------------
     def stop_real_time_monitoring(self):
-        """프로그램 종료 전 실시간 체결 감시 해제"""
+        """프로그램 종료 전 실시간 체결 감시 해제 (실시간 / TR / 주문 화면 전부)"""
         try:
-            self.ocx.dynamicCall("DisconnectRealData(QString)", "5000")
-            print("[🛑 실시간 체결 감시 해제 완료]")
+            count = self.screens.close()
+            print(f"[🛑 실시간 체결 감시 해제 완료] 화면 {count}개")
         except Exception as e:
             self.save_error_log(str(e))
             print(f"[⚠️ 실시간 감시 해제 중 에러]: {e}")
 
-    def show_alert(self, message):
-        """PyQt5 알림창"""
-        msg_box = QMessageBox()
-        msg_box.setIcon(QMessageBox.Information)
-        msg_box.setWindowTitle("📢 알림")
-        msg_box.setText(message)
-        msg_box.exec_()
-        
-    def save_error_log(self, error_message):
-        """에러 메시지를 파일로 저장"""
-        log_dir = os.path.join(os.path.dirname(__file__), '..', 'logs')
-        os.makedirs(log_dir, exist_ok=True)
-        file_path = os.path.join(log_dir, f"error_log_{datetime.now().strftime('%Y%m%d')}.txt")
-        
-        with open(file_path, 'a', encoding='utf-8') as f:
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"[{now}] {error_message}\n")
+    def show_alert(self, message, key=None):
+        """알림 큐에 등록 (별도 스레드에서 전달, 주문 경로를 막지 않음)"""
+        self.log.info("alert", f"[📢 알림] {message}", code=key)
+        self.notifier.notify(message, key=key)
 
-        print(f"[⚠️ 에러 저장 완료]: {file_path}")
+    def save_error_log(self, error_message):
+        """에러 메시지를 구조화 로그에 기록 (파일 기록은 로그 스레드에서)"""
+        self.log.error("error", error=error_message)
 
     
 # -----------------------------------
@@ -578,36 +1171,181 @@ class Kiwoom:
         - PyQt 애플리케이션 종료
         """
         print("[🛑 프로그램 종료 - 매매 기록 저장 중...]")
+        self.decision_timer.stop()
+        stats = self.coalescer.stats()
+        pnl = self.pnl.stats()
+        print(f"[💹 손익] 실현 {pnl['realized']:,.0f}원 / 평가 {pnl['unrealized']:,.0f}원 / "
+              f"승률 {pnl['win_rate_pct']:.1f}% ({pnl['round_trips']}회) / 노출 {pnl['exposure']:,.0f}원")
+        print(f"[📊 실시간 처리] 수신 틱 {stats['ticks_received']:,}건 / 평가 {stats['evaluations']:,}회 "
+              f"(즉시 {stats['bypassed']:,}회) / 병합률 {stats['coalesce_ratio']:.1f}x")
+        if self.metrics is not None:
+            self.metrics.print_summary()
+        self._spill_tick_store()
+        self.session.stop()
+        self.balance_timer.stop()
+        self.order_timer.stop()
+        self.snapshot_timer.stop()
+        if self.snapshot_path:
+            self.save_snapshot()
+            if self.snapshot_writer is not None:
+                self.snapshot_writer.close()
+                snap = self.snapshot_writer.stats()
+                print(f"[♻️ 상태 스냅샷] {snap['written']:,}회 기록 / 마지막 {snap['last_bytes'] / 1024:,.1f} KB → "
+                      f"{self.snapshot_path}")
         try:
             self.save_trade_log()
             self.draw_profit_graph()
             self.stop_real_time_monitoring()
+            self.notifier.close()
+            self.journal.close()
+            if self.metrics_exporter is not None:
+                self.metrics_exporter.close()
             print("[✅ 매매 기록 저장, 그래프 저장, 감시 해제 완료]")
         except Exception as e:
             self.save_error_log(str(e))
             print(f"[❌ 종료 중 에러 발생]: {e}")
 
         self.app.quit()
+        self.log.close()
+        log_stats = self.log.stats()
+        print(f"[🗒️ 로그] 기록 {log_stats['written']:,}건 / 샘플링 생략 {log_stats['sampled_out']:,}건 / 유실 {log_stats['dropped']:,}건")
         print("[✅ 프로그램 완전 종료]")
 
 
+    def _spill_tick_store(self):
+        """틱 저장소의 남은 틱 / 분봉을 디스크에 저장 (장 종료 / 프로그램 종료)"""
+        if self._tick_store is None:
+            return
+        store = self._tick_store
+        spilled = store.spill_all()
+        print(f"[💾 틱 저장소] {len(store)}종목 / 틱 {store.ticks_total:,}건 (장 종료 저장 {spilled:,}건, "
+              f"누적 저장 {store.ticks_spilled:,}건, 버림 {store.ticks_dropped:,}건) / "
+              f"{store.memory_usage() / 1024:,.1f} KB" + (f" → {store.spill_dir}" if store.spill_dir else ""))
+
     def run(self):
-        """로그인 → 관심 종목 일봉 조회 → 실시간 감시 시작 → 타이머 작동"""
+        """
+        로그인 → 관심 종목 일봉 조회 요청 → 장 운영 스케줄 시작 (일봉 수신 완료 시 실시간 감시 시작)
+        - 휴장일 / 장 종료 후에 시작하면 자동 재시작(restart_after_close)일 때만 다음 거래일까지 대기, 아니면 바로 종료
+        """
+        if self.calendar.phase_at(self.ocx.now())[0] == CLOSED and not self.restart_after_close:
+            print("[🚪 장 운영 시간 아님 (휴장일 / 장 종료 후)] 프로그램 종료")
+            return
         self.login()
         if not self.account_number:
             print("[❌ 로그인 실패. 프로그램 종료]")
             return
 
-        # 관심 종목 일봉 데이터 요청
-        for code in self.target_stocks.keys():
-            self.request_daily_chart(code)
+        # 상태 스냅샷 복원 (보유 종목·최고가 / 현금, 같은 거래일이면 지표까지) → 바로 이어지는 잔고 조회 1회로 보정
+        restored = self.restore_snapshot() if self.snapshot_path and self.restore_on_start else []
 
-        # 실시간 체결 감시 시작
-        self.start_real_time_monitoring()
+        # 초기 잔고 조회 (로컬 원장 초기화)
+        self.check_balance()
+
+        # 관심 종목 일봉 데이터 요청 (TR 스케줄러로 비동기 처리, 완료되면 지표 계산 후 실시간 감시 시작)
+        codes = [code for code in self.target_stocks if code not in restored]
+        self.pending_daily_codes = set(codes)
+        for code in codes:
+            self.request_daily_chart(code)
+        self._start_monitoring_when_ready()
+        self._session_day = self.ocx.now().date()
 
-        # 타이머 시작
-        self.check_timer.start(5000)          # 5초마다 장 종료 여부 확인
-        self.balance_timer.start(60 * 60 * 1000)  # 1시간마다 잔액 조회
+        # 장 운영 스케줄 시작 (현재 구간 반영 → 구간 전환 시각마다 결정 루프 / 잔고 보정 / 스냅샷 타이머 조정)
+        self.session.start()
+        self.session_started = True
 
         print(f"[✅ 프로그램 준비 완료] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         self.app.exec_()
+
+
+# -----------------------------------
+# 🔵 18. 상태 스냅샷 (재시작 복원)
+# -----------------------------------
+    def capture_state(self):
+        """현재 매매 상태 복사본 → (state, arrays) (매매 스레드에서 복사만, 인코딩 / 기록은 스냅샷 스레드)"""
+        import numpy as np
+
+        now = self.ocx.now()
+        prices = {}
+        if not self.daily_bar_committed:
+            prices.update(self.today_closes)
+            prices.update(self.indicators.latest_prices())
+        codes = [code for code, closes in self.daily_closes.items() if len(closes)]
+        closes = [np.asarray(self.daily_closes[code], dtype=np.float64) for code in codes]
+        state = {
+            "session": now.strftime("%Y%m%d"),
+            "saved_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "account": self.account_number,
+            "shard": list(self.shard) if self.shard is not None else None,
+            "cash": self.order_manager.cash,
+            "positions": {code: dict(stock) for code, stock in self.own_stocks.items()},
+            "pnl": self.pnl.state(),
+            "prices": prices,
+            "closes_codes": codes,
+            "daily_bar_committed": self.daily_bar_committed,
+            "daily_data_success": self.daily_data_success,
+        }
+        arrays = {
+            "closes": np.concatenate(closes) if closes else np.empty(0),
+            "closes_len": np.array([len(c) for c in closes], dtype=np.int32),
+        }
+        return state, arrays
+
+    def save_snapshot(self):
+        """상태 스냅샷 기록 요청 (스냅샷 타이머 / 종료 시, 기록이 밀리면 최신 상태만 기록)"""
+        if not self.snapshot_path or not self.account_number:
+            return
+        if self.snapshot_writer is None:
+            from state_snapshot import SnapshotWriter
+            self.snapshot_writer = SnapshotWriter(self.snapshot_path)
+            if self.metrics is not None:
+                self.snapshot_writer.latency = self.metrics.histogram("snapshot_write")
+        self.snapshot_writer.submit(*self.capture_state())
+
+    def restore_snapshot(self):
+        """
+        저장된 상태 스냅샷 복원 (run() 에서 첫 잔고 조회 전) → 일봉 조회 없이 지표를 복원한 종목 목록
+        - 다른 계좌 / 다른 샤드 구성의 스냅샷, 손상되거나 버전이 다른 파일은 무시
+        - 보유 종목(최고가 포함) / 현금은 날짜와 관계없이 복원 → 이어지는 잔고 조회 1회로 수량 / 매입가 / 현금 보정
+          (최고가는 보정 후에도 유지되어 트레일링 스탑이 이어지고, 보정 전에는 실시간 감시를 시작하지 않음)
+        - 같은 거래일이면 손익 / 확정 일봉 종가 / 장중 최신가도 복원 → 해당 종목은 일봉 TR 없이 바로 지표 계산
+        """
+        import numpy as np
+        from state_snapshot import read_snapshot, SnapshotError
+
+        try:
+            loaded = read_snapshot(self.snapshot_path)
+        except (SnapshotError, OSError, ValueError) as e:
+            print(f"[⚠️ 상태 스냅샷 복원 실패] {e} → 처음부터 시작")
+            return []
+        if loaded is None:
+            return []
+        state, arrays = loaded
+        if state["account"] != self.account_number or state["shard"] != (list(self.shard) if self.shard else None):
+            print(f"[⚠️ 상태 스냅샷 무시] 계좌 / 샤드 구성이 다름 ({state['saved_at']} 저장분)")
+            return []
+
+        self.order_manager.cash = state["cash"]
+        self.own_stocks.clear()   # OrderManager 원장과 같은 dict → 내용만 교체
+        self.own_stocks.update({code: dict(stock) for code, stock in state["positions"].items()})
+        self.position_risk.sync()
+
+        restored = []
+        if state["session"] == self.ocx.now().strftime("%Y%m%d"):
+            self.pnl.restore(state["pnl"])
+            closes = np.split(arrays["closes"], np.cumsum(arrays["closes_len"])[:-1])
+            for code, values in zip(state["closes_codes"], closes):
+                if code in self.target_stocks and len(values) >= MIN_HISTORY_BARS:
+                    self.daily_closes[code] = values
+                    restored.append(code)
+            for code, price in state["prices"].items():
+                if code in self.daily_closes:
+                    self.today_closes[code] = price
+            self.daily_bar_committed = state["daily_bar_committed"]
+            self.daily_data_success = state["daily_data_success"] and bool(restored)
+            if restored:
+                self.recompute_indicators(restored)
+
+        self._awaiting_balance = True
+        print(f"[♻️ 상태 스냅샷 복원] {state['saved_at']} 저장분 / 보유 {len(self.own_stocks)}종목 / "
+              f"지표 {len(restored)}종목 (일봉 조회 생략) → 잔고 조회로 보정")
+        return restored
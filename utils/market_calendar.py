@@ -0,0 +1,185 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+from datetime import date, datetime, timedelta, time as dtime
+
+# 장 운영 구간
+CLOSED, PRE_OPEN, OPEN_AUCTION, CONTINUOUS, CLOSING_AUCTION, AFTER_HOURS = range(6)
+PHASE_NAMES = {
+    CLOSED: "장 종료",
+    PRE_OPEN: "장 시작 준비",
+    OPEN_AUCTION: "시가 동시호가",
+    CONTINUOUS: "정규장",
+    CLOSING_AUCTION: "종가 동시호가",
+    AFTER_HOURS: "장 마감 후",
+}
+TRADING_PHASES = (PRE_OPEN, OPEN_AUCTION, CONTINUOUS, CLOSING_AUCTION)
+AUCTION_PHASES = (OPEN_AUCTION, CLOSING_AUCTION)
+
+# 평일 기본 구간 시작 시각 (준비 시각은 설정값, 마감 후 구간은 시간외 단일가가 끝나는 18:00 까지)
+OPEN_AUCTION_TIME = dtime(8, 30)
+OPEN_TIME = dtime(9, 0)
+CLOSING_AUCTION_TIME = dtime(15, 20)
+CLOSE_TIME = dtime(15, 30)
+END_TIME = dtime(18, 0)
+
+# KRX 휴장일 (주말 제외, 매년 KRX 공지로 갱신 – 추가분은 [SESSION] calendar_file)
+KRX_HOLIDAYS = {
+    # 2025
+    "2025-01-01", "2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30", "2025-03-03", "2025-05-01",
+    "2025-05-05", "2025-05-06", "2025-06-03", "2025-06-06", "2025-08-15", "2025-10-03", "2025-10-06",
+    "2025-10-07", "2025-10-08", "2025-10-09", "2025-12-25", "2025-12-31",
+    # 2026
+    "2026-01-01", "2026-02-16", "2026-02-17", "2026-02-18", "2026-03-02", "2026-05-01", "2026-05-05",
+    "2026-05-25", "2026-06-03", "2026-08-17", "2026-09-24", "2026-09-25", "2026-10-05", "2026-10-09",
+    "2026-12-25", "2026-12-31",
+}
+
+# 개장 / 마감 시각이 바뀌는 날 → (개장 지연 분, 마감 지연 분) (연초 첫 거래일, 수능일)
+KRX_SPECIAL_DAYS = {
+    "2025-01-02": (60, 0),
+    "2025-11-13": (60, 60),
+    "2026-01-02": (60, 0),
+    "2026-11-19": (60, 60),
+}
+
+
+def _parse_day(value):
+    return value if isinstance(value, date) else datetime.strptime(value.strip(), "%Y-%m-%d").date()
+
+
+def load_calendar_file(path):
+    """
+    달력 파일 → (휴장일 집합, {일자: (개장 지연 분, 마감 지연 분)})
+    - 한 줄에 하나: 'YYYY-MM-DD' (휴장) 또는 'YYYY-MM-DD 개장지연분 마감지연분' (예: 2026-11-19 60 60), '#' 뒤는 주석
+    """
+    holidays, special_days = set(), {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            fields = line.split('#', 1)[0].split()
+            if not fields:
+                continue
+            day = _parse_day(fields[0])
+            if len(fields) == 1:
+                holidays.add(day)
+            else:
+                special_days[day] = (int(fields[1]), int(fields[2]) if len(fields) > 2 else 0)
+    return holidays, special_days
+
+
+# -----------------------------------
+# 🔵 2. KRX 거래일 달력
+# -----------------------------------
+class KrxCalendar:
+    """
+    로컬 KRX 거래일 달력 (주말 / 휴장일, 개장·마감 지연일)
+    - transitions(day): 거래일의 구간 전환 시각 목록 (장 시작 준비 → 시가 동시호가 → 정규장 → 종가 동시호가 → 장 마감 후 → 장 종료)
+      · 개장 지연일은 준비 / 시가 동시호가 / 정규장 시각을, 마감 지연일은 종가 동시호가 이후 시각을 미룸
+    - phase_at(now): 현재 구간과 다음 전환 시각
+    """
+
+    def __init__(self, holidays=None, special_days=None, warmup=dtime(8, 0)):
+        self.holidays = {_parse_day(day) for day in (KRX_HOLIDAYS if holidays is None else holidays)}
+        self.special_days = {_parse_day(day): delays
+                             for day, delays in (KRX_SPECIAL_DAYS if special_days is None else special_days).items()}
+        self.warmup = warmup
+
+    def is_trading_day(self, day):
+        return day.weekday() < 5 and day not in self.holidays
+
+    def next_trading_day(self, day):
+        """day 다음 거래일"""
+        day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+    def last_trading_day(self, day):
+        """day 를 포함해 가장 최근 거래일"""
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def transitions(self, day):
+        """거래일 구간 전환 [(시각, 구간), ...] (거래일이 아니면 빈 목록)"""
+        if not self.is_trading_day(day):
+            return []
+        open_delay, close_delay = self.special_days.get(day, (0, 0))
+
+        def at(t, delay):
+            return datetime.combine(day, t) + timedelta(minutes=delay)
+
+        return [
+            (at(self.warmup, open_delay), PRE_OPEN),
+            (at(OPEN_AUCTION_TIME, open_delay), OPEN_AUCTION),
+            (at(OPEN_TIME, open_delay), CONTINUOUS),
+            (at(CLOSING_AUCTION_TIME, close_delay), CLOSING_AUCTION),
+            (at(CLOSE_TIME, close_delay), AFTER_HOURS),
+            (at(END_TIME, close_delay), CLOSED),
+        ]
+
+    def phase_at(self, now):
+        """현재 시각 → (구간, 다음 전환 시각)"""
+        phase = CLOSED
+        for at, next_phase in self.transitions(now.date()):
+            if now < at:
+                return phase, at
+            phase = next_phase
+        return CLOSED, self.transitions(self.next_trading_day(now.date()))[0][0]
+
+    @classmethod
+    def from_config(cls, config):
+        """[SESSION] 섹션으로 구성 (calendar_file: 내장 목록에 더할 휴장일 / 지연일, warmup_time: 장 시작 준비 시각)"""
+        calendar = cls(warmup=datetime.strptime(config.get('SESSION', 'warmup_time', fallback='08:00'), "%H:%M").time())
+        path = config.get('SESSION', 'calendar_file', fallback=None)
+        if path:
+            holidays, special_days = load_calendar_file(path)
+            calendar.holidays.update(holidays)
+            calendar.special_days.update(special_days)
+        return calendar
+
+
+# -----------------------------------
+# 🔵 3. 장 운영 구간 스케줄러
+# -----------------------------------
+class SessionScheduler:
+    """
+    구간 전환 시각에만 깨어나는 단발 타이머 스케줄러 (주기 폴링 없음)
+    - start: 현재 구간으로 on_change(구간, None) 1회 호출 후 다음 전환 시각에 타이머 예약
+    - 전환 시각마다 on_change(새 구간, 이전 구간) → 다음 전환 예약
+    - max_wait_sec: 한 번에 기다리는 최대 시간 (PC 절전 / 시계 보정 후 다시 확인, 밤 / 휴장일에도 시간당 1회)
+      · 절전 등으로 구간을 건너뛰면 건너뛴 구간 없이 현재 구간으로 바로 on_change
+    """
+
+    def __init__(self, transport, calendar, on_change, max_wait_sec=3600):
+        self.transport = transport
+        self.calendar = calendar
+        self.on_change = on_change
+        self.max_wait_sec = max_wait_sec
+        self.phase = None
+        self.next_change = None
+        self.wakeups = 0
+        self._timer = transport.create_timer(precise=True)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timer)
+
+    def start(self):
+        """현재 구간 반영 후 다음 전환 예약 → 현재 구간"""
+        self._update()
+        return self.phase
+
+    def stop(self):
+        self._timer.stop()
+
+    def _on_timer(self):
+        self.wakeups += 1
+        self._update()
+
+    def _update(self):
+        now = self.transport.now()
+        phase, self.next_change = self.calendar.phase_at(now)
+        wait = min((self.next_change - now).total_seconds(), self.max_wait_sec)
+        self._timer.start(max(int(wait * 1000) + 1, 1))   # 콜백에서 stop 할 수 있도록 먼저 예약
+        previous, self.phase = self.phase, phase
+        if phase != previous:
+            self.on_change(phase, previous)
@@ -0,0 +1,247 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import os
+import json
+import time
+import threading
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+# -----------------------------------
+# 🔵 2. 지연 시간 히스토그램 (HDR 방식)
+# -----------------------------------
+class LatencyHistogram:
+    """
+    나노초 지연 시간 히스토그램 (HdrHistogram 과 같은 로그-선형 버킷)
+    - 2배 구간마다 2**sub_bucket_bits 개로 선형 분할 → 상대 오차 2**-sub_bucket_bits 이하 (기본 약 3%)
+    - 기록은 bit_length 한 번 + dict 갱신 (O(1)), 빈 버킷은 저장하지 않아 종목별로 만들어도 가벼움
+    """
+    __slots__ = ("sub_bits", "sub_count", "_shift_base", "counts", "count", "total", "max")
+
+    def __init__(self, sub_bucket_bits=5):
+        self.sub_bits = sub_bucket_bits
+        self.sub_count = 1 << sub_bucket_bits
+        self._shift_base = sub_bucket_bits + 1
+        self.counts = {}            # 버킷 번호 → 건수
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value):
+        shift = value.bit_length() - self._shift_base
+        if shift <= 0:
+            return value
+        return (shift << self.sub_bits) + (value >> shift)
+
+    def _upper(self, index):
+        """버킷에 들어가는 가장 큰 값"""
+        if index < 2 * self.sub_count:
+            return index
+        shift = index // self.sub_count - 1
+        return ((index - self.sub_count * shift + 1) << shift) - 1
+
+    def record(self, value):
+        """지연 시간 1건 (ns 정수, perf_counter_ns 차이)"""
+        shift = value.bit_length() - self._shift_base
+        index = value if shift <= 0 else (shift << self.sub_bits) + (value >> shift)
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """q 분위 값 (ns, 버킷 상한 – 최댓값을 넘지 않음)"""
+        if not self.count:
+            return 0
+        target = max(int(q * self.count + 0.999999), 1)
+        seen = 0
+        for index, n in sorted(self.counts.items()):
+            seen += n
+            if seen >= target:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def summary(self):
+        """{count, mean_us, p50_us, ..., max_us}"""
+        result = {"count": self.count, "mean_us": self.total / self.count / 1000 if self.count else 0.0}
+        for q in QUANTILES:
+            result[f"p{q * 100:g}_us"] = self.quantile(q) / 1000
+        result["max_us"] = self.max / 1000
+        return result
+
+
+# -----------------------------------
+# 🔵 3. 메트릭 레지스트리
+# -----------------------------------
+class Metrics:
+    """
+    단계별 / 종목별 지연 시간 히스토그램 + 카운터
+    - observe / inc 는 매매 스레드에서만 호출 (락 없음), 조회는 스크레이프 스레드에서 복사본으로 읽음
+    - 다른 객체가 이미 세고 있는 값(수신 틱, TR 요청 수 등)은 add_collector 로 조회 시점에만 읽어 핫 경로 비용 없음
+    """
+
+    def __init__(self, per_symbol=("tick_to_order",)):
+        self.per_symbol = set(per_symbol)
+        self.stages = {}            # 단계 → LatencyHistogram
+        self.symbols = {}           # (단계, 종목) → LatencyHistogram
+        self.counters = {}
+        self._collectors = []
+
+    def histogram(self, stage):
+        """단계 히스토그램 (핫 경로에서는 미리 받아 두고 record 를 직접 호출)"""
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = LatencyHistogram()
+        return hist
+
+    def observe(self, stage, value_ns, code=None):
+        """단계 지연 시간 1건 기록 (per_symbol 단계면 종목별로도 기록)"""
+        self.histogram(stage).record(value_ns)
+        if code is not None and stage in self.per_symbol:
+            key = (stage, code)
+            hist = self.symbols.get(key)
+            if hist is None:
+                hist = self.symbols[key] = LatencyHistogram()
+            hist.record(value_ns)
+
+    def inc(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_collector(self, collector):
+        """collector() → {이름: 값} (이름이 _total 로 끝나면 카운터, 아니면 게이지)"""
+        self._collectors.append(collector)
+
+    def collect(self):
+        values = dict(self.counters)
+        for collector in self._collectors:
+            try:
+                values.update(collector())
+            except Exception as e:
+                values["collector_errors_total"] = values.get("collector_errors_total", 0) + 1
+                print(f"[⚠️ 메트릭 수집 실패]: {e}")
+        return values
+
+    def snapshot(self):
+        """JSON 으로 쓸 수 있는 현재 상태 (스냅샷 파일 / 종료 요약용)"""
+        return {
+            "ts": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "stages": {stage: hist.summary() for stage, hist in list(self.stages.items())},
+            "symbols": {f"{stage}:{code}": hist.summary() for (stage, code), hist in list(self.symbols.items())},
+            "values": self.collect(),
+        }
+
+    def render_prometheus(self, prefix="kiwoom"):
+        """Prometheus 텍스트 형식 (지연 시간은 초 단위 summary)"""
+        lines = []
+
+        def summary(name, help_text, items):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for labels, hist in items:
+                for q in QUANTILES:
+                    lines.append(f'{name}{{{labels},quantile="{q}"}} {hist.quantile(q) / 1e9:.9f}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.total / 1e9:.9f}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        summary(f"{prefix}_stage_latency_seconds", "단계별 처리 지연 시간",
+                [(f'stage="{stage}"', hist) for stage, hist in sorted(list(self.stages.items()))])
+        summary(f"{prefix}_symbol_latency_seconds", "종목별 처리 지연 시간",
+                [(f'stage="{stage}",code="{code}"', hist) for (stage, code), hist in sorted(list(self.symbols.items()))])
+
+        for name, value in sorted(self.collect().items()):
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} {'counter' if name.endswith('_total') else 'gauge'}")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self):
+        """단계별 p50 / p99 / 최댓값 콘솔 출력"""
+        for stage, hist in sorted(list(self.stages.items())):
+            s = hist.summary()
+            print(f"[⏱️ {stage}] {s['count']:,}건 / p50 {s['p50_us']:.1f}µs / p99 {s['p99_us']:.1f}µs / "
+                  f"최대 {s['max_us']:.1f}µs")
+
+
+# -----------------------------------
+# 🔵 4. 내보내기 (로컬 HTTP 엔드포인트 / 주기 스냅샷 파일)
+# -----------------------------------
+class MetricsExporter:
+    """
+    별도 데몬 스레드에서 메트릭 노출 (매매 스레드를 막지 않음)
+    - port > 0: http://host:port/metrics 에 Prometheus 텍스트 형식 (기본 host 127.0.0.1)
+    - snapshot_path + snapshot_interval_sec > 0: 주기적으로 JSON 스냅샷을 덮어쓰기 (임시 파일 → 교체)
+    """
+
+    def __init__(self, metrics, host="127.0.0.1", port=0, snapshot_path=None, snapshot_interval_sec=0):
+        self.metrics = metrics
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval_sec
+        self._server = None
+        self._stop = threading.Event()
+        self._snapshot_thread = None
+
+        if port:
+            self._start_server(host, port)
+        if snapshot_path and snapshot_interval_sec > 0:
+            self._snapshot_thread = threading.Thread(target=self._snapshot_worker, name="metrics-snapshot", daemon=True)
+            self._snapshot_thread.start()
+
+    def _start_server(self, host, port):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass    # 스크레이프마다 콘솔 출력하지 않음
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            print(f"[⚠️ 메트릭 엔드포인트 시작 실패] {host}:{port} / {e}")
+            return
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"[📈 메트릭 엔드포인트] http://{host}:{self._server.server_address[1]}/metrics")
+
+    def _snapshot_worker(self):
+        while not self._stop.wait(self.snapshot_interval):
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        if not self.snapshot_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_path)), exist_ok=True)
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.metrics.snapshot(), f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            print(f"[⚠️ 메트릭 스냅샷 저장 실패]: {e}")
+
+    def close(self):
+        """서버 종료 + 마지막 스냅샷 저장"""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join(timeout=2.0)
+        self.write_snapshot()
@@ -0,0 +1,189 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import os
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# -----------------------------------
+# 🔵 2. 알림 싱크 (출력 대상)
+# -----------------------------------
+class NullSink:
+    """아무것도 하지 않는 싱크 (헤드리스 실행용)"""
+    name = "null"
+
+    def send(self, batch):
+        pass
+
+    def close(self):
+        pass
+
+
+class LogFileSink:
+    """알림을 일자별 텍스트 파일에 기록"""
+    name = "log"
+
+    def __init__(self, log_dir):
+        self.log_dir = log_dir
+        self._file = None
+        self._date = None
+
+    def send(self, batch):
+        today = datetime.now().strftime('%Y%m%d')
+        if self._file is None or self._date != today:
+            self.close()
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._file = open(os.path.join(self.log_dir, f"alert_log_{today}.txt"), 'a', encoding='utf-8')
+            self._date = today
+        self._file.writelines(f"[{n['time']}] [{n['level']}] {n['message']}\n" for n in batch)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ToastSink:
+    """데스크톱 토스트 알림 (plyer 가 설치된 경우에만 동작)"""
+    name = "toast"
+
+    def __init__(self, title="📢 알림"):
+        self.title = title
+        try:
+            from plyer import notification
+            self._notification = notification
+        except ImportError:
+            print("[⚠️ 토스트 알림 비활성화] plyer 미설치")
+            self._notification = None
+
+    def send(self, batch):
+        if self._notification is None:
+            return
+        for n in batch:
+            self._notification.notify(title=self.title, message=n["message"], timeout=5)
+
+    def close(self):
+        pass
+
+
+class WebhookSink:
+    """로컬 웹훅(HTTP POST, JSON)으로 알림 전달"""
+    name = "webhook"
+
+    def __init__(self, url, timeout=2.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, batch):
+        import urllib.request
+
+        body = json.dumps({"notifications": batch}, ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    def close(self):
+        pass
+
+
+# -----------------------------------
+# 🔵 3. 비동기 알림 큐
+# -----------------------------------
+class Notifier:
+    """
+    매매 스레드를 막지 않는 알림 큐
+    - notify 는 버퍼에 넣고 즉시 반환, 별도 스레드가 싱크로 전달
+    - 버퍼 초과 정책: drop_oldest(오래된 것 폐기) / drop_new(새 것 폐기) / coalesce(같은 key 는 최신 것으로 교체 후 drop_oldest)
+    """
+    POLICIES = ("drop_oldest", "drop_new", "coalesce")
+
+    def __init__(self, sinks, max_pending=256, policy="coalesce"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"알 수 없는 알림 정책: {policy}")
+        self.sinks = list(sinks)
+        self.max_pending = max_pending
+        self.policy = policy
+
+        self._pending = OrderedDict()
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.failed = 0
+
+        self._thread = threading.Thread(target=self._worker, name="notifier", daemon=True)
+        self._thread.start()
+
+    def notify(self, message, key=None, level="info"):
+        """알림 등록 (블로킹 없음, 등록했으면 True)"""
+        entry = {"time": datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "level": level, "message": message}
+        with self._cond:
+            if self._closed:
+                return False
+
+            if self.policy == "coalesce" and key is not None and key in self._pending:
+                self._pending[key] = entry
+                self._pending.move_to_end(key)
+                self.coalesced += 1
+                self._cond.notify()
+                return True
+
+            if len(self._pending) >= self.max_pending:
+                if self.policy == "drop_new":
+                    self.dropped += 1
+                    return False
+                self._pending.popitem(last=False)
+                self.dropped += 1
+
+            self._seq += 1
+            self._pending[key if key is not None else ("_", self._seq)] = entry
+            self._cond.notify()
+            return True
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                batch = list(self._pending.values())
+                self._pending.clear()
+
+            for sink in self.sinks:
+                try:
+                    sink.send(batch)
+                except Exception as e:
+                    self.failed += 1
+                    print(f"[⚠️ 알림 전달 실패] {sink.name}: {e}")
+            self.sent += len(batch)
+
+    def close(self, timeout=2.0):
+        """남은 알림 전달 후 종료"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        for sink in self.sinks:
+            sink.close()
+
+
+def build_sinks(names, log_dir, webhook_url=None, headless=False):
+    """설정 문자열('log,toast,webhook,null')로 싱크 목록 생성"""
+    sinks = []
+    for name in (n.strip().lower() for n in names.split(',')):
+        if name == "log":
+            sinks.append(LogFileSink(log_dir))
+        elif name == "toast" and not headless:
+            sinks.append(ToastSink())
+        elif name == "webhook" and webhook_url:
+            sinks.append(WebhookSink(webhook_url))
+        elif name in ("null", "none"):
+            sinks.append(NullSink())
+    return sinks or [NullSink()]
@@ -0,0 +1,263 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import os
+import json
+import random
+import hashlib
+import itertools
+import configparser
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+from backtester import DEFAULT_PARAMS, EXIT_NONE, buy_signal_matrix, simulate, portfolio_summary
+
+# 탐색 대상 파라미터 (백테스트 키 → config.ini [TRADING] 키)
+SWEEP_KEYS = {
+    "max_profit_rate": "max_profit_rate",
+    "max_loss_rate": "max_loss_rate",
+    "max_stock_ratio": "max_stock_ratio",
+    "buy_split_count": "buy_split_count",
+    "trailing_ratio": "trailing_stop_ratio",
+}
+INT_KEYS = {"buy_split_count"}
+METRICS = ("return_pct", "sharpe", "calmar")
+
+
+# -----------------------------------
+# 🔵 2. 탐색 공간
+# -----------------------------------
+def parse_values(key, spec):
+    """
+    탐색 값 문자열 → 후보 목록 또는 (최소, 최대) 범위
+    - '3,5,7'      : 나열한 값
+    - '2:10:2'     : 2 부터 10 까지 2 간격 (양 끝 포함)
+    - '2:10'       : 랜덤 탐색용 연속 범위
+    """
+    cast = int if key in INT_KEYS else float
+    spec = str(spec).strip()
+    if ":" in spec:
+        parts = [float(p) for p in spec.split(":")]
+        if len(parts) == 3:
+            low, high, step = parts
+            count = int(round((high - low) / step)) + 1
+            return [cast(round(low + i * step, 6)) for i in range(count)]
+        return (cast(parts[0]), cast(parts[1]))
+    return [cast(v) for v in spec.split(",") if v.strip()]
+
+
+def space_from_config(config, section='SWEEP'):
+    """config.ini [SWEEP] 섹션 (키: 탐색 파라미터, 값: parse_values 형식) → 탐색 공간 dict"""
+    space = {}
+    if config.has_section(section):
+        for key, config_key in SWEEP_KEYS.items():
+            spec = config.get(section, key, fallback=None) or config.get(section, config_key, fallback=None)
+            if spec:
+                space[key] = parse_values(key, spec)
+    return space
+
+
+def grid(space):
+    """격자 탐색: 후보 목록의 모든 조합 (연속 범위는 양 끝값만 사용)"""
+    keys = list(space)
+    values = [v if isinstance(v, list) else list(v) for v in space.values()]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def random_samples(space, count, seed=0):
+    """랜덤 탐색: 목록은 균등 선택, 연속 범위는 균등 분포 (소수 둘째 자리 반올림 → 캐시 재사용)"""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        sample = {}
+        for key, values in space.items():
+            if isinstance(values, list):
+                sample[key] = rng.choice(values)
+            elif key in INT_KEYS:
+                sample[key] = rng.randint(*values)
+            else:
+                sample[key] = round(rng.uniform(*values), 2 if key != "trailing_ratio" else 3)
+        samples.append(sample)
+    return samples
+
+
+# -----------------------------------
+# 🔵 3. 공유 메모리 패널 (한 번 올리고 자식 프로세스는 붙어서 사용)
+# -----------------------------------
+class SharedPanel:
+    """NumPy 배열 묶음을 공유 메모리에 복사 (specs 로 다른 프로세스에서 같은 메모리를 배열로 연결)"""
+
+    def __init__(self, arrays):
+        self._blocks = []
+        self.specs = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    @staticmethod
+    def attach(specs):
+        """specs → ({이름: 배열}, 공유 메모리 핸들 목록 – 배열을 쓰는 동안 유지)"""
+        arrays, blocks = {}, []
+        for name, (block_name, shape, dtype) in specs.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            blocks.append(block)
+        return arrays, blocks
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+_worker_arrays = {}
+_worker_blocks = []
+
+
+def _init_worker(specs):
+    global _worker_arrays, _worker_blocks
+    _worker_arrays, _worker_blocks = SharedPanel.attach(specs)
+
+
+def _evaluate(params):
+    """파라미터 1조합 시뮬레이션 (공유 메모리 패널 사용) → 성과 지표 dict"""
+    return evaluate(_worker_arrays, params)
+
+
+def evaluate(arrays, params):
+    close, high = arrays["close"], arrays["high"]
+    result = simulate(close, high, arrays[f"buy_{params['strategy']}"], params)
+    trades = result["trades"]
+    summary = portfolio_summary(result["equity"], trades[trades["reason"] != EXIT_NONE], result["traded"].sum(),
+                                float(params["cash"]) * close.shape[0])
+    drawdown = summary["max_drawdown_pct"]
+    summary["calmar"] = summary["return_pct"] / drawdown if drawdown > 0 else 0.0
+    return summary
+
+
+# -----------------------------------
+# 🔵 4. 파라미터별 결과 캐시 (재실행 시 계산한 조합은 건너뜀)
+# -----------------------------------
+def panel_fingerprint(panel):
+    """패널 데이터 식별자 (데이터가 바뀌면 캐시도 새로)"""
+    digest = hashlib.sha1()
+    digest.update(",".join(panel["codes"]).encode())
+    for field in ("dates", "close", "high"):
+        if panel.get(field) is not None:
+            digest.update(np.ascontiguousarray(panel[field]).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class SweepCache:
+    """파라미터 조합 → 성과 지표 (JSONL 추가 기록)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.results[entry["key"]] = entry["summary"]
+
+    @staticmethod
+    def key(params):
+        fields = ("strategy", "cash", "fee_rate", "tax_rate", *SWEEP_KEYS)
+        return json.dumps({k: params[k] for k in fields}, sort_keys=True)
+
+    def get(self, params):
+        return self.results.get(self.key(params))
+
+    def add(self, params, summary):
+        key = self.key(params)
+        self.results[key] = summary
+        if self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({"key": key, "summary": summary}, ensure_ascii=False) + "\n")
+
+
+# -----------------------------------
+# 🔵 5. 파라미터 탐색 실행
+# -----------------------------------
+def run_sweep(panel, base_params, candidates, workers=None, cache_dir=None, metric="return_pct"):
+    """
+    후보 파라미터 목록을 전 코어로 평가
+    - 매수 신호는 매매 파라미터와 무관하므로 전략별로 한 번만 계산해 종가/고가와 함께 공유 메모리에 올림
+    - cache_dir 가 있으면 데이터 식별자별 JSONL 캐시에서 이미 계산한 조합은 건너뜀
+    → [{params, summary, score}] (score 내림차순)
+    """
+    if metric not in METRICS:
+        raise ValueError(f"알 수 없는 평가 지표: {metric}")
+
+    base_params = dict(DEFAULT_PARAMS, **(base_params or {}))
+    candidates = [dict(base_params, **c) for c in candidates]
+    cache_path = os.path.join(cache_dir, f"sweep_{panel_fingerprint(panel)}.jsonl") if cache_dir else None
+    cache = SweepCache(cache_path)
+
+    pending, seen = [], set()
+    for params in candidates:
+        key = SweepCache.key(params)
+        if cache.get(params) is None and key not in seen:
+            seen.add(key)
+            pending.append(params)
+    print(f"[🔍 파라미터 탐색] 후보 {len(candidates):,}개 / 캐시 {len(candidates) - len(pending):,}개 / "
+          f"계산 {len(pending):,}개")
+
+    if pending:
+        close = np.asarray(panel["close"], dtype=np.float64)
+        arrays = {"close": close, "high": np.asarray(panel.get("high", close), dtype=np.float64)}
+        for strategy in sorted({p["strategy"] for p in pending}):
+            arrays[f"buy_{strategy}"] = buy_signal_matrix(close, strategy)
+
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers <= 1:
+            for i, params in enumerate(pending, 1):
+                cache.add(params, evaluate(arrays, params))
+                print(f"[⏳ 탐색 진행] {i}/{len(pending)}")
+        else:
+            shared = SharedPanel(arrays)
+            del arrays
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(shared.specs,)) as pool:
+                    futures = {pool.submit(_evaluate, params): params for params in pending}
+                    for i, future in enumerate(as_completed(futures), 1):
+                        cache.add(futures[future], future.result())
+                        print(f"[⏳ 탐색 진행] {i}/{len(pending)}")
+            finally:
+                shared.close()
+
+    results = [{"params": p, "summary": cache.get(p), "score": cache.get(p)[metric]} for p in candidates]
+    unique = {SweepCache.key(r["params"]): r for r in results}
+    return sorted(unique.values(), key=lambda r: r["score"], reverse=True)
+
+
+def write_best_configs(results, base_config_path, out_dir, top=3, metric="return_pct"):
+    """상위 파라미터를 기존 config.ini 에 반영한 설정 파일로 저장 → 저장 경로 목록"""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for rank, result in enumerate(results[:top], 1):
+        config = configparser.ConfigParser()
+        config.optionxform = str
+        config.read(base_config_path, encoding='utf-8')
+        if not config.has_section('TRADING'):
+            config.add_section('TRADING')
+        for key, config_key in SWEEP_KEYS.items():
+            config.set('TRADING', config_key, str(result["params"][key]))
+
+        s = result["summary"]
+        path = os.path.join(out_dir, f"config_best_{rank}.ini")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"# 파라미터 탐색 {rank}위 ({metric} = {result['score']:.4f})\n")
+            f.write(f"# 수익률 {s['return_pct']:.2f}% / 최대 낙폭 {s['max_drawdown_pct']:.2f}% / 샤프 {s['sharpe']:.2f} / "
+                    f"거래 {s['trades']:,}건 / 승률 {s['win_rate_pct']:.1f}%\n")
+            config.write(f)
+        paths.append(path)
+    return paths
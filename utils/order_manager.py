@@ -0,0 +1,300 @@
+# -----------------------------------
+# 🔵 1. 주문 상태
+# -----------------------------------
+from collections import deque
+from datetime import datetime, timedelta
+
+SUBMITTED = "submitted"     # SendOrder 성공, 접수 대기
+ACCEPTED = "accepted"       # 접수
+PARTIAL = "partial"         # 부분 체결
+FILLED = "filled"           # 전량 체결
+REJECTED = "rejected"       # 거부
+CANCELLED = "cancelled"     # 취소 / 미체결 잔량 정리
+
+OPEN_STATES = (SUBMITTED, ACCEPTED, PARTIAL)
+
+BUY, SELL = 1, 2
+
+ORDER_OK_WORDS = ("정상처리", "완료")   # 주문 직후 OnReceiveMsg 중 정상 접수 메시지 (그 외는 거부)
+
+
+def _to_int(raw):
+    """키움 문자열 숫자('+71200', '  000123') → int (비어 있으면 0)"""
+    raw = str(raw).strip()
+    return abs(int(raw)) if raw.lstrip('-+').isdigit() else 0
+
+
+# -----------------------------------
+# 🔵 2. 주문 1건
+# -----------------------------------
+class Order:
+    """주문 1건의 상태 (체결 이벤트로 갱신)"""
+    __slots__ = ("order_no", "code", "side", "quantity", "est_price", "filled_qty", "filled_amount",
+                 "reserved", "state", "submitted_at", "screen_no", "rqname", "message")
+
+    def __init__(self, code, side, quantity, est_price, submitted_at=None, screen_no="", rqname=""):
+        self.order_no = None
+        self.code = code
+        self.side = side
+        self.quantity = quantity
+        self.est_price = est_price
+        self.filled_qty = 0
+        self.filled_amount = 0
+        self.reserved = quantity * est_price if side == BUY else 0  # 매수 주문 예약 현금
+        self.state = SUBMITTED
+        self.submitted_at = submitted_at    # SendOrder 시각 (전송 계층 시계)
+        self.screen_no = screen_no          # SendOrder 화면번호 / rqname (OnReceiveMsg 매칭)
+        self.rqname = rqname
+        self.message = None                 # 주문 직후 서버 메시지 (OnReceiveMsg)
+
+    @property
+    def is_open(self):
+        return self.state in OPEN_STATES
+
+    @property
+    def avg_fill_price(self):
+        return self.filled_amount / self.filled_qty if self.filled_qty else 0
+
+
+# -----------------------------------
+# 🔵 3. 주문 관리자 (로컬 현금 / 보유 원장)
+# -----------------------------------
+class OrderManager:
+    """
+    체결(Chejan) 이벤트로 움직이는 주문 상태 머신 + 로컬 원장
+    - 매수 주문 시 예상 금액만큼 현금 예약, 실제 체결 수량/가격으로 현금·보유 갱신
+    - positions 는 Kiwoom.own_stocks 와 같은 구조 {종목코드: {buy_price, quantity, highest_price}}
+    - 주기적인 opw00018 결과로 원장 보정 (미체결 주문이 없을 때만, 오래된 미체결 주문은 정리 후 보정)
+    - 체결 이벤트 없이 메시지로만 거부되는 주문(예: 모의투자 증거금 부족)은 OnReceiveMsg 로,
+      응답이 끊긴 주문 / 잔량이 남은 부분 체결은 시간 초과(expire)로 정리
+    """
+
+    def __init__(self, cash=0, clock=datetime.now):
+        self.cash = cash
+        self.clock = clock          # 주문 시각 기준 (전송 계층 시계)
+        self.positions = {}
+        self.orders = {}            # 주문번호 → Order
+        self._unassigned = []       # 주문번호 수신 전 주문 (SendOrder 순서)
+        self._awaiting_msg = deque()    # 서버 메시지 수신 전 주문 (SendOrder 순서, 주문마다 메시지 1건)
+        self._open_count = {}       # (종목코드, 매수/매도) → 미체결 주문 수 (틱마다 조회, 주문 전체를 훑지 않음)
+        self.on_fill = None         # 체결 콜백 fn(order, qty, price)
+        self.on_expire = None       # 시간 초과 정리 콜백 fn(order)
+
+    @property
+    def reserved_cash(self):
+        return sum(o.reserved for o in self._open_orders())
+
+    @property
+    def available_cash(self):
+        """주문 가능 현금 (현금 - 미체결 매수 예약분)"""
+        return self.cash - self.reserved_cash
+
+    def _open_orders(self):
+        yield from (o for o in self._unassigned if o.is_open)
+        yield from (o for o in self.orders.values() if o.is_open)
+
+    def has_open_order(self, code, side=None):
+        counts = self._open_count
+        if side is not None:
+            return (code, side) in counts
+        return (code, BUY) in counts or (code, SELL) in counts
+
+    @property
+    def open_order_count(self):
+        return sum(self._open_count.values())
+
+    def _set_state(self, order, state):
+        """주문 상태 변경 + 미체결 주문 수 갱신 (미체결 → 종료 상태로 바뀔 때만 감소)"""
+        if order.is_open and state not in OPEN_STATES:
+            key = (order.code, order.side)
+            count = self._open_count.get(key, 0) - 1
+            if count > 0:
+                self._open_count[key] = count
+            else:
+                self._open_count.pop(key, None)
+        order.state = state
+
+    def holding_codes(self):
+        """보유 종목 + 매수 주문 중인 종목 (보유 종목 수 한도 기준)"""
+        codes = set(self.positions)
+        codes.update(o.code for o in self._open_orders() if o.side == BUY)
+        return codes
+
+    # ---- 주문 등록 ----
+    def submit(self, code, side, quantity, est_price, screen_no="", rqname=""):
+        """SendOrder 성공 직후 호출 → Order"""
+        order = Order(code, side, quantity, est_price, self.clock(), str(screen_no), rqname)
+        self._unassigned.append(order)
+        self._awaiting_msg.append(order)
+        key = (code, side)
+        self._open_count[key] = self._open_count.get(key, 0) + 1
+        return order
+
+    # ---- 체결 이벤트 ----
+    def on_chejan(self, fields):
+        """
+        주문체결(gubun 0) 필드 반영 → 갱신된 Order (해당 주문이 없으면 None)
+        - fields: {9203 주문번호, 904 원주문번호, 9001 종목코드, 913 주문상태, 905 주문구분, 907 매도수구분,
+                   900 주문수량, 911 누적체결량, 910 체결가, 914 단위체결가, 915 단위체결량}
+        - 정정 / 취소 주문은 자기 주문번호가 새로 붙고 904 로 원주문을 가리킴 → 원주문에 반영하고,
+          새 주문번호를 미배정 주문과 연결하지 않음 (확인 / 취소는 어떤 경우에도 _assign 하지 않음)
+        """
+        order_no = str(fields.get(9203, "")).strip()
+        original_no = str(fields.get(904, "")).strip()
+        code = str(fields.get(9001, "")).strip().lstrip('A')
+        status = str(fields.get(913, "")).strip()
+        side = SELL if str(fields.get(907, "")).strip() == "1" else BUY
+
+        order = self.orders.get(order_no)
+        if order is None:
+            if original_no.strip("0") and original_no != order_no:
+                return self._on_amend(order_no, original_no, status, str(fields.get(905, "")))
+            if status in ("취소", "확인"):
+                return None
+            order = self._assign(order_no, code, side)
+            if order is None:
+                return None
+
+        if status == "거부":
+            self._set_state(order, REJECTED)
+            order.reserved = 0
+            return order
+        if status in ("취소", "확인"):
+            self._set_state(order, CANCELLED)
+            order.reserved = 0
+            return order
+
+        cum_filled = _to_int(fields.get(911, ""))
+        fill_qty = _to_int(fields.get(915, "")) or max(cum_filled - order.filled_qty, 0)
+        fill_price = _to_int(fields.get(914, "")) or _to_int(fields.get(910, ""))
+
+        if status == "체결" and fill_qty > 0 and fill_price > 0:
+            self._apply_fill(order, fill_qty, fill_price)
+        elif order.state == SUBMITTED:
+            order.state = ACCEPTED
+        return order
+
+    def _on_amend(self, order_no, original_no, status, kind):
+        """
+        정정 / 취소 주문 체결 이벤트 → 대상 원주문 (모르는 원주문이거나 확인 전이면 None)
+        - 취소 확인: 원주문 잔량 취소
+        - 정정 확인: 이후 체결은 새 주문번호로 오므로 새 주문번호로도 찾을 수 있게 등록 (원주문번호도 유지)
+        """
+        order = self.orders.get(original_no)
+        if order is None or status not in ("취소", "확인"):
+            return None
+        if "정정" in kind:
+            order.order_no = order_no
+            self.orders[order_no] = order
+            return order
+        self._set_state(order, CANCELLED)
+        order.reserved = 0
+        return order
+
+    def on_msg(self, screen_no, rqname, msg):
+        """
+        OnReceiveMsg 반영 → 거부된 Order (주문 메시지가 아니거나 정상 접수면 None)
+        - 같은 화면번호 / rqname 으로 보낸 주문 중 아직 메시지를 받지 않은 가장 오래된 주문의 메시지로 봄
+        - 정상 접수 메시지(ORDER_OK_WORDS)가 아니고 아직 접수 전(SUBMITTED)이면 거부 처리
+          (예: '[00Z924] 모의투자 증거금부족' – 이 경우 체결 이벤트가 오지 않음)
+        """
+        screen_no = str(screen_no).strip()
+        for i, order in enumerate(self._awaiting_msg):
+            if order.screen_no == screen_no and order.rqname == rqname:
+                del self._awaiting_msg[i]
+                break
+        else:
+            return None
+
+        order.message = msg
+        if any(word in msg for word in ORDER_OK_WORDS) or order.state != SUBMITTED:
+            return None
+        if order in self._unassigned:
+            self._unassigned.remove(order)
+        self._set_state(order, REJECTED)
+        order.reserved = 0
+        return order
+
+    def expire(self, timeout_sec, now=None):
+        """
+        SendOrder 후 timeout_sec 초가 지난 미체결 주문(접수 대기 / 접수 / 부분 체결 잔량)을 취소 상태로 정리 → [Order]
+        - 정리 후 늦게 도착한 체결은 그대로 원장에 반영 (주문번호를 받은 주문), 나머지는 다음 잔고 보정으로 맞춤
+        """
+        cutoff = (now or self.clock()) - timedelta(seconds=timeout_sec)
+        expired = [order for order in self._open_orders() if order.submitted_at <= cutoff]
+        for order in expired:
+            self._set_state(order, CANCELLED)
+            order.reserved = 0
+            if order in self._unassigned:
+                self._unassigned.remove(order)
+            if self.on_expire:
+                self.on_expire(order)
+        while self._awaiting_msg and self._awaiting_msg[0].submitted_at <= cutoff:
+            self._awaiting_msg.popleft()
+        return expired
+
+    def _assign(self, order_no, code, side):
+        """주문번호가 처음 들어오면 같은 종목/방향의 가장 오래된 미배정 주문과 연결"""
+        for i, order in enumerate(self._unassigned):
+            if order.code == code and order.side == side:
+                del self._unassigned[i]
+                order.order_no = order_no
+                self.orders[order_no] = order
+                return order
+        return None
+
+    def _apply_fill(self, order, qty, price):
+        order.filled_qty += qty
+        order.filled_amount += qty * price
+        if order.filled_qty >= order.quantity:
+            self._set_state(order, FILLED)
+            order.reserved = 0
+        elif order.is_open:     # 시간 초과로 정리된 주문의 늦은 체결은 원장에만 반영 (다시 미체결로 되돌리지 않음)
+            self._set_state(order, PARTIAL)
+            if order.side == BUY:
+                order.reserved = (order.quantity - order.filled_qty) * order.est_price
+
+        if order.side == BUY:
+            self.cash -= qty * price
+            stock = self.positions.get(order.code)
+            if stock is None:
+                self.positions[order.code] = {"buy_price": price, "quantity": qty, "highest_price": price}
+            else:
+                total = stock["quantity"] + qty
+                stock["buy_price"] = (stock["buy_price"] * stock["quantity"] + price * qty) / total
+                stock["quantity"] = total
+        else:
+            self.cash += qty * price
+            stock = self.positions.get(order.code)
+            if stock is not None:
+                stock["quantity"] -= qty
+                if stock["quantity"] <= 0:
+                    del self.positions[order.code]
+
+        if self.on_fill:
+            self.on_fill(order, qty, price)
+
+    # ---- 잔고 보정 ----
+    def reconcile(self, cash, holdings, stale_after=None):
+        """
+        opw00018 결과로 원장 보정 (미체결 주문이 있으면 보류) → 보정했으면 True
+        - holdings: {종목코드: (보유수량, 매입가)}
+        - stale_after: 주문 후 이 시간(초)이 지난 미체결 주문은 먼저 정리(expire)하고 잔고 결과를 기준으로 보정
+        """
+        if stale_after is not None and self._open_count:
+            self.expire(stale_after)
+        if self._open_count:
+            return False
+
+        self.cash = cash
+        for code in list(self.positions):
+            if code not in holdings:
+                del self.positions[code]
+        for code, (quantity, buy_price) in holdings.items():
+            stock = self.positions.get(code)
+            if stock is None:
+                self.positions[code] = {"buy_price": buy_price, "quantity": quantity, "highest_price": buy_price}
+            else:
+                stock["quantity"] = quantity
+                stock["buy_price"] = buy_price
+        return True
@@ -0,0 +1,173 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+from collections import deque
+
+# -----------------------------------
+# 🔵 2. 종목별 보유 로트 (FIFO)
+# -----------------------------------
+class Position:
+    """종목 1개의 매수 로트 큐와 평가 상태"""
+    __slots__ = ("lots", "quantity", "cost", "last_price", "round_trip_pnl")
+
+    def __init__(self):
+        self.lots = deque()         # [수량, 단가] (먼저 산 것부터)
+        self.quantity = 0
+        self.cost = 0.0             # 남은 로트의 매입 원가 합계
+        self.last_price = 0
+        self.round_trip_pnl = 0.0   # 보유 시작 이후 누적 실현손익 (전량 매도 시 승/패 판정)
+
+
+# -----------------------------------
+# 🔵 3. 실현 / 평가 손익 추적기
+# -----------------------------------
+class PnLTracker:
+    """
+    체결 단위로 매수-매도를 FIFO 로 맞춰 실현손익 계산
+    - 체결 1건, 가격 갱신 1건마다 상수 시간 (로트는 한 번씩만 소진되므로 분할 체결도 분할 상환 O(1))
+    - 평가손익 / 노출금액은 종목별 보유수량 × 최근가를 증분으로 유지
+    - 승률: 보유 시작부터 전량 매도까지(라운드 트립) 누적 실현손익 기준
+    """
+
+    def __init__(self, fee_rate=0.0, tax_rate=0.0):
+        self.fee_rate = fee_rate
+        self.tax_rate = tax_rate
+        self.positions = {}
+        self.realized = 0.0
+        self.fees = 0.0
+        self.market_value = 0.0     # Σ 보유수량 × 최근가
+        self.cost_basis = 0.0       # Σ 남은 로트 원가
+        self.wins = 0
+        self.losses = 0
+        self.fills = 0
+        self.bought = 0.0           # 누적 매수 금액
+        self.sold = 0.0             # 누적 매도 금액
+
+    def on_fill(self, code, side, quantity, price):
+        """
+        체결 1건 반영 (side: '매수' / '매도' 또는 1 / 2) → 이번 체결의 실현손익 (매수는 0)
+        - 보유 수량보다 많은 매도는 보유분까지만 상환 (원장 보정 전 외부 매매 등)
+        """
+        position = self.positions.get(code)
+        if position is None:
+            position = self.positions[code] = Position()
+        self.fills += 1
+        amount = quantity * price
+        self.market_value += position.quantity * (price - position.last_price)
+        position.last_price = price
+
+        if side in ("매수", 1):
+            fee = amount * self.fee_rate
+            position.lots.append([quantity, price])
+            position.quantity += quantity
+            position.cost += amount
+            self.market_value += amount
+            self.cost_basis += amount
+            self.bought += amount
+            self.fees += fee
+            self.realized -= fee
+            position.round_trip_pnl -= fee
+            return -fee
+
+        fee = amount * (self.fee_rate + self.tax_rate)
+        remaining = min(quantity, position.quantity)
+        matched_cost = 0.0
+        lots = position.lots
+        while remaining > 0:
+            lot = lots[0]
+            take = min(lot[0], remaining)
+            matched_cost += take * lot[1]
+            lot[0] -= take
+            remaining -= take
+            if lot[0] == 0:
+                lots.popleft()
+
+        matched = min(quantity, position.quantity)
+        pnl = matched * price - matched_cost - fee
+        position.quantity -= matched
+        position.cost -= matched_cost
+        self.market_value -= matched * price
+        self.cost_basis -= matched_cost
+        self.sold += amount
+        self.fees += fee
+        self.realized += pnl
+        position.round_trip_pnl += pnl
+
+        if position.quantity == 0 and matched:
+            if position.round_trip_pnl > 0:
+                self.wins += 1
+            else:
+                self.losses += 1
+            position.round_trip_pnl = 0.0
+        return pnl
+
+    def mark(self, code, price):
+        """실시간 가격으로 보유 종목 평가금액 갱신 (보유하지 않으면 무시)"""
+        position = self.positions.get(code)
+        if position is not None and position.quantity:
+            self.market_value += position.quantity * (price - position.last_price)
+            position.last_price = price
+
+    @property
+    def unrealized(self):
+        return self.market_value - self.cost_basis
+
+    def stats(self):
+        """현재 손익 요약 (언제든 조회 가능)"""
+        closed = self.wins + self.losses
+        return {
+            "realized": self.realized,
+            "unrealized": self.unrealized,
+            "total": self.realized + self.unrealized,
+            "exposure": self.market_value,
+            "cost_basis": self.cost_basis,
+            "fees": self.fees,
+            "fills": self.fills,
+            "round_trips": closed,
+            "win_rate_pct": self.wins / closed * 100 if closed else 0.0,
+            "turnover": self.bought + self.sold,
+            "open_positions": sum(1 for p in self.positions.values() if p.quantity),
+        }
+
+    # 누적 값 (스냅샷 저장 / 복원 대상, 보유 로트 제외)
+    TOTALS = ("realized", "fees", "market_value", "cost_basis", "wins", "losses", "fills", "bought", "sold")
+
+    def state(self):
+        """재시작 복원용 상태 (JSON 으로 쓸 수 있는 dict, 보유 중인 종목의 로트 포함)"""
+        return {
+            "totals": {name: getattr(self, name) for name in self.TOTALS},
+            "positions": {
+                code: [[list(lot) for lot in p.lots], p.quantity, p.cost, p.last_price, p.round_trip_pnl]
+                for code, p in self.positions.items() if p.quantity
+            },
+        }
+
+    def restore(self, state):
+        """state() 결과로 손익 / 보유 로트 복원 (기존 값은 덮어씀)"""
+        for name, value in state["totals"].items():
+            if name in self.TOTALS:
+                setattr(self, name, value)
+        self.positions = {}
+        for code, (lots, quantity, cost, last_price, round_trip_pnl) in state["positions"].items():
+            position = self.positions[code] = Position()
+            position.lots.extend([qty, price] for qty, price in lots)
+            position.quantity, position.cost = quantity, cost
+            position.last_price, position.round_trip_pnl = last_price, round_trip_pnl
+
+
+# -----------------------------------
+# 🔵 4. 매매 저널 재생 (리포트용)
+# -----------------------------------
+def replay_fills(rows, fee_rate=0.0, tax_rate=0.0):
+    """
+    매매 저널 체결 기록(trade_journal.query(kinds=('fill',)))을 순서대로 반영
+    → (PnLTracker, 일자별 {date: {realized, fills, bought, sold}})
+    """
+    tracker = PnLTracker(fee_rate, tax_rate)
+    daily = {}
+    for row in rows:
+        day = daily.setdefault(row["date"], {"realized": 0.0, "fills": 0, "bought": 0.0, "sold": 0.0})
+        day["realized"] += tracker.on_fill(row["code"], row["side"], row["quantity"], row["price"])
+        day["fills"] += 1
+        day["bought" if row["side"] == "매수" else "sold"] += row["quantity"] * row["price"]
+    return tracker, daily
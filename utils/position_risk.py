@@ -0,0 +1,141 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드 (NumPy 는 보유 종목 일괄 점검에서만 로드)
+# -----------------------------------
+from strategy import TRAILING_STOP_RATIO, EXIT_NONE, exit_reason, exit_reasons
+
+# 기준 가격 비교 여유 (부동소수점 경계 오차로 신호를 놓치지 않도록 조금 넓게 거르고, 사유는 exit_reason 으로 확정)
+MARGIN = 1e-9
+
+# 종목별 기준 가격 행 인덱스
+BUY_PRICE, HIGHEST, TAKE_PROFIT, STOP_LOSS, TRAILING, RATIO, UPPER, LOWER = range(8)
+
+
+# -----------------------------------
+# 🔵 2. 보유 종목 매도 기준 가격
+# -----------------------------------
+class PositionRisk:
+    """
+    보유 종목별 익절 / 손절 / 트레일링 스탑 기준 가격을 미리 계산해 두는 매도 판단 엔진
+    - 익절가 / 손절가는 매입가가 바뀔 때(체결, 잔고 보정)만, 트레일링 스탑 가격은 최고가가 갱신될 때만 다시 계산
+    - 틱마다: 현재가 ≥ 상단(익절가) 또는 ≤ 하단(손절가 / 트레일링 가격 중 높은 쪽)인지 비교만 함
+      · 걸린 경우에만 strategy.exit_reason 으로 사유 확정 → 판단 결과는 기존 규칙(익절 → 손절 → 트레일링)과 같음
+    - positions: Kiwoom.own_stocks (OrderManager 원장) 참조, 최고가 갱신은 원장의 highest_price 에도 반영
+    - trailing_ratios: 종목별 트레일링 비율 (없는 종목은 trailing_ratio)
+    """
+
+    def __init__(self, positions, max_profit_rate, max_loss_rate, trailing_ratio=TRAILING_STOP_RATIO,
+                 trailing_ratios=None):
+        self.positions = positions
+        self.max_profit_rate = max_profit_rate
+        self.max_loss_rate = max_loss_rate
+        self.trailing_ratio = trailing_ratio
+        self.trailing_ratios = dict(trailing_ratios or {})
+        self._levels = {}           # 종목코드 → [매입가, 최고가, 익절가, 손절가, 트레일링 가격, 비율, 상단, 하단]
+
+    def __contains__(self, code):
+        return code in self._levels
+
+    def __len__(self):
+        return len(self._levels)
+
+    # ---- 보유 종목 반영 ----
+    def refresh(self, code):
+        """원장의 보유 종목 1개 다시 반영 (체결 직후) – 매입가가 그대로면 기준 가격 재계산 없음"""
+        stock = self.positions.get(code)
+        if stock is None:
+            self._levels.pop(code, None)
+            return
+        levels = self._levels.get(code)
+        buy_price, highest = stock["buy_price"], stock["highest_price"]
+        if levels is not None and levels[BUY_PRICE] == buy_price:
+            if highest > levels[HIGHEST]:
+                self._raise_high(levels, highest)
+            return
+        self._levels[code] = self._build(code, buy_price, highest)
+
+    def sync(self):
+        """원장 전체 다시 반영 (잔고 보정 / 재시작 후)"""
+        for code in [code for code in self._levels if code not in self.positions]:
+            del self._levels[code]
+        for code in self.positions:
+            self.refresh(code)
+
+    def _build(self, code, buy_price, highest):
+        ratio = self.trailing_ratios.get(code, self.trailing_ratio)
+        if buy_price > 0:
+            take_profit = buy_price * (1 + self.max_profit_rate / 100)
+            stop_loss = buy_price * (1 + self.max_loss_rate / 100)
+        else:
+            # 매입가 0 → 수익률 0 으로 보는 exit_reason 에 맡김 (항상 확인)
+            take_profit, stop_loss = float("-inf"), float("inf")
+        levels = [buy_price, highest, take_profit, stop_loss, highest * ratio, ratio,
+                  take_profit * (1 - MARGIN), 0.0]
+        levels[LOWER] = max(stop_loss, levels[TRAILING]) * (1 + MARGIN)
+        return levels
+
+    def _raise_high(self, levels, highest):
+        """최고가 갱신 → 트레일링 스탑 가격 / 하단만 이동"""
+        levels[HIGHEST] = highest
+        levels[TRAILING] = trailing = highest * levels[RATIO]
+        stop_loss = levels[STOP_LOSS]
+        levels[LOWER] = (stop_loss if stop_loss > trailing else trailing) * (1 + MARGIN)
+
+    # ---- 틱 판단 ----
+    def check(self, code, price, high=None):
+        """
+        현재가(와 구간 고가)로 매도 판단 → EXIT_* 코드 (보유하지 않은 종목이면 None)
+        - 구간 고가가 보유 중 최고가를 넘으면 먼저 최고가 / 트레일링 가격을 올린 뒤 판단
+        """
+        levels = self._levels.get(code)
+        if levels is None:
+            return None
+        peak = price if high is None or high < price else high
+        if peak > levels[HIGHEST]:
+            self._raise_high(levels, peak)
+            self.positions[code]["highest_price"] = peak
+        if levels[LOWER] < price < levels[UPPER]:
+            return EXIT_NONE
+        return exit_reason(levels[BUY_PRICE], price, levels[HIGHEST], self.max_profit_rate, self.max_loss_rate,
+                           levels[RATIO])
+
+    def levels(self, code):
+        """종목 기준 가격 (조회용 dict, 보유하지 않으면 None)"""
+        levels = self._levels.get(code)
+        if levels is None:
+            return None
+        return {"buy_price": levels[BUY_PRICE], "highest_price": levels[HIGHEST], "take_profit": levels[TAKE_PROFIT],
+                "stop_loss": levels[STOP_LOSS], "trailing_stop": levels[TRAILING], "trailing_ratio": levels[RATIO]}
+
+    # ---- 보유 전 종목 일괄 점검 ----
+    def table(self):
+        """보유 종목 기준 가격 배열 {codes, buy_price, highest, take_profit, stop_loss, trailing, ratio} (종목 순서 동일)"""
+        import numpy as np
+
+        codes = list(self._levels)
+        rows = np.array([self._levels[code] for code in codes], dtype=np.float64).reshape(len(codes), 8)
+        return {"codes": codes, "buy_price": rows[:, BUY_PRICE], "highest": rows[:, HIGHEST],
+                "take_profit": rows[:, TAKE_PROFIT], "stop_loss": rows[:, STOP_LOSS],
+                "trailing": rows[:, TRAILING], "ratio": rows[:, RATIO]}
+
+    def sweep(self, prices):
+        """
+        보유 전 종목 한 번에 매도 판단 (시가 갭, 잔고 보정으로 매입가가 바뀐 경우 등) → {종목코드: EXIT_* 코드}
+        - prices: {종목코드: 현재가} (가격이 없는 종목은 건너뜀), 최고가 갱신도 함께 반영
+        - 종목별 트레일링 비율이 달라도 strategy.exit_reasons 한 번으로 계산
+        """
+        import numpy as np
+
+        codes = [code for code in self._levels if prices.get(code)]
+        if not codes:
+            return {}
+        for code in codes:
+            price = prices[code]
+            if price > self._levels[code][HIGHEST]:
+                self._raise_high(self._levels[code], price)
+                self.positions[code]["highest_price"] = price
+
+        rows = np.array([self._levels[code] for code in codes], dtype=np.float64)
+        current = np.array([prices[code] for code in codes], dtype=np.float64)
+        reasons = exit_reasons(rows[:, BUY_PRICE], current, rows[:, HIGHEST], self.max_profit_rate,
+                               self.max_loss_rate, rows[:, RATIO])
+        return {codes[i]: int(reasons[i]) for i in np.flatnonzero(reasons != EXIT_NONE).tolist()}
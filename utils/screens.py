@@ -0,0 +1,164 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import heapq
+
+MAX_SCREENS = 200               # 키움 OpenAPI 프로세스당 화면번호 최대 개수
+MAX_CODES_PER_SCREEN = 100      # 화면 1개당 실시간 등록 종목 한도
+
+
+# -----------------------------------
+# 🔵 2. 화면번호 대역
+# -----------------------------------
+class ScreenPool:
+    """화면번호 대역 [first, first + count) 할당 / 반납 (반납된 번호를 작은 번호부터 재사용)"""
+
+    def __init__(self, first, count):
+        self.first = first
+        self.count = count
+        self._free = list(range(first, first + count))
+        heapq.heapify(self._free)
+        self.in_use = set()
+
+    def acquire(self):
+        """빈 화면번호 (문자열, 대역이 모두 사용 중이면 None)"""
+        if not self._free:
+            return None
+        screen = str(heapq.heappop(self._free))
+        self.in_use.add(screen)
+        return screen
+
+    def release(self, screen):
+        if screen in self.in_use:
+            self.in_use.discard(screen)
+            heapq.heappush(self._free, int(screen))
+
+
+# -----------------------------------
+# 🔵 3. 화면번호 관리자
+# -----------------------------------
+class ScreenManager:
+    """
+    프로세스 1개가 쓰는 화면번호 관리 (TR / 실시간 / 주문)
+    - TR: 요청 전송 시 대역에서 빌려 연속조회가 끝나면 반납 (DisconnectRealData 로 OCX 쪽 화면도 해제)
+    - 실시간: 화면당 codes_per_screen 종목까지 채워 최소 화면 수로 등록, 빈자리(해제된 종목)부터 다시 채움
+      · 처음 한 번만 "0"(교체), 이후에는 "1"(추가) 모드로 SetRealReg → 다른 화면 등록을 건드리지 않음
+      · 종목 해제는 SetRealRemove, 화면이 비면 DisconnectRealData 후 반납
+    - close: 지금까지 쓴 화면 전부 해제 (종료 시)
+    """
+
+    def __init__(self, transport, fids="10", offset=0, codes_per_screen=MAX_CODES_PER_SCREEN,
+                 tr_first=2000, tr_count=20, real_first=5001, real_count=99, order_screen=5000):
+        if tr_count + real_count + 1 > MAX_SCREENS:
+            raise ValueError(f"화면번호는 최대 {MAX_SCREENS}개까지 사용할 수 있습니다")
+        self.transport = transport
+        self.fids = fids
+        self.codes_per_screen = max(1, min(codes_per_screen, MAX_CODES_PER_SCREEN))
+        self.tr = ScreenPool(tr_first + offset, tr_count)
+        self.real = ScreenPool(real_first + offset, real_count)
+        self.order_screen = str(order_screen + offset)
+
+        self.screens = {}           # 실시간 화면번호 → 등록 종목 집합
+        self.code_screen = {}       # 종목코드 → 실시간 화면번호
+        self.used = {self.order_screen}   # 한 번이라도 쓴 화면번호 (종료 시 해제 대상)
+
+    def __len__(self):
+        return len(self.code_screen)
+
+    def __contains__(self, code):
+        return code in self.code_screen
+
+    @property
+    def codes(self):
+        return list(self.code_screen)
+
+    def screen_of(self, code):
+        return self.code_screen.get(code)
+
+    # ---- TR ----
+    def acquire_tr(self):
+        """TR 요청용 화면번호 (대역이 모두 사용 중이면 None → 반납될 때까지 대기)"""
+        screen = self.tr.acquire()
+        if screen is not None:
+            self.used.add(screen)
+        return screen
+
+    def release_tr(self, screen):
+        if screen in self.tr.in_use:
+            self.transport.dynamicCall("DisconnectRealData(QString)", screen)
+            self.tr.release(screen)
+
+    # ---- 실시간 ----
+    def add_real(self, codes):
+        """
+        종목 실시간 등록 (이미 등록된 종목은 건너뜀) → 새로 등록한 종목 목록
+        - 여유 있는 화면(번호 순)부터 채우고 모자라면 새 화면을 빌림, 화면 1개당 SetRealReg 1회
+        """
+        pending = [code for code in dict.fromkeys(codes) if code not in self.code_screen]
+        batches = []
+        for screen in sorted(self.screens, key=int):
+            if not pending:
+                break
+            space = self.codes_per_screen - len(self.screens[screen])
+            if space > 0:
+                batches.append((screen, pending[:space]))
+                pending = pending[space:]
+        while pending:
+            screen = self.real.acquire()
+            if screen is None:
+                print(f"[⚠️ 실시간 화면번호 부족] {len(pending)}종목 등록 실패 (화면 {self.real.count}개 사용 중)")
+                break
+            self.used.add(screen)
+            self.screens[screen] = set()
+            batches.append((screen, pending[:self.codes_per_screen]))
+            pending = pending[self.codes_per_screen:]
+
+        registered = []
+        for screen, batch in batches:
+            opt_type = "1" if self.code_screen else "0"
+            self.transport.dynamicCall(
+                "SetRealReg(QString, QString, QString, QString)",
+                screen, ";".join(batch), self.fids, opt_type
+            )
+            self.screens[screen].update(batch)
+            for code in batch:
+                self.code_screen[code] = screen
+            registered.extend(batch)
+            print(f"[✅ 실시간 등록 완료] 화면번호 {screen} → {len(batch)}종목 추가 (화면 내 {len(self.screens[screen])}종목)")
+        return registered
+
+    def remove_real(self, codes):
+        """종목 실시간 해제 → 해제한 종목 목록 (화면이 비면 화면도 해제 후 반납)"""
+        removed = []
+        for code in codes:
+            screen = self.code_screen.pop(code, None)
+            if screen is None:
+                continue
+            self.transport.dynamicCall("SetRealRemove(QString, QString)", screen, code)
+            members = self.screens[screen]
+            members.discard(code)
+            removed.append(code)
+            if not members:
+                self.transport.dynamicCall("DisconnectRealData(QString)", screen)
+                del self.screens[screen]
+                self.real.release(screen)
+        if removed:
+            print(f"[🔕 실시간 해제] {len(removed)}종목 / 사용 화면 {len(self.screens)}개")
+        return removed
+
+    def set_real(self, codes):
+        """등록 종목을 codes 로 맞춤 (빠진 종목 해제 → 새 종목 추가, 그대로인 종목은 재등록하지 않음)"""
+        wanted = set(codes)
+        self.remove_real([code for code in self.code_screen if code not in wanted])
+        return self.add_real(codes)
+
+    def close(self):
+        """사용한 모든 화면 해제 (실시간 / TR / 주문)"""
+        for screen in sorted(self.used, key=int):
+            self.transport.dynamicCall("DisconnectRealData(QString)", screen)
+        self.screens.clear()
+        self.code_screen.clear()
+        self.tr = ScreenPool(self.tr.first, self.tr.count)
+        self.real = ScreenPool(self.real.first, self.real.count)
+        count, self.used = len(self.used), {self.order_screen}
+        return count
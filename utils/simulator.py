@@ -0,0 +1,527 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import csv
+import random
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta, time as dtime
+
+from transport import BrokerTransport
+from market_calendar import KrxCalendar
+
+# -----------------------------------
+# 🔵 2. 시그널 / 이벤트 루프 / 타이머 대체 객체
+# -----------------------------------
+class SimSignal:
+    """pyqtSignal 과 같은 connect/emit 인터페이스"""
+
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def emit(self, *args):
+        for slot in self._slots:
+            slot(*args)
+
+
+class SimEventLoop:
+    """QEventLoop 대체: exit() 호출 전까지 시뮬레이터의 대기 이벤트를 처리"""
+
+    def __init__(self, sim):
+        self.sim = sim
+        self._running = False
+
+    def exec_(self):
+        self._running = True
+        while self._running:
+            if not self.sim.process_events():
+                print("[⚠️ 시뮬레이터] 대기 중인 이벤트 없음 → 이벤트 루프 종료")
+                break
+        self._running = False
+
+    def exit(self):
+        self._running = False
+
+
+class SimTimer:
+    """QTimer 대체: 시뮬레이터 가상 시계 기준으로 timeout 발생"""
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.timeout = SimSignal()
+        self.interval = 0
+        self.single_shot = False
+        self.deadline = None
+
+    def setSingleShot(self, flag):
+        self.single_shot = flag
+
+    def start(self, msec=None):
+        if msec is not None:
+            self.interval = msec
+        self.deadline = self.sim.clock + self.interval / 1000
+
+    def stop(self):
+        self.deadline = None
+
+    def isActive(self):
+        return self.deadline is not None
+
+
+class SimApp:
+    """QApplication 대체: exec_() 에서 틱 리플레이 실행"""
+
+    def __init__(self, sim):
+        self.sim = sim
+
+    def exec_(self):
+        return self.sim.replay()
+
+    def quit(self):
+        self.sim.stop()
+
+
+# -----------------------------------
+# 🔵 3. 틱 / 일봉 데이터 생성 및 파일 입출력
+# -----------------------------------
+def parse_clock(text):
+    """'HH:MM:SS.fff' → 자정 기준 초"""
+    hh, mm, ss = text.split(':')
+    return int(hh) * 3600 + int(mm) * 60 + float(ss)
+
+
+def format_clock(seconds):
+    """자정 기준 초 → 'HH:MM:SS.fff'"""
+    hh, rest = divmod(seconds, 3600)
+    mm, ss = divmod(rest, 60)
+    return f"{int(hh):02d}:{int(mm):02d}:{ss:06.3f}"
+
+
+def load_ticks(file_path):
+    """틱 CSV (time,code,price,volume) 로드 → [(초, 종목코드, 가격, 거래량), ...]"""
+    ticks = []
+    with open(file_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            ticks.append((parse_clock(row['time']), row['code'], int(row['price']), int(row.get('volume') or 0)))
+    ticks.sort(key=lambda t: t[0])
+    return ticks
+
+
+def save_ticks(file_path, ticks):
+    """틱 목록을 CSV 로 저장"""
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["time", "code", "price", "volume"])
+        for t, code, price, volume in ticks:
+            writer.writerow([format_clock(t), code, price, volume])
+
+
+def generate_daily_bars(code, count=600, end_date=None, seed=None):
+    """종목별 합성 일봉 생성 (과거 → 최신, [(일자, 시가, 고가, 저가, 종가, 거래량), ...])"""
+    rng = random.Random(zlib.crc32(code.encode()) if seed is None else seed)
+    end_date = end_date or datetime.now().date()
+
+    # 주말을 제외한 거래일 목록 (최신 → 과거)
+    dates = []
+    day = end_date
+    while len(dates) < count:
+        if day.weekday() < 5:
+            dates.append(day.strftime("%Y%m%d"))
+        day -= timedelta(days=1)
+    dates.reverse()
+
+    bars = []
+    close = rng.randint(50, 1000) * 100
+    for date in dates:
+        open_ = close
+        close = max(100, int(close * (1 + rng.gauss(0, 0.02))))
+        high = int(max(open_, close) * (1 + abs(rng.gauss(0, 0.01))))
+        low = int(min(open_, close) * (1 - abs(rng.gauss(0, 0.01))))
+        bars.append((date, open_, high, low, close, rng.randint(10_000, 1_000_000)))
+    return bars
+
+
+def generate_daily_panel(count_symbols, count=2500, end_date=None, seed=0):
+    """
+    여러 종목 합성 일봉을 한 번에 생성 (백테스트용, NumPy 랜덤 워크)
+    → dict(codes, dates(YYYYMMDD int), open/high/low/close/volume: (종목 × 봉) 배열)
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    end_date = end_date or datetime.now().date()
+
+    dates = []
+    day = end_date
+    while len(dates) < count:
+        if day.weekday() < 5:
+            dates.append(int(day.strftime("%Y%m%d")))
+        day -= timedelta(days=1)
+    dates.reverse()
+
+    shape = (count_symbols, count)
+    start = rng.integers(50, 1000, size=(count_symbols, 1)) * 100.0
+    returns = rng.normal(0, 0.02, size=shape)
+    close = np.maximum(100.0, np.floor(start * np.cumprod(1 + returns, axis=1)))
+    open_ = np.concatenate([start, close[:, :-1]], axis=1)
+    high = np.floor(np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, size=shape))))
+    low = np.floor(np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, size=shape))))
+    volume = rng.integers(10_000, 1_000_000, size=shape).astype(np.float64)
+    return {
+        "codes": [f"{i:06d}" for i in range(count_symbols)],
+        "dates": np.array(dates, dtype=np.int64),
+        "open": open_, "high": high, "low": low, "close": close, "volume": volume,
+    }
+
+
+def generate_ticks(codes, count, start="09:00:00", rate=1000.0, base_prices=None, seed=0):
+    """여러 종목의 합성 체결 틱 생성 (초당 rate 건, 종목별 랜덤 워크)"""
+    rng = random.Random(seed)
+    codes = list(codes)
+    prices = {code: (base_prices or {}).get(code) or rng.randint(50, 1000) * 100 for code in codes}
+    t = parse_clock(start)
+
+    ticks = []
+    for _ in range(count):
+        code = rng.choice(codes)
+        prices[code] = max(100, int(prices[code] * (1 + rng.gauss(0, 0.002))))
+        t += rng.expovariate(rate)
+        ticks.append((t, code, prices[code], rng.randint(1, 500)))
+    return ticks
+
+
+# -----------------------------------
+# 🔵 4. 시뮬레이터 전송 계층
+# -----------------------------------
+class SimulatedTransport(BrokerTransport):
+    """
+    키움 OCX 를 흉내내는 인프로세스 시뮬레이터
+    - dynamicCall 을 로컬 데이터로 응답
+    - 기록/합성 틱을 최대 속도(speed=0) 또는 실시간의 speed 배속으로 OnReceiveRealData 에 재생
+    - TR 응답, 체결(Chejan) 이벤트와 주문 메시지(OnReceiveMsg)는 큐에 쌓였다가 이벤트 루프에서 전달
+    """
+    headless = True
+
+    def __init__(self, ticks=None, daily_bars=None, speed=0, cash=10_000_000, session_date=None):
+        self.app = SimApp(self)
+        self.OnEventConnect = SimSignal()
+        self.OnReceiveTrData = SimSignal()
+        self.OnReceiveRealData = SimSignal()
+        self.OnReceiveChejanData = SimSignal()
+        self.OnReceiveMsg = SimSignal()
+
+        self.ticks = ticks or []
+        self.daily_bars = daily_bars or {}
+        self.speed = speed
+        self.cash = cash
+        self.session_date = session_date or KrxCalendar().last_trading_day(datetime.now().date())
+        self.clock = self.ticks[0][0] if self.ticks else 9 * 3600.0
+
+        self.account_number = "8000000011"
+        self.positions = {}         # 종목코드 → [보유수량, 매입단가]
+        self.stats = {}
+
+        self._pending = deque()     # 전달 대기 중인 이벤트 (콜백, 인자)
+        self._timers = []
+        self._inputs = {}
+        self._tr_single = {}        # (trcode, rqname) → 싱글 데이터
+        self._tr_rows = {}          # (trcode, rqname) → 멀티 데이터
+        self._tr_cursor = {}        # (trcode, 화면번호) → 연속조회 위치 (실제 OCX 처럼 rqname 이 바뀌어도 이어짐)
+        self._tr_last = {}          # trcode → 마지막으로 수신 이벤트를 보낸 (trcode, rqname)
+        self._real_screens = {}     # 화면번호 → 등록 종목 집합
+        self._real_codes = set()
+        self._last_price = {}
+        self._real_fields = {}
+        self._cum_volume = {}       # 종목별 누적거래량 (FID 13)
+        self._chejan_fields = {}
+        self._order_no = 0
+        self._stopped = False
+
+        self._calls = {
+            "CommConnect": self._comm_connect,
+            "GetLoginInfo": self._get_login_info,
+            "SetInputValue": self._set_input_value,
+            "CommRqData": self._comm_rq_data,
+            "GetRepeatCnt": self._get_repeat_cnt,
+            "GetCommData": self._get_comm_data,
+            "GetCommDataEx": self._get_comm_data_ex,
+            "SetRealReg": self._set_real_reg,
+            "SetRealRemove": self._set_real_remove,
+            "DisconnectRealData": self._disconnect_real_data,
+            "GetCommRealData": self._get_comm_real_data,
+            "GetMasterLastPrice": self._get_master_last_price,
+            "SendOrder": self._send_order,
+            "GetChejanData": self._get_chejan_data,
+        }
+
+    # ---- 전송 계층 인터페이스 ----
+    def dynamicCall(self, signature, *args):
+        name = signature.split('(', 1)[0]
+        handler = self._calls.get(name)
+        if handler is None:
+            return ""
+        return handler(*args)
+
+    def create_event_loop(self):
+        return SimEventLoop(self)
+
+    def create_timer(self, precise=False):
+        timer = SimTimer(self)
+        self._timers.append(timer)
+        return timer
+
+    def now(self):
+        return datetime.combine(self.session_date, dtime(0, 0)) + timedelta(seconds=self.clock)
+
+    # ---- 이벤트 처리 ----
+    def _post(self, callback, *args):
+        self._pending.append((callback, args))
+
+    def process_events(self):
+        """대기 중인 이벤트를 모두 전달 (전달한 이벤트가 있으면 True)"""
+        delivered = False
+        while self._pending:
+            callback, args = self._pending.popleft()
+            callback(*args)
+            delivered = True
+        return delivered
+
+    def advance_clock(self, t):
+        """가상 시계를 t 까지 진행하며 만료된 타이머 실행"""
+        while not self._stopped:
+            due = [tm for tm in self._timers if tm.deadline is not None and tm.deadline <= t]
+            if not due:
+                break
+            timer = min(due, key=lambda tm: tm.deadline)
+            self.clock = timer.deadline
+            if timer.single_shot:
+                timer.deadline = None
+            else:
+                timer.deadline += max(timer.interval, 1) / 1000
+            timer.timeout.emit()
+            self.process_events()
+        self.clock = max(self.clock, t)
+
+    def stop(self):
+        self._stopped = True
+
+    def replay(self):
+        """틱 리플레이 실행 후 처리 통계 반환"""
+        print(f"[▶️ 시뮬레이터 리플레이 시작] 틱 {len(self.ticks):,}건 / 배속 {self.speed or '최대'}")
+        self._stopped = False
+        first_t = self.ticks[0][0] if self.ticks else 0
+        delivered = 0
+        start = time.perf_counter()
+
+        for t, code, price, volume in self.ticks:
+            if self._stopped:
+                break
+            if self.speed:
+                wait = (t - first_t) / self.speed - (time.perf_counter() - start)
+                if wait > 0:
+                    time.sleep(wait)
+
+            self.advance_clock(t)
+            self._last_price[code] = price
+            if code not in self._real_codes:
+                continue
+
+            cum_volume = self._cum_volume[code] = self._cum_volume.get(code, 0) + abs(volume)
+            spread = max(price // 1000, 1)    # 합성 최우선 호가 (체결가 ± 약 0.1%)
+            self._real_fields = {10: price, 15: volume, 20: format_clock(t)[:8].replace(':', ''), 13: cum_volume,
+                                 27: price + spread, 28: price - spread}
+            self.OnReceiveRealData.emit(code, "주식체결", "")
+            delivered += 1
+            self.process_events()
+
+        elapsed = time.perf_counter() - start
+        self.stats = {
+            "ticks": delivered,
+            "elapsed": elapsed,
+            "ticks_per_sec": delivered / elapsed if elapsed > 0 else 0.0,
+        }
+        print(f"[⏹️ 시뮬레이터 리플레이 종료] {delivered:,}건 / {elapsed:.3f}초")
+        return self.stats
+
+    # ---- 로그인 ----
+    def _comm_connect(self):
+        self._post(self.OnEventConnect.emit, 0)
+        return 0
+
+    def _get_login_info(self, tag):
+        if tag == "ACCNO":
+            return f"{self.account_number};"
+        if tag == "GetServerGubun":
+            return "1"  # 모의투자 서버
+        return ""
+
+    # ---- TR 조회 ----
+    def _set_input_value(self, key, value):
+        self._inputs[key] = value
+
+    def _comm_rq_data(self, rqname, trcode, prev_next, screen_no):
+        inputs, self._inputs = self._inputs, {}
+        key = (trcode, rqname)
+        more = "0"
+
+        if trcode == "opt10081":
+            more = self._fill_daily_chart(key, (trcode, screen_no), inputs, int(prev_next) == 2)
+        elif trcode == "opw00018":
+            self._fill_balance(key)
+        else:
+            self._tr_single[key], self._tr_rows[key] = {}, []
+
+        self._post(self._emit_tr_data, screen_no, rqname, trcode, more)
+        return 0
+
+    def _emit_tr_data(self, screen_no, rqname, trcode, more):
+        """TR 수신 이벤트 (GetCommDataEx 는 TR 코드별 마지막 수신 데이터를 돌려줌)"""
+        self._tr_last[trcode] = (trcode, rqname)
+        self.OnReceiveTrData.emit(screen_no, rqname, trcode, "", more)
+
+    def _fill_daily_chart(self, key, cursor_key, inputs, is_next, page_size=600):
+        code = inputs.get("종목코드", "")
+        if code not in self.daily_bars:
+            self.daily_bars[code] = generate_daily_bars(code, end_date=self.session_date)
+        base_date = inputs.get("기준일자") or self.session_date.strftime("%Y%m%d")
+        bars = [bar for bar in self.daily_bars[code] if bar[0] <= base_date]
+        bars.reverse()  # 최신 → 과거
+
+        offset = self._tr_cursor.get(cursor_key, 0) if is_next else 0
+        page = bars[offset:offset + page_size]
+        self._tr_cursor[cursor_key] = offset + len(page)
+
+        self._tr_single[key] = {"종목코드": code}
+        self._tr_rows[key] = [
+            {"일자": d, "시가": o, "고가": h, "저가": lo, "현재가": c, "거래량": v}
+            for d, o, h, lo, c, v in page
+        ]
+        return "2" if offset + len(page) < len(bars) else "0"
+
+    def _fill_balance(self, key):
+        self._tr_single[key] = {
+            "출금가능금액": f"{self.cash:015d}",
+            "예수금": f"{self.cash:015d}",
+            "총매입금액": f"{sum(q * p for q, p in self.positions.values()):015d}",
+        }
+        self._tr_rows[key] = [
+            {
+                "종목번호": f"A{code}",
+                "보유수량": f"{qty:015d}",
+                "매입가": f"{avg:015d}",
+                "현재가": f"{self._last_price.get(code, avg):015d}",
+            }
+            for code, (qty, avg) in self.positions.items()
+        ]
+
+    def _get_repeat_cnt(self, trcode, rqname):
+        return len(self._tr_rows.get((trcode, rqname), []))
+
+    def _get_comm_data(self, trcode, rqname, index, field):
+        key = (trcode, rqname)
+        single = self._tr_single.get(key, {})
+        if field in single:
+            return f"{single[field]:>15}"
+        rows = self._tr_rows.get(key, [])
+        if 0 <= index < len(rows):
+            return f"{rows[index].get(field, ''):>15}"
+        return ""
+
+    def _get_comm_data_ex(self, trcode, record_name):
+        """멀티 데이터 전체 (행 × 열 문자열 목록, 열 순서는 tr_records 의 레코드 정의)"""
+        from tr_records import MULTI_RECORDS
+
+        key = self._tr_last.get(trcode)
+        record = MULTI_RECORDS.get(trcode)
+        if key is None or record is None or record[0] != record_name:
+            return []
+        fields = record[1]
+        return [[f"{row.get(field, ''):>15}" for field in fields] for row in self._tr_rows.get(key, [])]
+
+    # ---- 실시간 ----
+    def _set_real_reg(self, screen_no, code_list, fid_list, opt_type):
+        codes = {c for c in code_list.split(';') if c}
+        if str(opt_type) == "0":
+            self._real_screens[screen_no] = set()
+        self._real_screens.setdefault(screen_no, set()).update(codes)
+        self._rebuild_real_codes()
+        return 0
+
+    def _set_real_remove(self, screen_no, code):
+        screens = self._real_screens if screen_no == "ALL" else {screen_no: self._real_screens.get(screen_no, set())}
+        for codes in screens.values():
+            if code == "ALL":
+                codes.clear()
+            else:
+                codes.discard(code)
+        self._rebuild_real_codes()
+
+    def _disconnect_real_data(self, screen_no):
+        self._real_screens.pop(screen_no, None)
+        self._rebuild_real_codes()
+
+    def _rebuild_real_codes(self):
+        self._real_codes = set().union(*self._real_screens.values()) if self._real_screens else set()
+
+    def _get_comm_real_data(self, code, fid):
+        value = self._real_fields.get(int(fid), "")
+        return f"{value:+d}" if isinstance(value, int) else value
+
+    def _get_master_last_price(self, code):
+        price = self._last_price.get(code)
+        if price is None:
+            bars = self.daily_bars.get(code)
+            price = bars[-1][4] if bars else 0
+        return str(price)
+
+    # ---- 주문 / 체결 ----
+    def _send_order(self, rqname, screen_no, account, order_type, code, quantity, price, hoga, org_order_no):
+        if quantity <= 0:
+            return -308  # 주문수량 오류
+        self._order_no += 1
+        order_no = f"{self._order_no:07d}"
+        fill_price = int(self._get_master_last_price(code)) if hoga == "03" or not price else price
+        is_buy = int(order_type) == 1
+        trcode = "KOA_NORMAL_BUY_KP_ORD" if is_buy else "KOA_NORMAL_SELL_KP_ORD"
+        if is_buy and quantity * fill_price > self.cash:
+            # 모의투자 증거금 부족: 체결 이벤트 없이 메시지로만 거부
+            self._post(self.OnReceiveMsg.emit, screen_no, rqname, trcode, "[00Z924] 모의투자 증거금부족")
+            return 0
+        self._post(self.OnReceiveMsg.emit, screen_no, rqname, trcode, "[00Z112] 모의투자 정상처리 되었습니다")
+
+        base = {
+            9201: account, 9203: order_no, 904: "0000000", 9001: f"A{code}", 900: quantity, 901: price,
+            905: "+매수" if is_buy else "-매도", 907: "2" if is_buy else "1",
+            908: self.now().strftime("%H%M%S"), 10: fill_price,
+        }
+        self._post(self._emit_chejan, "0", {**base, 913: "접수", 902: quantity, 910: "", 911: ""})
+        self._post(self._fill_order, code, quantity, fill_price, is_buy, base)
+        return 0
+
+    def _fill_order(self, code, quantity, fill_price, is_buy, base):
+        qty, avg = self.positions.get(code, [0, 0])
+        if is_buy:
+            self.cash -= quantity * fill_price
+            avg = (qty * avg + quantity * fill_price) // (qty + quantity)
+            qty += quantity
+        else:
+            self.cash += quantity * fill_price
+            qty -= min(quantity, qty)
+        if qty > 0:
+            self.positions[code] = [qty, avg]
+        else:
+            self.positions.pop(code, None)
+
+        self._emit_chejan("0", {**base, 913: "체결", 902: 0, 910: fill_price, 911: quantity})
+        self._emit_chejan("1", {9201: base[9201], 9001: f"A{code}", 930: qty, 931: avg, 10: fill_price})
+
+    def _emit_chejan(self, gubun, fields):
+        self._chejan_fields = fields
+        self.OnReceiveChejanData.emit(gubun, len(fields), ";".join(str(fid) for fid in fields))
+
+    def _get_chejan_data(self, fid):
+        return str(self._chejan_fields.get(int(fid), ""))
@@ -0,0 +1,156 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드 (NumPy 는 배열을 인코딩 / 디코딩할 때만 로드)
+# -----------------------------------
+import os
+import json
+import zlib
+import struct
+import threading
+from time import perf_counter_ns
+
+SNAPSHOT_VERSION = 1
+MAGIC = b"KWSNAP"
+HEADER = struct.Struct("<6sHII")    # 매직, 형식 버전, 본문 CRC32, 본문 길이
+META_LENGTH = struct.Struct("<I")
+
+
+class SnapshotError(Exception):
+    """스냅샷 파일 손상 / 형식 버전 불일치"""
+
+
+# -----------------------------------
+# 🔵 2. 스냅샷 형식 (헤더 + zlib 본문)
+# -----------------------------------
+def encode(state, arrays=None):
+    """
+    상태 → 스냅샷 바이트
+    - 본문 = zlib(메타 JSON 길이 + 메타 JSON + 배열 원본 바이트)
+    - 메타 JSON: {"state": state, "arrays": [[이름, dtype, shape], ...]} (배열은 적힌 순서대로 이어 붙임)
+    """
+    layout, blobs = [], []
+    if arrays:
+        import numpy as np
+
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            layout.append([name, array.dtype.str, list(array.shape)])
+            blobs.append(array.tobytes())
+    meta = json.dumps({"state": state, "arrays": layout}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body = zlib.compress(META_LENGTH.pack(len(meta)) + meta + b"".join(blobs), 6)
+    return HEADER.pack(MAGIC, SNAPSHOT_VERSION, zlib.crc32(body), len(body)) + body
+
+
+def decode(data):
+    """스냅샷 바이트 → (state, {이름: 배열}) – 손상 / 버전 불일치는 SnapshotError"""
+    if len(data) < HEADER.size:
+        raise SnapshotError("스냅샷 헤더가 잘렸습니다")
+    magic, version, crc, length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("스냅샷 파일이 아닙니다")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"지원하지 않는 스냅샷 버전: {version} (현재 {SNAPSHOT_VERSION})")
+    body = data[HEADER.size:HEADER.size + length]
+    if len(body) != length or zlib.crc32(body) != crc:
+        raise SnapshotError("스냅샷 본문이 손상되었습니다 (CRC 불일치)")
+
+    raw = zlib.decompress(body)
+    (meta_length,) = META_LENGTH.unpack_from(raw)
+    offset = META_LENGTH.size + meta_length
+    meta = json.loads(raw[META_LENGTH.size:offset].decode("utf-8"))
+
+    arrays = {}
+    if meta["arrays"]:
+        import numpy as np
+
+        for name, dtype, shape in meta["arrays"]:
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            arrays[name] = np.frombuffer(raw, dtype=dtype, count=count, offset=offset).reshape(shape).copy()
+            offset += count * dtype.itemsize
+    return meta["state"], arrays
+
+
+def write_snapshot(path, data):
+    """임시 파일에 쓰고 fsync 후 교체 (쓰는 도중 종료되어도 이전 스냅샷은 그대로)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    """스냅샷 파일 → (state, arrays), 파일이 없으면 None"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    return decode(data)
+
+
+# -----------------------------------
+# 🔵 3. 백그라운드 기록기
+# -----------------------------------
+class SnapshotWriter:
+    """
+    별도 데몬 스레드에서 스냅샷 인코딩 / 압축 / 파일 교체 (매매 스레드는 상태 복사본만 넘김)
+    - 기록이 밀리면 가장 최근 상태만 씀 (대기 슬롯 1개, 이전 대기분은 덮어씀)
+    - close: 대기 중인 스냅샷까지 쓰고 종료
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.latency = None         # 기록 1회 지연 시간 히스토그램 (메트릭 사용 시 연결)
+        self.written = 0
+        self.failed = 0
+        self.superseded = 0         # 기록 전에 더 최신 상태로 교체된 건수
+        self.last_bytes = 0
+        self._pending = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name="state-snapshot", daemon=True)
+        self._thread.start()
+
+    def submit(self, state, arrays=None):
+        with self._cond:
+            if self._pending is not None:
+                self.superseded += 1
+            self._pending = (state, arrays)
+            self._cond.notify()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                state, arrays = self._pending
+                self._pending = None
+            self._write(state, arrays)
+
+    def _write(self, state, arrays):
+        start = perf_counter_ns()
+        try:
+            data = encode(state, arrays)
+            write_snapshot(self.path, data)
+            self.written += 1
+            self.last_bytes = len(data)
+        except Exception as e:
+            self.failed += 1
+            print(f"[⚠️ 상태 스냅샷 저장 실패]: {e}")
+        if self.latency is not None:
+            self.latency.record(perf_counter_ns() - start)
+
+    def close(self, timeout=5.0):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+
+    def stats(self):
+        return {"written": self.written, "failed": self.failed, "superseded": self.superseded,
+                "last_bytes": self.last_bytes}
@@ -0,0 +1,101 @@
+# -----------------------------------
+# 🔵 1. 상수 (실시간 경로는 표준 라이브러리만 사용, NumPy 는 배열 버전에서만 로드)
+# -----------------------------------
+# 지표 계산에 필요한 최소 일봉 수 (미만이면 종목 제외)
+MIN_HISTORY_BARS = 50
+
+# 트레일링 스탑: 보유 중 최고가 대비 이 비율 아래로 내려가면 매도
+TRAILING_STOP_RATIO = 0.97
+
+# 매도 사유 코드 (벡터 판단 결과)
+EXIT_NONE, EXIT_TAKE_PROFIT, EXIT_STOP_LOSS, EXIT_TRAILING_STOP = 0, 1, 2, 3
+EXIT_NAMES = {EXIT_TAKE_PROFIT: "익절", EXIT_STOP_LOSS: "손절", EXIT_TRAILING_STOP: "트레일링 스탑"}
+
+
+# -----------------------------------
+# 🔵 2. 매수 신호 (실시간 / 백테스트 공용, 스칼라와 배열 모두 지원)
+# -----------------------------------
+def golden_cross(prev_macd, prev_signal, macd, signal):
+    """직전 확정 봉 MACD < Signal 이고 현재 봉 MACD > Signal"""
+    return (prev_macd < prev_signal) & (macd > signal)
+
+
+def ema5_breakout(close, ema5):
+    """현재가가 5일 이평선 위"""
+    return close > ema5
+
+
+# -----------------------------------
+# 🔵 3. 매도 규칙 (익절 → 손절 → 트레일링 스탑 순서)
+# -----------------------------------
+def profit_rate(buy_price, current_price):
+    """수익률(%) – 매입가가 0 이면 0"""
+    try:
+        return ((current_price - buy_price) / buy_price) * 100
+    except ZeroDivisionError:
+        return 0
+
+
+def exit_reason(buy_price, current_price, highest_price, max_profit_rate, max_loss_rate,
+                trailing_ratio=TRAILING_STOP_RATIO):
+    """보유 1종목 매도 판단 → EXIT_* 코드"""
+    rate = profit_rate(buy_price, current_price)
+    if rate >= max_profit_rate:
+        return EXIT_TAKE_PROFIT
+    if rate <= max_loss_rate:
+        return EXIT_STOP_LOSS
+    if current_price < highest_price * trailing_ratio:
+        return EXIT_TRAILING_STOP
+    return EXIT_NONE
+
+
+def exit_reasons(buy_price, current_price, highest_price, max_profit_rate, max_loss_rate,
+                 trailing_ratio=TRAILING_STOP_RATIO):
+    """exit_reason 의 배열 버전 (같은 우선순위, 종목 벡터 → EXIT_* 코드 배열)"""
+    import numpy as np
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(buy_price > 0, (current_price - buy_price) / buy_price * 100, 0.0)
+    return np.select(
+        [rate >= max_profit_rate, rate <= max_loss_rate, current_price < highest_price * trailing_ratio],
+        [EXIT_TAKE_PROFIT, EXIT_STOP_LOSS, EXIT_TRAILING_STOP],
+        default=EXIT_NONE,
+    )
+
+
+# -----------------------------------
+# 🔵 4. 분할 매수 수량 (종목당 투자비율 제한)
+# -----------------------------------
+def split_buy_quantities(cash, price, max_stock_ratio, buy_split_count):
+    """
+    분할 매수 회차별 수량 목록 (수량 0 회차 제외)
+    - 1회 금액 = 현금 × 투자비율 / 분할 횟수, 회차마다 남은 현금이 1회 금액보다 적으면 중단
+    """
+    split_amount = cash * (max_stock_ratio / 100) / buy_split_count
+    quantities = []
+    for _ in range(buy_split_count):
+        if cash < split_amount:
+            break
+        quantity = int(split_amount // price)
+        if quantity < 1:
+            continue
+        quantities.append(quantity)
+        cash -= quantity * price
+    return quantities
+
+
+def split_buy_total(cash, price, max_stock_ratio, buy_split_count):
+    """split_buy_quantities 의 배열 버전 (종목 벡터 → 총 매수 수량 배열)"""
+    import numpy as np
+
+    cash = np.asarray(cash, dtype=np.float64).copy()
+    split_amount = cash * (max_stock_ratio / 100) / buy_split_count
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quantity = np.where(price > 0, np.floor(split_amount / price), 0.0)
+    total = np.zeros_like(cash)
+    active = quantity >= 1
+    for _ in range(buy_split_count):
+        active &= cash >= split_amount
+        total += np.where(active, quantity, 0.0)
+        cash -= np.where(active, quantity * price, 0.0)
+    return total
@@ -0,0 +1,270 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드 (NumPy 는 전략이 받는 배열에서만 사용, 임포트 시 로드하지 않음)
+# -----------------------------------
+import importlib
+from ast import literal_eval
+from strategy import golden_cross, ema5_breakout
+
+STRATEGIES = {}                 # 전략 이름 → 전략 클래스
+GROUP_PREFIX = "STRATEGY:"      # 종목 그룹별 전략 섹션 ([STRATEGY:그룹명])
+
+
+def register_strategy(cls):
+    """전략 클래스 등록 데코레이터 (cls.name 으로 config.ini 에서 선택)"""
+    STRATEGIES[cls.name] = cls
+    return cls
+
+
+# -----------------------------------
+# 🔵 2. 전략 입력 (종목 묶음의 지표 / 가격 배열)
+# -----------------------------------
+class StrategyView:
+    """
+    종목 묶음 1개의 지표 / 가격 배열 (모두 codes 와 같은 길이, 같은 순서)
+    - close, ema5, ema12, ema26, macd, signal: 현재가로 만든 오늘 봉 잠정 지표
+    - prev_macd, prev_signal: 직전 확정 봉 값
+    - high, low: 결정 루프 구간 고가 / 저가, held: 보유 여부
+    - tick_store: 실시간 틱 / 분봉 저장소 (틱 저장을 켠 경우, 아니면 None)
+    """
+
+    def __init__(self, arrays, tick_store=None):
+        self.arrays = arrays
+        self.codes = arrays["codes"]
+        self.tick_store = tick_store
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["arrays"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def take(self, rows):
+        """일부 종목만 남긴 뷰 (rows: 위치 배열 또는 bool 마스크)"""
+        arrays = {name: values[rows] for name, values in self.arrays.items() if name != "codes"}
+        codes = self.codes
+        if getattr(rows, "dtype", None) == bool:
+            arrays["codes"] = [code for code, keep in zip(codes, rows.tolist()) if keep]
+        else:
+            arrays["codes"] = [codes[i] for i in rows.tolist()]
+        return StrategyView(arrays, self.tick_store)
+
+
+# -----------------------------------
+# 🔵 3. 전략 플러그인
+# -----------------------------------
+class Strategy:
+    """
+    전략 플러그인 기본 클래스
+    - buy(view) → 종목별 매수 신호 bool 배열 (view 길이), None 이면 매수 판단에 참여하지 않음
+    - sell(view) → 보유 종목 매도 신호 bool 배열, None 이면 익절 / 손절 / 트레일링 스탑 규칙만 사용
+    - 설정값은 생성자 키워드 인자 ([STRATEGY] 섹션의 '전략이름.파라미터 = 값')
+    """
+    name = None
+
+    def __init__(self, **params):
+        self.params = params
+
+    def buy(self, view):
+        return None
+
+    def sell(self, view):
+        return None
+
+
+@register_strategy
+class MacdCross(Strategy):
+    """MACD 골든크로스 (직전 확정 봉 MACD < Signal → 오늘 잠정 봉 MACD > Signal)"""
+    name = "macd"
+
+    def buy(self, view):
+        return golden_cross(view.prev_macd, view.prev_signal, view.macd, view.signal)
+
+
+@register_strategy
+class Ema5Breakout(Strategy):
+    """현재가가 5일 이평선 위"""
+    name = "ema5"
+
+    def buy(self, view):
+        return ema5_breakout(view.close, view.ema5)
+
+
+@register_strategy
+class MacdExit(Strategy):
+    """매도 전용: MACD 데드크로스 (직전 확정 봉 MACD > Signal → 오늘 잠정 봉 MACD < Signal)"""
+    name = "macd_exit"
+
+    def sell(self, view):
+        return (view.prev_macd > view.prev_signal) & (view.macd < view.signal)
+
+
+def resolve_strategy(spec):
+    """전략 이름(등록된 이름) 또는 '모듈:클래스' → 전략 클래스"""
+    cls = STRATEGIES.get(spec)
+    if cls is None:
+        if ":" not in spec:
+            raise ValueError(f"알 수 없는 전략: {spec} (등록된 전략: {', '.join(sorted(STRATEGIES))})")
+        module_name, class_name = spec.split(":", 1)
+        cls = getattr(importlib.import_module(module_name), class_name)
+    return cls
+
+
+def load_strategy(spec, params=None):
+    """전략 이름(등록된 이름) 또는 '모듈:클래스' → 전략 객체"""
+    return resolve_strategy(spec)(**(params or {}))
+
+
+def param_prefixes(cls):
+    """
+    config.ini 에서 전략 파라미터 키 앞에 붙일 수 있는 이름 (소문자)
+    - ConfigParser 는 키를 소문자로 바꾸고 ':' 를 구분자로 쓰므로 '모듈:클래스.파라미터' 키는 읽을 수 없음
+      → 등록 이름(cls.name) 또는 클래스 이름 소문자로 지정 (예: mystrategy.window = 5)
+    """
+    names = (cls.name, cls.__name__)
+    return tuple(dict.fromkeys(f"{name.lower()}." for name in names if name))
+
+
+# -----------------------------------
+# 🔵 4. 전략 결합 / 종목 그룹
+# -----------------------------------
+class StrategyGroup:
+    """
+    전략 여러 개를 결합한 전략 묶음
+    - 매수: buy 를 구현한 전략 중 combine='any' 면 하나라도, 'all' 이면 모두 신호일 때
+    - 매도: sell 을 구현한 전략 중 하나라도 신호일 때
+    """
+
+    def __init__(self, strategies, combine="any", label=None):
+        if combine not in ("any", "all"):
+            raise ValueError(f"combine 은 any / all 중 하나여야 합니다: {combine}")
+        if not strategies:
+            raise ValueError("전략이 하나 이상 필요합니다")
+        self.strategies = list(strategies)
+        self.combine = combine
+        self.label = label or ("+" if combine == "all" else "|").join(s.name or type(s).__name__ for s in strategies)
+        self.has_sell = any(type(s).sell is not Strategy.sell for s in self.strategies)
+
+    def buy(self, view):
+        signals = None
+        for strategy in self.strategies:
+            result = strategy.buy(view)
+            if result is None:
+                continue
+            if signals is None:
+                signals = result
+            elif self.combine == "all":
+                signals = signals & result
+            else:
+                signals = signals | result
+        return signals
+
+    def sell(self, view):
+        signals = None
+        for strategy in self.strategies:
+            result = strategy.sell(view)
+            if result is not None:
+                signals = result if signals is None else signals | result
+        return signals
+
+
+class StrategyBook:
+    """
+    종목 그룹별 전략 선택
+    - 그룹에 속하지 않은 종목은 default, 일봉 / 실시간 등록 실패 시에는 모든 종목에 fallback
+    - evaluate: 그룹마다 전략을 한 번씩 배열로 호출 (비용은 종목 × 틱이 아니라 그룹 × 결정 루프 배치 수에 비례)
+    """
+
+    def __init__(self, default, fallback=None, groups=None):
+        self.default = default
+        self.fallback = fallback or default
+        self.groups = dict(groups or {})        # 그룹명 → (종목코드 집합, StrategyGroup)
+        self._group_of = {code: name for name, (codes, _) in self.groups.items() for code in codes}
+        self.has_sell = any(group.has_sell for group in self.all_groups())
+
+    def all_groups(self):
+        return [self.default, self.fallback] + [group for _, group in self.groups.values()]
+
+    def evaluate(self, view, fallback=False):
+        """
+        종목 묶음 평가 → (매수 신호 종목 {코드: 전략 라벨}, 매도 신호 종목 {코드: 전략 라벨})
+        - 보유 종목(view.held)은 매도만, 미보유 종목은 매수만 판단
+        """
+        import numpy as np
+
+        buys, sells = {}, {}
+        if not len(view):
+            return buys, sells
+
+        if fallback or not self._group_of:
+            parts = [(self.fallback if fallback else self.default, view)]
+        else:
+            names = [self._group_of.get(code) for code in view.codes]
+            parts = []
+            for name in dict.fromkeys(names):
+                group = self.default if name is None else self.groups[name][1]
+                mask = np.fromiter((n == name for n in names), dtype=bool, count=len(names))
+                parts.append((group, view if mask.all() else view.take(mask)))
+
+        for group, part in parts:
+            held = part.held
+            buy = group.buy(part)
+            if buy is not None:
+                for i in np.flatnonzero(np.asarray(buy, dtype=bool) & ~held).tolist():
+                    buys[part.codes[i]] = group.label
+            if group.has_sell and held.any():
+                sell = np.asarray(group.sell(part), dtype=bool) & held
+                for i in np.flatnonzero(sell).tolist():
+                    sells[part.codes[i]] = group.label
+        return buys, sells
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        config.ini 의 [STRATEGY] / [STRATEGY:그룹명] 섹션으로 구성 (없으면 기본값: macd, 실패 시 ema5)
+        - strategy: 전략 이름 또는 '모듈:클래스' (쉼표로 여러 개), combine: any / all
+        - plugins: 먼저 임포트할 모듈 (모듈 안에서 register_strategy 로 등록)
+        - '전략이름.파라미터 = 값': 전략 생성자 인자 (파이썬 리터럴이면 변환, '모듈:클래스' 전략은 클래스 이름 소문자)
+        """
+        section = config["STRATEGY"] if config.has_section("STRATEGY") else {}
+        for module_name in _split(section.get("plugins", "")):
+            importlib.import_module(module_name)
+
+        def build(sec, key="strategy", default="macd", combine_key="combine"):
+            specs = _split(sec.get(key, default)) or _split(default)
+            strategies = []
+            for spec in specs:
+                strategy_cls = resolve_strategy(spec)
+                strategies.append(strategy_cls(**(_params(section, strategy_cls) | _params(sec, strategy_cls))))
+            return StrategyGroup(strategies, sec.get(combine_key, "any").strip())
+
+        default = build(section)
+        fallback = build(section, key="fallback", default="ema5", combine_key="fallback_combine")
+        default_spec = section.get("strategy", "macd")
+        groups = {}
+        for name in config.sections():
+            if name.startswith(GROUP_PREFIX):
+                sec = config[name]
+                groups[name[len(GROUP_PREFIX):]] = (set(_split(sec.get("codes", ""))), build(sec, default=default_spec))
+        return cls(default, fallback, groups)
+
+
+def _split(value):
+    return [item.strip() for item in str(value).replace(";", ",").split(",") if item.strip()]
+
+
+def _params(section, cls):
+    """섹션에서 '전략이름.파라미터' 키만 골라 {파라미터: 값} (전략이름: param_prefixes)"""
+    prefixes = param_prefixes(cls)
+    params = {}
+    for key, raw in section.items():
+        prefix = next((prefix for prefix in prefixes if key.lower().startswith(prefix)), None)
+        if prefix is None:
+            continue
+        try:
+            params[key[len(prefix):]] = literal_eval(raw)
+        except (ValueError, SyntaxError):
+            params[key[len(prefix):]] = raw
+    return params
@@ -0,0 +1,282 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import os
+import numpy as np
+
+# 틱 필드 (실시간 FID → 컬럼)
+TICK_FIELDS = (
+    ("time", "<i4"),         # 체결시간 (FID 20, 자정 이후 초)
+    ("price", "<i4"),        # 체결가 (FID 10)
+    ("volume", "<i4"),       # 체결량 (FID 15, +매수 / -매도 체결)
+    ("cum_volume", "<i8"),   # 누적거래량 (FID 13)
+    ("ask", "<i4"),          # 최우선 매도호가 (FID 27)
+    ("bid", "<i4"),          # 최우선 매수호가 (FID 28)
+)
+TICK_DTYPE = np.dtype(list(TICK_FIELDS))
+
+# 분봉 레코드 (time: 봉 시작 시각, 자정 이후 초)
+BAR_DTYPE = np.dtype([
+    ("time", "<i4"),
+    ("open", "<i4"),
+    ("high", "<i4"),
+    ("low", "<i4"),
+    ("close", "<i4"),
+    ("volume", "<i8"),
+])
+
+
+# -----------------------------------
+# 🔵 2. 종목별 틱 컬럼 저장소
+# -----------------------------------
+class TickStore:
+    """
+    종목 × 틱 형태의 사전 할당 NumPy 컬럼(필드별 배열)에 실시간 틱을 저장하고 1분봉을 집계
+    - 종목별 capacity 틱까지 앞에서부터 채우고, 가득 차면 오래된 틱을 디스크로 내보낸 뒤(spill_dir) 최근 keep 틱만
+      앞으로 당김 → 메모리는 고정, 복사는 capacity - keep 틱마다 한 번 (틱당 상수 시간)
+    - 메모리: 종목당 capacity × TICK_DTYPE.itemsize(28바이트) → 기본 20,000틱이면 약 560KB, 2,500종목이면 약 1.4GB
+    - 틱은 종목별 파이썬 리스트에 flush_size 건씩 모았다가 한 번에 컬럼에 씀 (NumPy 원소 단위 쓰기 비용 회피)
+    - 조회(ticks / minute_bars)는 대기분을 먼저 반영하고, 항상 연속 구간이라 복사 없는 뷰
+      (다음 압축 전까지 유효, 보관하려면 copy)
+    - 1분봉은 틱마다 파이썬 리스트로 갱신하고 분이 바뀔 때 배열에 확정, 3/5분봉은 조회 시 1분봉에서 집계
+    - spill_all: 장 종료 시 아직 디스크에 없는 틱 / 확정 분봉을 spill_dir/{code}.ticks, {code}.bars 에 추가
+    """
+
+    def __init__(self, capacity=20_000, keep=None, max_symbols=64, bar_capacity=600, spill_dir=None, flush_size=256):
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.keep = min(keep if keep is not None else capacity // 4, capacity - 1)
+        self.bar_capacity = bar_capacity
+        self.spill_dir = spill_dir
+        self.fields = tuple(name for name, _ in TICK_FIELDS)
+
+        self._index = {}                # 종목코드 → 정수 인덱스
+        self._codes = []
+        self._columns = {name: np.zeros((max(max_symbols, 1), capacity), dtype=dtype) for name, dtype in TICK_FIELDS}
+        self._bars = np.zeros((max(max_symbols, 1), bar_capacity), dtype=BAR_DTYPE)
+        self._rows = []                 # 종목별 필드 순서 1차원 뷰
+        self._pending = []              # 종목별 컬럼 반영 대기 틱 [(time, price, ...), ...]
+        self._end = []                  # 종목별 다음에 쓸 위치
+        self._spilled = []              # 종목별 디스크에 이미 쓴 앞부분 틱 수
+        self._bar_count = []            # 종목별 확정 1분봉 수
+        self._bars_spilled = []
+        self._current = []              # 종목별 진행 중 1분봉 [분, 시가, 고가, 저가, 종가, 거래량]
+        self.ticks_total = 0
+        self.ticks_dropped = 0          # spill_dir 없이 압축하며 버린 틱
+        self.ticks_spilled = 0
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __contains__(self, code):
+        return code in self._index
+
+    @property
+    def codes(self):
+        return list(self._codes)
+
+    def index_of(self, code):
+        """종목코드의 정수 인덱스 (없으면 새로 할당, 공간 부족 시 2배 확장)"""
+        idx = self._index.get(code)
+        if idx is not None:
+            return idx
+
+        idx = len(self._codes)
+        if idx >= len(self._bars):
+            grow = len(self._bars)
+            for name, dtype in TICK_FIELDS:
+                self._columns[name] = np.concatenate([self._columns[name], np.zeros((grow, self.capacity), dtype=dtype)])
+            self._bars = np.concatenate([self._bars, np.zeros((grow, self.bar_capacity), dtype=BAR_DTYPE)])
+            self._rows = [[self._columns[name][i] for name in self.fields] for i in range(len(self._codes))]
+        self._index[code] = idx
+        self._codes.append(code)
+        self._rows.append([self._columns[name][idx] for name in self.fields])
+        self._pending.append([])
+        self._end.append(0)
+        self._spilled.append(0)
+        self._bar_count.append(0)
+        self._bars_spilled.append(0)
+        self._current.append(None)
+        return idx
+
+    # ---- 기록 (실시간 틱마다) ----
+    def append(self, code, time, price, volume=0, cum_volume=0, ask=0, bid=0):
+        """틱 1건 추가 + 1분봉 갱신"""
+        idx = self._index.get(code)
+        if idx is None:
+            idx = self.index_of(code)
+        pending = self._pending[idx]
+        pending.append((time, price, volume, cum_volume, ask, bid))
+        if len(pending) >= self.flush_size:
+            self._flush(idx)
+        self.ticks_total += 1
+
+        minute = time // 60
+        bar = self._current[idx]
+        if bar is None or minute > bar[0]:
+            if bar is not None:
+                self._close_bar(idx, bar)
+            self._current[idx] = [minute, price, price, price, price, abs(volume)]
+        else:
+            if price > bar[2]:
+                bar[2] = price
+            elif price < bar[3]:
+                bar[3] = price
+            bar[4] = price
+            bar[5] += abs(volume)
+
+    def _flush(self, idx):
+        """대기 틱을 컬럼에 반영 (공간이 모자라면 압축하며 나눠 씀)"""
+        pending = self._pending[idx]
+        if not pending:
+            return
+        records = np.array(pending, dtype=TICK_DTYPE)
+        pending.clear()
+        done = 0
+        while done < len(records):
+            end = self._end[idx]
+            if end == self.capacity:
+                end = self._compact(idx)
+            n = min(self.capacity - end, len(records) - done)
+            for name, column in zip(self.fields, self._rows[idx]):
+                column[end:end + n] = records[name][done:done + n]
+            self._end[idx] = end + n
+            done += n
+
+    def _compact(self, idx):
+        """버퍼가 가득 참 → 오래된 틱 내보내기(또는 버림) 후 최근 keep 틱을 앞으로 → 다음에 쓸 위치"""
+        cut = self.capacity - self.keep
+        if self.spill_dir:
+            self._spill_ticks(idx, cut)
+        else:
+            self.ticks_dropped += max(cut - self._spilled[idx], 0)
+        for column in self._rows[idx]:
+            column[:self.keep] = column[cut:]
+        self._spilled[idx] = max(self._spilled[idx] - cut, 0)
+        self._end[idx] = self.keep
+        return self.keep
+
+    def _close_bar(self, idx, bar):
+        n = self._bar_count[idx]
+        if n == self.bar_capacity:
+            # 분봉 버퍼도 가득 차면 앞쪽 절반을 내보내고 당김
+            cut = self.bar_capacity // 2
+            if self.spill_dir:
+                self._spill_bars(idx, cut)
+            row = self._bars[idx]
+            row[:n - cut] = row[cut:n]
+            self._bars_spilled[idx] = max(self._bars_spilled[idx] - cut, 0)
+            n -= cut
+        minute, o, h, lo, c, v = bar
+        self._bars[idx, n] = (minute * 60, o, h, lo, c, v)
+        self._bar_count[idx] = n + 1
+
+    # ---- 조회 (복사 없는 뷰) ----
+    def length(self, code):
+        idx = self._index.get(code)
+        return 0 if idx is None else self._end[idx] + len(self._pending[idx])
+
+    def ticks(self, code, field, count=None):
+        """최근 count 틱의 필드 배열 (과거 → 최신, 뷰)"""
+        idx = self._index[code]
+        self._flush(idx)
+        end = self._end[idx]
+        start = 0 if count is None else max(end - count, 0)
+        return self._columns[field][idx, start:end]
+
+    def last(self, code):
+        """최근 틱 1건 {필드: 값} (없으면 None)"""
+        idx = self._index.get(code)
+        if idx is None or not self.length(code):
+            return None
+        if self._pending[idx]:
+            return dict(zip(self.fields, self._pending[idx][-1]))
+        pos = self._end[idx] - 1
+        return {name: int(column[pos]) for name, column in zip(self.fields, self._rows[idx])}
+
+    def minute_bars(self, code):
+        """확정된 1분봉 구조화 배열 (과거 → 최신, 뷰 – 진행 중인 봉 제외)"""
+        idx = self._index[code]
+        return self._bars[idx, :self._bar_count[idx]]
+
+    def bars(self, code, minutes=1, include_current=True):
+        """
+        minutes 분봉 (1 / 3 / 5 ... → 1분봉을 봉 시작 시각 기준으로 묶어 집계)
+        - include_current: 진행 중인 1분봉 포함 (1분봉을 include_current=False 로 조회하면 minute_bars 와 같은 뷰)
+        """
+        idx = self._index[code]
+        bars = self.minute_bars(code)
+        current = self._current[idx]
+        if include_current and current is not None:
+            minute, o, h, lo, c, v = current
+            bars = np.concatenate([bars, np.array([(minute * 60, o, h, lo, c, v)], dtype=BAR_DTYPE)])
+        if minutes == 1 or len(bars) == 0:
+            return bars
+
+        key = bars["time"] // (minutes * 60)
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        ends = np.r_[starts[1:] - 1, len(bars) - 1]
+        out = np.empty(len(starts), dtype=BAR_DTYPE)
+        out["time"] = key[starts] * minutes * 60
+        out["open"] = bars["open"][starts]
+        out["high"] = np.maximum.reduceat(bars["high"], starts)
+        out["low"] = np.minimum.reduceat(bars["low"], starts)
+        out["close"] = bars["close"][ends]
+        out["volume"] = np.add.reduceat(bars["volume"], starts)
+        return out
+
+    # ---- 디스크 내보내기 ----
+    def _path(self, code, ext):
+        return os.path.join(self.spill_dir, f"{code}.{ext}")
+
+    def _spill_ticks(self, idx, end):
+        start = self._spilled[idx]
+        if end <= start:
+            return 0
+        records = np.empty(end - start, dtype=TICK_DTYPE)
+        for name, column in zip(self.fields, self._rows[idx]):
+            records[name] = column[start:end]
+        os.makedirs(self.spill_dir, exist_ok=True)
+        with open(self._path(self._codes[idx], "ticks"), 'ab') as f:
+            f.write(records.tobytes())
+        self._spilled[idx] = end
+        self.ticks_spilled += len(records)
+        return len(records)
+
+    def _spill_bars(self, idx, end):
+        start = self._bars_spilled[idx]
+        if end <= start:
+            return 0
+        os.makedirs(self.spill_dir, exist_ok=True)
+        with open(self._path(self._codes[idx], "bars"), 'ab') as f:
+            f.write(self._bars[idx, start:end].tobytes())
+        self._bars_spilled[idx] = end
+        return end - start
+
+    def spill_all(self, close_bars=True):
+        """장 종료: 아직 디스크에 없는 틱 / 분봉 모두 추가 (close_bars: 진행 중 1분봉도 확정) → 내보낸 틱 수"""
+        if not self.spill_dir:
+            return 0
+        written = 0
+        for idx in range(len(self._codes)):
+            self._flush(idx)
+            if close_bars and self._current[idx] is not None:
+                self._close_bar(idx, self._current[idx])
+                self._current[idx] = None
+            written += self._spill_ticks(idx, self._end[idx])
+            self._spill_bars(idx, self._bar_count[idx])
+        return written
+
+    def memory_usage(self):
+        """저장소가 점유한 바이트 수"""
+        return sum(column.nbytes for column in self._columns.values()) + self._bars.nbytes
+
+
+def load_spilled(spill_dir, code, kind="ticks"):
+    """내보낸 틱(TICK_DTYPE) / 1분봉(BAR_DTYPE) 파일 → 읽기 전용 memmap (없으면 빈 배열)"""
+    dtype = TICK_DTYPE if kind == "ticks" else BAR_DTYPE
+    file_path = os.path.join(spill_dir, f"{code}.{kind}")
+    count = os.path.getsize(file_path) // dtype.itemsize if os.path.exists(file_path) else 0
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(file_path, dtype=dtype, mode='r', shape=(count,))
@@ -0,0 +1,86 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import numpy as np
+from candle_cache import CANDLE_DTYPE
+
+# TR 멀티 데이터 레코드 (GetCommDataEx 열 순서 = KOA Studio 출력 항목 순서)
+DAILY_CHART_RECORD = "주식일봉차트조회"
+DAILY_CHART_FIELDS = (
+    "종목코드", "현재가", "거래량", "거래대금", "일자", "시가", "고가", "저가", "수정주가구분", "수정비율",
+    "대업종구분", "소업종구분", "종목정보", "수정주가이벤트", "전일종가",
+)
+BALANCE_RECORD = "계좌평가잔고개별합산"
+BALANCE_FIELDS = (
+    "종목번호", "종목명", "평가손익", "수익률(%)", "매입가", "전일종가", "보유수량", "매매가능수량", "현재가",
+    "전일매수수량", "전일매도수량", "금일매수수량", "금일매도수량", "매입금액", "매입수수료", "평가금액",
+    "평가수수료", "세금", "수수료합", "보유비중(%)", "신용구분", "신용구분명", "대출일",
+)
+MULTI_RECORDS = {
+    "opt10081": (DAILY_CHART_RECORD, DAILY_CHART_FIELDS),
+    "opw00018": (BALANCE_RECORD, BALANCE_FIELDS),
+}
+
+
+# -----------------------------------
+# 🔵 2. 문자열 표 → 정수 열 (벡터 변환)
+# -----------------------------------
+def int_columns(data, fields, names):
+    """
+    GetCommDataEx 결과 (행 × 열 문자열 목록) 중 names 열만 정수 변환 → (값 int64 [행 × 열], 유효 여부 bool [행 × 열])
+    - 문자열을 유니코드 코드 포인트 배열로 보고 숫자 글자만 자릿수 누적 (공백 / 부호 제거를 한 번에, 셀별 int() 호출 없음)
+    - 키움 부호(+/- 등락 표시)는 '-' 가 있으면 음수로 반환 → 가격 열은 호출하는 쪽에서 abs
+    - 빈 칸 / 숫자 외 글자가 섞인 값은 무효 (값 0)
+    """
+    if not data:
+        empty = np.empty((0, len(names)))
+        return empty.astype(np.int64), empty.astype(bool)
+    if len(data[0]) < len(fields):
+        raise ValueError(f"GetCommDataEx 열 수 불일치: {len(data[0])}열 (필요 {len(fields)}열)")
+
+    columns = [fields.index(name) for name in names]
+    cells = np.array([[row[i] for i in columns] for row in data], dtype=str)
+    codes = cells.view(np.uint32).reshape(len(data), len(columns), -1)   # 빈 자리는 0
+
+    digit = (codes >= 48) & (codes <= 57)
+    values = np.zeros(codes.shape[:2], dtype=np.int64)
+    for position in range(codes.shape[2]):
+        values = np.where(digit[..., position], values * 10 + (codes[..., position] - 48), values)
+
+    sign = (codes == 43) | (codes == 45)
+    valid = digit.any(axis=-1) & ~(~digit & ~sign & (codes != 32) & (codes != 0)).any(axis=-1)
+    values = np.where((codes == 45).any(axis=-1), -values, values)
+    values[~valid] = 0
+    return values, valid
+
+
+# -----------------------------------
+# 🔵 3. TR 별 파서
+# -----------------------------------
+def parse_daily_chart(data):
+    """
+    opt10081 멀티 데이터 → 일봉 구조화 배열 (CANDLE_DTYPE, 수신 순서 그대로 최신 → 과거)
+    - 종가(현재가) / 일자가 없는 행은 제외, 시가 / 고가 / 저가가 없으면 종가, 거래량이 없으면 0
+    """
+    values, valid = int_columns(data, DAILY_CHART_FIELDS, ("일자", "시가", "고가", "저가", "현재가", "거래량"))
+    values = np.abs(values)
+    keep = valid[:, 0] & valid[:, 4]
+    close = values[:, 4]
+
+    records = np.empty(int(keep.sum()), dtype=CANDLE_DTYPE)
+    records["date"] = values[keep, 0]
+    for column, name in ((1, "open"), (2, "high"), (3, "low")):
+        records[name] = np.where(values[:, column] > 0, values[:, column], close)[keep]
+    records["close"] = close[keep]
+    records["volume"] = values[keep, 5]
+    return records
+
+
+def parse_balance(data):
+    """opw00018 멀티 데이터 → [(종목코드, 보유수량, 매입가), ...] (보유수량 0 이하 / 종목코드 없는 행 제외)"""
+    values, valid = int_columns(data, BALANCE_FIELDS, ("보유수량", "매입가"))
+    column = BALANCE_FIELDS.index("종목번호")
+    codes = [row[column].strip().lstrip('A') for row in data]
+    keep = (valid[:, 0] & (values[:, 0] > 0)).tolist()
+    quantity, buy_price = values[:, 0].tolist(), np.abs(values[:, 1]).tolist()
+    return [(code, quantity[i], buy_price[i]) for i, code in enumerate(codes) if keep[i] and code]
@@ -0,0 +1,257 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import time
+import itertools
+from collections import deque
+
+# -----------------------------------
+# 🔵 2. 토큰 버킷 (요청 횟수 제한)
+# -----------------------------------
+class TokenBucket:
+    """period 초 동안 최대 rate 회 요청 허용"""
+
+    def __init__(self, rate, period):
+        self.rate = rate
+        self.period = period
+        self.tokens = float(rate)
+        self.updated = None
+
+    def _refill(self, now):
+        if self.updated is not None:
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.period)
+        self.updated = now
+
+    def wait_time(self, now):
+        """토큰 1개를 얻기까지 남은 초 (0 이면 즉시 가능)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * self.period / self.rate
+
+    def consume(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+# -----------------------------------
+# 🔵 3. TR 요청 객체
+# -----------------------------------
+class TrRequest:
+    """TR 1건 (연속조회 페이지 포함)"""
+    __slots__ = (
+        "req_id", "rqname", "trcode", "inputs", "screen_no", "context",
+        "on_page", "on_done", "on_error", "max_pages",
+        "page", "prev_next", "attempts", "restarts", "deadline", "rows", "sent_ns", "pooled",
+    )
+
+    def __init__(self, req_id, trcode, inputs, screen_no, context, on_page, on_done, on_error, max_pages):
+        self.req_id = req_id
+        self.rqname = f"{trcode}_req#{req_id}"  # 전송할 때마다 시도 번호를 붙여 새로 정함 (TrScheduler._send)
+        self.trcode = trcode
+        self.inputs = list(inputs)
+        self.screen_no = screen_no      # None 이면 전송 시 화면번호 관리자에서 빌림
+        self.pooled = False             # 빌린 화면번호 여부 (완료 / 실패 시 반납)
+        self.context = context          # 호출자가 넘긴 값 (예: 종목코드)
+        self.on_page = on_page
+        self.on_done = on_done
+        self.on_error = on_error
+        self.max_pages = max_pages
+        self.page = 0                   # 수신 완료한 페이지 수
+        self.prev_next = 0              # 0: 최초 조회, 2: 연속 조회
+        self.attempts = 0
+        self.restarts = 0               # 연속조회 도중 시간 초과로 첫 페이지부터 다시 받은 횟수
+        self.deadline = None
+        self.rows = []                  # 페이지 핸들러가 누적하는 데이터
+        self.sent_ns = 0                # 마지막 CommRqData 전송 시각 (응답 지연 계측용)
+
+
+# -----------------------------------
+# 🔵 4. TR 요청 스케줄러
+# -----------------------------------
+class TrScheduler:
+    """
+    키움 TR 조회 제한을 지키는 비동기 TR 스케줄러
+    - 초당 / 시간당 토큰 버킷으로 CommRqData 호출 간격 조절
+    - 중첩 이벤트 루프 없이 콜백으로 결과 전달 (요청 ID 기반 rqname 으로 라우팅)
+    - prev_next 연속조회를 max_pages 까지 자동으로 이어서 요청
+    - 요청별 타임아웃 / 재시도 (전송마다 rqname 을 새로 붙이고, 시간 초과된 rqname 의 늦은 응답은 무시)
+      · 연속조회 페이지가 시간 초과되면 첫 페이지부터 다시 조회 (늦은 응답이 OCX 연속조회 위치를 옮겼을 수 있어 페이지가 섞이지 않도록)
+    - screens(ScreenManager)가 있으면 화면번호 없이 등록한 요청은 전송 시 화면번호를 빌리고 끝나면 반납
+    """
+
+    def __init__(self, transport, per_second=5, per_hour=1000, max_in_flight=1, timeout_ms=5000, max_retries=2,
+                 screens=None):
+        self.transport = transport
+        self.screens = screens
+        self.buckets = [TokenBucket(per_second, 1.0), TokenBucket(per_hour, 3600.0)]
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout_ms / 1000
+        self.max_retries = max_retries
+
+        self._ids = itertools.count(1)
+        self._queue = deque()
+        self._in_flight = {}            # rqname → TrRequest
+        self._expired = set()           # 시간 초과로 포기한 rqname (늦게 온 응답을 재시도 응답으로 착각하지 않도록)
+        self.sent_count = 0
+        self.timeout_count = 0
+        self.failed_count = 0
+        self.late_count = 0             # 시간 초과 후 도착해 버린 응답 수
+        self.latency = None             # 요청 → 응답 시간 히스토그램 (metrics 계측 시에만 설정)
+
+        self._pump_timer = transport.create_timer()
+        self._pump_timer.setSingleShot(True)
+        self._pump_timer.timeout.connect(self._pump)
+
+        self._watchdog = transport.create_timer()
+        self._watchdog.timeout.connect(self._check_timeouts)
+
+    def _now(self):
+        return self.transport.now().timestamp()
+
+    @property
+    def pending(self):
+        """대기 + 진행 중 요청 수"""
+        return len(self._queue) + len(self._in_flight)
+
+    def submit(self, trcode, inputs, screen_no, on_page, on_done=None, on_error=None, context=None, max_pages=1):
+        """
+        TR 요청 등록 → TrRequest
+        - on_page(request, trcode, rqname, prev_next): 페이지 수신 시 (False 반환 시 연속조회 중단)
+        - on_done(request): 마지막 페이지 처리 후
+        - on_error(request, reason): 재시도 초과 시
+        """
+        request = TrRequest(next(self._ids), trcode, inputs, screen_no, context, on_page, on_done, on_error, max_pages)
+        self._queue.append(request)
+        self._pump()
+        return request
+
+    def handle(self, screen_no, rqname, trcode, recordname, prev_next):
+        """OnReceiveTrData 라우팅 (스케줄러가 보낸 요청이면 처리 후 True)"""
+        request = self._in_flight.pop(rqname, None)
+        if request is None:
+            if rqname in self._expired:
+                self._expired.discard(rqname)
+                self.late_count += 1
+                print(f"[⚠️ 시간 초과 후 도착한 TR 응답 무시] {rqname}")
+                return True
+            return False
+
+        if self.latency is not None:
+            self.latency.record(time.perf_counter_ns() - request.sent_ns)
+        request.page += 1
+        try:
+            more = request.on_page(request, trcode, rqname, prev_next)
+        except Exception as e:
+            print(f"[❌ TR 처리 실패] {rqname}: {e}")
+            self._fail(request, str(e))
+        else:
+            if more is not False and str(prev_next).strip() == "2" and request.page < request.max_pages:
+                # 연속조회: 같은 화면/입력값으로 다음 페이지를 우선 요청
+                request.prev_next = 2
+                request.attempts = 0
+                self._queue.appendleft(request)
+            else:
+                self._release_screen(request)
+                self._notify(request, request.on_done)
+        finally:
+            self._pump()   # 콜백이 예외를 던져도 대기 중인 요청은 계속 전송
+        return True
+
+    def _notify(self, request, callback, *args):
+        """on_done / on_error 호출 (콜백 예외는 기록만 하고 스케줄러 진행은 유지)"""
+        if callback is None:
+            return
+        try:
+            callback(request, *args)
+        except Exception as e:
+            print(f"[❌ TR 콜백 실패] {request.rqname}: {e}")
+
+    def _pump(self):
+        """토큰이 허용하는 만큼 대기 요청 전송"""
+        while self._queue and len(self._in_flight) < self.max_in_flight:
+            now = self._now()
+            wait = max(bucket.wait_time(now) for bucket in self.buckets)
+            if wait > 0:
+                if not self._pump_timer.isActive():
+                    self._pump_timer.start(int(wait * 1000) + 1)
+                return
+
+            request = self._queue[0]
+            if request.screen_no is None:
+                request.screen_no = self.screens.acquire_tr() if self.screens is not None else None
+                if request.screen_no is None:
+                    break   # 화면번호가 모두 사용 중 → 진행 중 요청이 끝나 반납되면 다시 시도
+                request.pooled = True
+            self._queue.popleft()
+            for bucket in self.buckets:
+                bucket.consume(now)
+            self._send(request, now)
+
+        if self._in_flight and not self._watchdog.isActive():
+            self._watchdog.start(max(int(self.timeout * 250), 50))
+        elif not self._in_flight and self._watchdog.isActive():
+            self._watchdog.stop()
+
+    def _send(self, request, now):
+        for key, value in request.inputs:
+            self.transport.dynamicCall("SetInputValue(QString, QString)", key, value)
+        request.attempts += 1
+        request.deadline = now + self.timeout
+        self.sent_count += 1
+        request.rqname = f"{request.trcode}_req#{request.req_id}.{self.sent_count}"
+        self._in_flight[request.rqname] = request
+        request.sent_ns = time.perf_counter_ns()
+
+        res = self.transport.dynamicCall(
+            "CommRqData(QString, QString, int, QString)",
+            request.rqname, request.trcode, request.prev_next, request.screen_no
+        )
+        if res != 0:
+            print(f"[⚠️ TR 요청 거부] {request.rqname} (결과 코드: {res})")
+            self._in_flight.pop(request.rqname, None)
+            self._retry(request, f"CommRqData {res}")
+
+    def _check_timeouts(self):
+        now = self._now()
+        for rqname, request in list(self._in_flight.items()):
+            if request.deadline <= now:
+                print(f"[⏰ TR 응답 시간 초과] {rqname} ({request.attempts}회 시도)")
+                del self._in_flight[rqname]
+                self._expired.add(rqname)
+                self.timeout_count += 1
+                if request.prev_next == 2:
+                    self._restart(request)
+                else:
+                    self._retry(request, "timeout")
+        self._pump()
+
+    def _restart(self, request):
+        """연속조회 도중 시간 초과 → 받은 페이지를 버리고 첫 페이지부터 다시 (max_retries 회까지)"""
+        if request.restarts >= self.max_retries:
+            self._fail(request, "timeout")
+            return
+        request.restarts += 1
+        request.page = 0
+        request.prev_next = 0
+        request.attempts = 0
+        request.rows = []
+        self._queue.append(request)
+
+    def _retry(self, request, reason):
+        if request.attempts <= self.max_retries:
+            self._queue.append(request)
+        else:
+            self._fail(request, reason)
+
+    def _release_screen(self, request):
+        if request.pooled:
+            self.screens.release_tr(request.screen_no)
+            request.screen_no = None
+            request.pooled = False
+
+    def _fail(self, request, reason):
+        print(f"[❌ TR 요청 실패] {request.rqname}: {reason}")
+        self.failed_count += 1
+        self._release_screen(request)
+        self._notify(request, request.on_error, reason)
@@ -0,0 +1,207 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import os
+import csv
+import time
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+
+# 기록 종류
+ORDER = "order"       # 주문 전송 성공 (수량, 예상가)
+FILL = "fill"         # 체결 (체결 수량, 체결가)
+SALE = "sale"         # 매도 판단 (익절/손절/트레일링 스탑)
+REJECT = "reject"     # 주문 거부
+CANCEL = "cancel"     # 주문 취소 / 미체결 정리
+
+COLUMNS = ("id", "ts", "date", "kind", "code", "side", "quantity", "price", "order_no", "detail")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    date TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    code TEXT NOT NULL,
+    side TEXT,
+    quantity INTEGER,
+    price INTEGER,
+    order_no TEXT,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_journal_date ON journal(date, kind);
+CREATE INDEX IF NOT EXISTS idx_journal_code ON journal(code, date);
+"""
+
+
+def connect(path, readonly=False):
+    """WAL 모드 SQLite 연결 (읽기 전용이면 쓰기 중에도 동시 조회 가능)"""
+    if readonly:
+        conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")   # 커밋(배치)마다 fsync
+        conn.executescript(SCHEMA)
+    return conn
+
+
+# -----------------------------------
+# 🔵 2. 추가 전용 매매 저널
+# -----------------------------------
+class TradeJournal:
+    """
+    주문 / 체결 / 매도를 발생 즉시 SQLite(WAL)에 추가 기록하는 저널
+    - record 는 큐에 넣고 즉시 반환, 기록 스레드가 flush_interval_ms 마다 한 트랜잭션으로 모아 커밋(fsync)
+    - 비정상 종료 시 잃을 수 있는 기록은 마지막 커밋 이후 최대 flush_interval_ms 분량
+    - 날짜 / 종목코드 인덱스로 조회
+    - clock: 기록 시각을 돌려주는 함수 (기본값: 벽시계, 매매 중에는 전송 계층 시계 – 시뮬레이터는 가상 거래일 시각)
+    """
+
+    def __init__(self, path, flush_interval_ms=100, clock=datetime.now):
+        self.path = path
+        self.flush_interval = flush_interval_ms / 1000
+        self.clock = clock
+        self._queue = deque()
+        self._wake = threading.Event()
+        self._closed = False
+        self.written = 0
+        self.latency = None     # 배치 커밋(fsync) 시간 히스토그램 (metrics 계측 시에만 설정)
+
+        connect(path).close()   # 스키마 생성 (기록 스레드 시작 전에 오류를 드러냄)
+        self._thread = threading.Thread(target=self._worker, name="trade-journal", daemon=True)
+        self._thread.start()
+
+    def record(self, kind, code, side=None, quantity=0, price=0, order_no=None, detail=None):
+        """기록 1건 등록 (디스크 반영은 기록 스레드에서)"""
+        now = self.clock()
+        self._queue.append((now.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3], now.strftime('%Y-%m-%d'), kind, code,
+                            side, int(quantity), int(price), order_no, detail))
+
+    def flush(self, timeout=2.0):
+        """지금까지 등록한 기록이 커밋될 때까지 대기"""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.append(done)
+        self._wake.set()
+        return done.wait(timeout)
+
+    def _worker(self):
+        conn = connect(self.path)
+        try:
+            while not self._closed:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._commit(conn)
+            self._commit(conn)
+        finally:
+            conn.close()
+
+    def _commit(self, conn):
+        rows, waiters = [], []
+        queue = self._queue
+        while queue:
+            item = queue.popleft()
+            (waiters if isinstance(item, threading.Event) else rows).append(item)
+        if rows:
+            start = time.perf_counter_ns()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO journal (ts, date, kind, code, side, quantity, price, order_no, detail) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self.written += len(rows)
+                if self.latency is not None:
+                    self.latency.record(time.perf_counter_ns() - start)
+            except sqlite3.Error as e:
+                print(f"[❌ 매매 저널 기록 실패] {len(rows)}건: {e}")
+        for waiter in waiters:
+            waiter.set()
+
+    def close(self, timeout=5.0):
+        """남은 기록 커밋 후 종료 (여러 번 호출해도 안전)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+    # ---- 조회 ----
+    def query(self, date=None, code=None, kinds=None):
+        """조건에 맞는 기록을 id 순으로 스트리밍 (dict)"""
+        return query(self.path, date=date, code=code, kinds=kinds)
+
+
+def query(path, date=None, code=None, kinds=None, since=None, until=None):
+    """저널 파일 조회 (date: 'YYYY-MM-DD', since/until: 날짜 범위, kinds: 기록 종류 목록) → dict 제너레이터"""
+    clauses, args = [], []
+    if date:
+        clauses.append("date = ?")
+        args.append(date)
+    if since:
+        clauses.append("date >= ?")
+        args.append(since)
+    if until:
+        clauses.append("date <= ?")
+        args.append(until)
+    if code:
+        clauses.append("code = ?")
+        args.append(code)
+    if kinds:
+        clauses.append(f"kind IN ({', '.join('?' * len(kinds))})")
+        args.extend(kinds)
+    sql = f"SELECT {', '.join(COLUMNS)} FROM journal"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY id"
+
+    conn = connect(path, readonly=True)
+    try:
+        for row in conn.execute(sql, args):
+            yield dict(zip(COLUMNS, row))
+    finally:
+        conn.close()
+
+
+# -----------------------------------
+# 🔵 3. 오프라인 내보내기 (CSV / 엑셀, 스트리밍)
+# -----------------------------------
+EXPORT_HEADER = ["시각", "구분", "종목코드", "매매구분", "수량", "가격", "주문번호", "비고"]
+KIND_NAMES = {ORDER: "주문", FILL: "체결", SALE: "매도 판단", REJECT: "거부", CANCEL: "취소"}
+
+
+def _export_rows(rows):
+    for row in rows:
+        yield [row["ts"], KIND_NAMES.get(row["kind"], row["kind"]), row["code"], row["side"] or "",
+               row["quantity"], row["price"], row["order_no"] or "", row["detail"] or ""]
+
+
+def export_csv(rows, file_path):
+    """기록을 한 줄씩 CSV 로 저장 → 저장 건수"""
+    count = 0
+    with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_HEADER)
+        for values in _export_rows(rows):
+            writer.writerow(values)
+            count += 1
+    return count
+
+
+def export_xlsx(rows, file_path):
+    """기록을 write-only 워크북으로 스트리밍 저장 (메모리에 전체 시트를 만들지 않음) → 저장 건수"""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Trade Log")
+    ws.append(EXPORT_HEADER)
+    count = 0
+    for values in _export_rows(rows):
+        ws.append(values)
+        count += 1
+    wb.save(file_path)
+    return count
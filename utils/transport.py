@@ -0,0 +1,89 @@
+# -----------------------------------
+# 🔵 1. 필수 라이브러리 로드
+# -----------------------------------
+import sys
+from datetime import datetime
+
+# -----------------------------------
+# 🔵 2. 브로커 전송 계층 인터페이스
+# -----------------------------------
+class BrokerTransport:
+    """
+    Kiwoom 클래스가 사용하는 브로커 연결 인터페이스
+    - dynamicCall / OnEventConnect / OnReceiveTrData / OnReceiveRealData / OnReceiveChejanData / OnReceiveMsg
+      는 QAxWidget 과 동일한 호출 규약을 따른다
+    - 이벤트 루프, 타이머, 현재 시각, 애플리케이션 객체(app)도 전송 계층이 제공한다
+    """
+    headless = False  # True 이면 GUI(알림창 등)를 띄우지 않는다
+
+    app = None
+    OnEventConnect = None
+    OnReceiveTrData = None
+    OnReceiveRealData = None
+    OnReceiveChejanData = None
+    OnReceiveMsg = None
+
+    def dynamicCall(self, signature, *args):
+        """OpenAPI 함수 호출"""
+        raise NotImplementedError
+
+    def create_event_loop(self):
+        """exec_() / exit() 를 제공하는 이벤트 루프 생성"""
+        raise NotImplementedError
+
+    def create_timer(self, precise=False):
+        """start() / stop() / timeout 시그널을 제공하는 타이머 생성 (precise: 긴 간격도 정확한 시각에 발생)"""
+        raise NotImplementedError
+
+    def now(self):
+        """전송 계층 기준 현재 시각"""
+        return datetime.now()
+
+
+# -----------------------------------
+# 🔵 3. 실제 키움 OCX 연결
+# -----------------------------------
+class OcxTransport(BrokerTransport):
+    """
+    KHOpenAPI OCX (Windows 전용) 연결
+    - headless=True: 위젯 없이 QCoreApplication + QAxObject 로 OCX 를 띄움 (알림창/토스트 없음)
+    """
+
+    def __init__(self, headless=False):
+        # PyQt5 는 실제 OCX 를 사용할 때만 로드
+        self.headless = headless
+        if headless:
+            from PyQt5.QtCore import QCoreApplication
+            from PyQt5.QAxContainer import QAxObject
+
+            self.app = QCoreApplication(sys.argv)
+            self._ocx = QAxObject("KHOPENAPI.KHOpenAPICtrl.1")
+        else:
+            from PyQt5.QtWidgets import QApplication
+            from PyQt5.QAxContainer import QAxWidget
+
+            # PyQt5 애플리케이션 생성 (필수)
+            self.app = QApplication(sys.argv)
+
+            # 키움 API 연결 객체 생성
+            self._ocx = QAxWidget("KHOPENAPI.KHOpenAPICtrl.1")
+
+        self.OnEventConnect = self._ocx.OnEventConnect
+        self.OnReceiveTrData = self._ocx.OnReceiveTrData
+        self.OnReceiveRealData = self._ocx.OnReceiveRealData
+        self.OnReceiveChejanData = self._ocx.OnReceiveChejanData
+        self.OnReceiveMsg = self._ocx.OnReceiveMsg
+
+    def dynamicCall(self, signature, *args):
+        return self._ocx.dynamicCall(signature, *args)
+
+    def create_event_loop(self):
+        from PyQt5.QtCore import QEventLoop
+        return QEventLoop()
+
+    def create_timer(self, precise=False):
+        from PyQt5.QtCore import Qt, QTimer
+        timer = QTimer()
+        if precise:
+            timer.setTimerType(Qt.PreciseTimer)   # 기본(CoarseTimer)은 간격의 5% 까지 늦게 발생할 수 있음
+        return timer